@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from dataset import CHANNELS, CHANNEL_COLUMNS, POPULARITY_THRESHOLD, WEEKDAYS, WEEKDAY_COLUMNS
+from tracing import traced
+
+
+@dataclass
+class GroupStats:
+    """Per-group aggregates of one decoded one-hot group (channels or weekdays)"""
+    names: list
+    labels: list
+    counts: np.ndarray
+    mean_shares: np.ndarray
+    popular_counts: np.ndarray
+    codes: np.ndarray
+    sorted_shares: np.ndarray
+
+    @property
+    def percentages(self):
+        total = self.codes.size
+        return self.counts / total * 100 if total else np.zeros_like(self.mean_shares)
+
+    @property
+    def popular_rates(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.popular_counts / self.counts * 100
+
+    def shares_by_group(self):
+        """Sorted shares of each group as zero-copy slices of one sorted array"""
+        bounds = np.cumsum(self.counts)[:-1]
+        return np.split(self.sorted_shares, bounds)
+
+    def rows(self):
+        """Iterate (label, count, percentage, mean shares, popular rate) for the named groups"""
+        for i, label in enumerate(self.labels):
+            yield label, int(self.counts[i]), self.percentages[i], self.mean_shares[i], self.popular_rates[i]
+
+
+@dataclass
+class DatasetAggregates:
+    """All group statistics the scripts report, computed in one pass"""
+    n_articles: int
+    n_popular: int
+    channels: GroupStats
+    weekdays: GroupStats
+
+
+def decode_one_hot(df, columns):
+    """Turn a one-hot column group into integer codes; rows with no flag set get code len(columns)
+
+    The channel flags and the weekday flags are each mutually exclusive in this dataset.
+    """
+    flags = df[columns].to_numpy(dtype=np.uint8)
+    return np.where(flags.any(axis=1), flags.argmax(axis=1), len(columns))
+
+
+def group_stats(codes, shares, popular, names, labels):
+    """Counts, mean shares and popular counts per code with np.bincount
+
+    The trailing "no flag set" code is kept in `codes` but dropped from the
+    per-group arrays so they line up with `names`.
+    """
+    n = len(names)
+    counts = np.bincount(codes, minlength=n + 1)
+    share_sums = np.bincount(codes, weights=shares, minlength=n + 1)
+    popular_counts = np.bincount(codes, weights=popular, minlength=n + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_shares = share_sums / counts
+
+    # One sort gives every group's shares as a contiguous, already ordered block
+    order = np.lexsort((shares, codes))
+    sorted_shares = shares[order][:counts[:n].sum()]
+
+    return GroupStats(
+        names=list(names),
+        labels=list(labels),
+        counts=counts[:n],
+        mean_shares=mean_shares[:n],
+        popular_counts=popular_counts[:n].astype(np.int64),
+        codes=codes,
+        sorted_shares=sorted_shares,
+    )
+
+
+@traced('aggregate')
+def compute_aggregates(df, threshold=POPULARITY_THRESHOLD):
+    """Decode channel and weekday flags once and aggregate shares per group"""
+    shares = df['shares'].to_numpy(dtype=np.float64)
+    popular = (shares >= threshold).astype(np.float64)
+
+    channels = group_stats(decode_one_hot(df, CHANNEL_COLUMNS), shares, popular,
+                           CHANNELS, [c.title() for c in CHANNELS])
+    weekdays = group_stats(decode_one_hot(df, WEEKDAY_COLUMNS), shares, popular,
+                           WEEKDAYS, [d.title() for d in WEEKDAYS])
+
+    return DatasetAggregates(
+        n_articles=len(shares),
+        n_popular=int(popular.sum()),
+        channels=channels,
+        weekdays=weekdays,
+    )
@@ -0,0 +1,444 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import time
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+import numpy as np
+import pandas as pd
+
+from dataset import CHANNELS, WEEKDAYS, column_dtype
+from html_extract import CONTENT_SELECTORS
+
+# The 58 predictive attributes, in OnlineNewsPopularity.csv order
+FEATURE_COLUMNS = [
+    'n_tokens_title', 'n_tokens_content', 'n_unique_tokens', 'n_non_stop_words',
+    'n_non_stop_unique_tokens', 'num_hrefs', 'num_self_hrefs', 'num_imgs', 'num_videos',
+    'average_token_length', 'num_keywords',
+    *[f'data_channel_is_{channel}' for channel in CHANNELS],
+    'kw_min_min', 'kw_max_min', 'kw_avg_min', 'kw_min_max', 'kw_max_max', 'kw_avg_max',
+    'kw_min_avg', 'kw_max_avg', 'kw_avg_avg',
+    'self_reference_min_shares', 'self_reference_max_shares', 'self_reference_avg_sharess',
+    *[f'weekday_is_{day}' for day in WEEKDAYS], 'is_weekend',
+    'LDA_00', 'LDA_01', 'LDA_02', 'LDA_03', 'LDA_04',
+    'global_subjectivity', 'global_sentiment_polarity', 'global_rate_positive_words',
+    'global_rate_negative_words', 'rate_positive_words', 'rate_negative_words',
+    'avg_positive_polarity', 'min_positive_polarity', 'max_positive_polarity',
+    'avg_negative_polarity', 'min_negative_polarity', 'max_negative_polarity',
+    'title_subjectivity', 'title_sentiment_polarity', 'abs_title_subjectivity',
+    'abs_title_sentiment_polarity',
+]
+
+# Need historical shares per keyword / referenced article (see share_index.py) or the
+# authors' LDA model; NaN unless a share index is supplied
+KEYWORD_COLUMNS = [c for c in FEATURE_COLUMNS if c.startswith(('kw_', 'self_reference_'))]
+LDA_COLUMNS = [c for c in FEATURE_COLUMNS if c.startswith('LDA_')]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+VIDEO_SRC_RE = re.compile(r'youtube\.com|youtu\.be|vimeo\.com|dailymotion\.com|vine\.co|mashable\.com/videos')
+SELF_HOSTS = ('mashable.com',)
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves s t don't it's i'm
+""".split())
+
+# Small (polarity, subjectivity) lexicon in the style of the Pattern library the dataset
+# authors used; pass a fuller one with load_lexicon()
+DEFAULT_LEXICON = {
+    'good': (0.7, 0.6), 'great': (0.8, 0.75), 'best': (1.0, 0.3), 'better': (0.5, 0.5),
+    'amazing': (0.6, 0.9), 'awesome': (1.0, 1.0), 'excellent': (1.0, 1.0), 'love': (0.5, 0.6),
+    'happy': (0.8, 1.0), 'nice': (0.6, 1.0), 'perfect': (1.0, 1.0), 'beautiful': (0.85, 1.0),
+    'popular': (0.6, 0.8), 'free': (0.4, 0.8), 'new': (0.14, 0.45), 'easy': (0.43, 0.83),
+    'fun': (0.3, 0.2), 'interesting': (0.5, 0.5), 'success': (0.3, 0.0), 'win': (0.8, 0.4),
+    'cool': (0.35, 0.65), 'smart': (0.21, 0.64), 'important': (0.4, 1.0), 'top': (0.5, 0.5),
+    'bad': (-0.7, 0.67), 'worst': (-1.0, 1.0), 'worse': (-0.4, 0.6), 'terrible': (-1.0, 1.0),
+    'awful': (-1.0, 1.0), 'hate': (-0.8, 0.9), 'sad': (-0.5, 1.0), 'wrong': (-0.5, 0.9),
+    'poor': (-0.4, 0.6), 'angry': (-0.5, 1.0), 'dead': (-0.2, 0.4), 'fake': (-0.5, 1.0),
+    'difficult': (-0.5, 1.0), 'hard': (-0.29, 0.54), 'problem': (-0.3, 0.5), 'fail': (-0.5, 0.3),
+    'dangerous': (-0.6, 0.9), 'crazy': (-0.6, 0.9), 'stupid': (-0.8, 1.0), 'boring': (-1.0, 1.0),
+    'killed': (-0.2, 0.0), 'crisis': (-0.3, 0.3), 'attack': (-0.3, 0.3), 'lost': (-0.2, 0.3),
+}
+
+CHANNEL_ALIASES = {
+    'lifestyle': 'lifestyle', 'entertainment': 'entertainment', 'business': 'bus',
+    'bus': 'bus', 'social media': 'socmed', 'social-media': 'socmed', 'socmed': 'socmed',
+    'tech': 'tech', 'technology': 'tech', 'world': 'world',
+}
+KEYWORD_META = ('keywords', 'news_keywords')
+DATE_META = ('article:published_time', 'date', 'pubdate', 'publish-date', 'sailthru.date')
+SECTION_META = ('article:section', 'section', 'channel')
+
+
+def load_lexicon(path):
+    """Read a word,polarity,subjectivity CSV into a lexicon dict"""
+    lexicon = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for word, polarity, subjectivity in csv.reader(f):
+            lexicon[word.lower()] = (float(polarity), float(subjectivity))
+    return lexicon
+
+
+class Vocabulary:
+    """Interned token ids with per-token attributes stored in id-aligned arrays
+
+    Each distinct token is looked up in the lexicon and stop-word list once; afterwards
+    a document is just an int32 array and every statistic is an array gather.
+    """
+
+    def __init__(self, lexicon=None):
+        self.lexicon = DEFAULT_LEXICON if lexicon is None else lexicon
+        self.ids = {}
+        self._arrays_size = 0
+
+    def encode(self, tokens):
+        ids = self.ids
+        return np.fromiter((ids.setdefault(token, len(ids)) for token in tokens),
+                           dtype=np.int32, count=len(tokens))
+
+    def _refresh(self):
+        """Extend the attribute arrays to cover tokens interned since the last call"""
+        new_tokens = list(self.ids)[self._arrays_size:]
+        if not new_tokens and self._arrays_size:
+            return
+        lengths = np.array([len(t) for t in new_tokens], dtype=np.float64)
+        stop = np.array([t in STOP_WORDS for t in new_tokens], dtype=bool)
+        scores = [self.lexicon.get(t) for t in new_tokens]
+        in_lexicon = np.array([s is not None for s in scores], dtype=bool)
+        polarity = np.array([s[0] if s else 0.0 for s in scores], dtype=np.float64)
+        subjectivity = np.array([s[1] if s else 0.0 for s in scores], dtype=np.float64)
+        if self._arrays_size:
+            self.length = np.concatenate([self.length, lengths])
+            self.stop = np.concatenate([self.stop, stop])
+            self.in_lexicon = np.concatenate([self.in_lexicon, in_lexicon])
+            self.polarity = np.concatenate([self.polarity, polarity])
+            self.subjectivity = np.concatenate([self.subjectivity, subjectivity])
+        else:
+            self.length, self.stop, self.in_lexicon = lengths, stop, in_lexicon
+            self.polarity, self.subjectivity = polarity, subjectivity
+        self._arrays_size = len(self.ids)
+
+
+class _FeatureParser(HTMLParser):
+    """Single pass over the tag stream collecting text, links, media and metadata"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+    CONTENT_TAGS = {s for s in CONTENT_SELECTORS if not s.startswith('.')}
+    CONTENT_CLASSES = {s[1:] for s in CONTENT_SELECTORS if s.startswith('.')}
+
+    def __init__(self, url):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.host = urlparse(url).hostname or ''
+        self.title_parts = None
+        self.title = ''
+        self.title_depth = 0
+        self.body_parts = []
+        self.content_parts = []
+        self.content_depth = 0
+        self.content_done = False
+        self.skip_depth = 0
+        self.depth = 0
+        self.num_hrefs = 0
+        self.num_self_hrefs = 0
+        self.self_links = []
+        self.num_imgs = 0
+        self.num_videos = 0
+        self.keywords = []
+        self.published = None
+        self.section = None
+
+    def _is_content(self, tag, attrs):
+        if tag in self.CONTENT_TAGS:
+            return True
+        classes = attrs.get('class')
+        return bool(classes and self.CONTENT_CLASSES.intersection(classes.split()))
+
+    def _count_link(self, href):
+        if not href or href.startswith(('#', 'mailto:', 'javascript:')):
+            return
+        absolute = urljoin(self.url, href)
+        host = urlparse(absolute).hostname or ''
+        self.num_hrefs += 1
+        if host == self.host or any(host == h or host.endswith('.' + h) for h in SELF_HOSTS):
+            self.num_self_hrefs += 1
+            self.self_links.append(absolute.split('#')[0])
+
+    def _meta(self, attrs):
+        name = (attrs.get('name') or attrs.get('property') or '').lower()
+        value = attrs.get('content') or ''
+        if name in KEYWORD_META:
+            self.keywords = [k.strip() for k in value.split(',') if k.strip()]
+        elif name in DATE_META and self.published is None:
+            self.published = value
+        elif name in SECTION_META and self.section is None:
+            self.section = value
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            self._meta(attrs)
+        elif tag == 'a':
+            self._count_link(attrs.get('href'))
+        elif tag == 'img':
+            self.num_imgs += 1
+        elif tag in ('video', 'object') or (tag in ('iframe', 'embed') and
+                                            VIDEO_SRC_RE.search(attrs.get('src') or '')):
+            self.num_videos += 1
+        if tag in self.VOID_TAGS:
+            return
+        self.depth += 1
+        if tag in self.SKIP_TAGS and not self.skip_depth:
+            self.skip_depth = self.depth
+        if not self.title and self.title_parts is None and tag in ('h1', 'title'):
+            self.title_parts = []
+            self.title_depth = self.depth
+        if not self.content_done and not self.content_depth and self._is_content(tag, attrs):
+            self.content_depth = self.depth
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return
+        if self.skip_depth and self.depth <= self.skip_depth:
+            self.skip_depth = 0
+        if self.title_parts is not None and self.depth <= self.title_depth:
+            self.title = ''.join(self.title_parts).strip()
+            self.title_parts = None
+        if self.content_depth and self.depth <= self.content_depth:
+            self.content_depth = 0
+            self.content_done = bool(''.join(self.content_parts).strip())
+            if not self.content_done:
+                self.content_parts = []
+        self.depth = max(0, self.depth - 1)
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+        if self.content_depth:
+            self.content_parts.append(data)
+        self.body_parts.append(data)
+
+
+def parse_page(url, html):
+    """Tokenize one page; returns the parser with its counters and text"""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    parser = _FeatureParser(url)
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def _publication_weekday(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace('Z', '+00:00')).weekday()
+    except ValueError:
+        return None
+
+
+def _per_doc(values, doc, n_docs):
+    return np.bincount(doc, weights=values, minlength=n_docs)
+
+
+def _safe_divide(numerator, denominator):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), 0.0)
+
+
+def _sentiment(vocab, ids, doc, n_docs, n_tokens):
+    """Pattern-style sentiment features for a batch of concatenated documents"""
+    polarity = vocab.polarity[ids]
+    rated = vocab.in_lexicon[ids]
+    positive = polarity > 0
+    negative = polarity < 0
+    n_rated = _per_doc(rated, doc, n_docs)
+    n_pos = _per_doc(positive, doc, n_docs)
+    n_neg = _per_doc(negative, doc, n_docs)
+
+    pos_min = np.full(n_docs, np.inf)
+    pos_max = np.zeros(n_docs)
+    neg_min = np.zeros(n_docs)
+    neg_max = np.full(n_docs, -np.inf)
+    np.minimum.at(pos_min, doc[positive], polarity[positive])
+    np.maximum.at(pos_max, doc[positive], polarity[positive])
+    np.minimum.at(neg_min, doc[negative], polarity[negative])
+    np.maximum.at(neg_max, doc[negative], polarity[negative])
+
+    return {
+        'subjectivity': _safe_divide(_per_doc(vocab.subjectivity[ids], doc, n_docs), n_rated),
+        'polarity': _safe_divide(_per_doc(polarity, doc, n_docs), n_rated),
+        'rate_positive': _safe_divide(n_pos, n_tokens),
+        'rate_negative': _safe_divide(n_neg, n_tokens),
+        'positive_share': _safe_divide(n_pos, n_pos + n_neg),
+        'negative_share': _safe_divide(n_neg, n_pos + n_neg),
+        'avg_positive': _safe_divide(_per_doc(np.where(positive, polarity, 0), doc, n_docs), n_pos),
+        'min_positive': np.where(n_pos > 0, pos_min, 0.0),
+        'max_positive': pos_max,
+        'avg_negative': _safe_divide(_per_doc(np.where(negative, polarity, 0), doc, n_docs), n_neg),
+        'min_negative': neg_min,
+        'max_negative': np.where(n_neg > 0, neg_max, 0.0),
+    }
+
+
+def _flatten(id_arrays):
+    lengths = np.array([len(ids) for ids in id_arrays], dtype=np.int64)
+    doc = np.repeat(np.arange(len(id_arrays)), lengths)
+    ids = np.concatenate(id_arrays) if id_arrays else np.empty(0, dtype=np.int32)
+    return ids, doc, lengths.astype(np.float64)
+
+
+def extract_features_batch(pages, vocab=None, share_index=None):
+    """Compute the dataset's predictive features for many (url, html) pages at once
+
+    HTML is tokenized page by page (one pass each); all counting, unique-token and
+    sentiment statistics then run as array operations over the concatenated batch.
+    kw_* and self_reference_* come from `share_index` (a share_index.ShareIndex) when
+    given, leaving each page's own indexed shares out; they and LDA_* cannot be
+    derived from one page and are otherwise NaN.
+    Returns a DataFrame with a url column followed by FEATURE_COLUMNS.
+    """
+    vocab = vocab or Vocabulary()
+    parsed = [parse_page(url, html) for url, html in pages]
+    n_docs = len(parsed)
+
+    content_ids, title_ids = [], []
+    for page in parsed:
+        text = ''.join(page.content_parts if page.content_done else page.body_parts)
+        content_ids.append(vocab.encode(TOKEN_RE.findall(text.lower())))
+        title_ids.append(vocab.encode(TOKEN_RE.findall(page.title.lower())))
+    vocab._refresh()
+
+    ids, doc, n_tokens = _flatten(content_ids)
+    non_stop = ~vocab.stop[ids]
+    n_non_stop = _per_doc(non_stop, doc, n_docs)
+    # Distinct (doc, token) pairs via one unique over a combined key
+    vocab_size = max(len(vocab.ids), 1)
+    keys = np.unique(doc.astype(np.int64) * vocab_size + ids)
+    unique_doc, unique_ids = keys // vocab_size, keys % vocab_size
+    n_unique = np.bincount(unique_doc, minlength=n_docs).astype(np.float64)
+    n_unique_non_stop = _per_doc(~vocab.stop[unique_ids], unique_doc, n_docs)
+    content = _sentiment(vocab, ids, doc, n_docs, n_tokens)
+
+    t_ids, t_doc, n_title_tokens = _flatten(title_ids)
+    title = _sentiment(vocab, t_ids, t_doc, n_docs, n_title_tokens)
+
+    features = {
+        'url': [url for url, _ in pages],
+        'n_tokens_title': n_title_tokens,
+        'n_tokens_content': n_tokens,
+        'n_unique_tokens': _safe_divide(n_unique, n_tokens),
+        'n_non_stop_words': _safe_divide(n_non_stop, n_tokens),
+        'n_non_stop_unique_tokens': _safe_divide(n_unique_non_stop, n_non_stop),
+        'num_hrefs': [p.num_hrefs for p in parsed],
+        'num_self_hrefs': [p.num_self_hrefs for p in parsed],
+        'num_imgs': [p.num_imgs for p in parsed],
+        'num_videos': [p.num_videos for p in parsed],
+        'average_token_length': _safe_divide(_per_doc(vocab.length[ids], doc, n_docs), n_tokens),
+        'num_keywords': [len(p.keywords) for p in parsed],
+    }
+    channels = [CHANNEL_ALIASES.get((p.section or '').strip().lower()) for p in parsed]
+    for channel in CHANNELS:
+        features[f'data_channel_is_{channel}'] = [c == channel for c in channels]
+    if share_index is not None:
+        history = share_index.features([p.keywords for p in parsed], [p.self_links for p in parsed],
+                                       [url for url, _ in pages])
+        features.update({column: history[column].to_numpy() for column in KEYWORD_COLUMNS})
+    else:
+        features.update({column: np.full(n_docs, np.nan) for column in KEYWORD_COLUMNS})
+    features.update({column: np.full(n_docs, np.nan) for column in LDA_COLUMNS})
+    weekdays = [_publication_weekday(p.published) for p in parsed]
+    for i, day in enumerate(WEEKDAYS):
+        features[f'weekday_is_{day}'] = [w == i for w in weekdays]
+    features['is_weekend'] = [w is not None and w >= 5 for w in weekdays]
+
+    features.update({
+        'global_subjectivity': content['subjectivity'],
+        'global_sentiment_polarity': content['polarity'],
+        'global_rate_positive_words': content['rate_positive'],
+        'global_rate_negative_words': content['rate_negative'],
+        'rate_positive_words': content['positive_share'],
+        'rate_negative_words': content['negative_share'],
+        'avg_positive_polarity': content['avg_positive'],
+        'min_positive_polarity': content['min_positive'],
+        'max_positive_polarity': content['max_positive'],
+        'avg_negative_polarity': content['avg_negative'],
+        'min_negative_polarity': content['min_negative'],
+        'max_negative_polarity': content['max_negative'],
+        'title_subjectivity': title['subjectivity'],
+        'title_sentiment_polarity': title['polarity'],
+        'abs_title_subjectivity': np.abs(0.5 - title['subjectivity']),
+        'abs_title_sentiment_polarity': np.abs(title['polarity']),
+    })
+    df = pd.DataFrame(features)[['url'] + FEATURE_COLUMNS]
+    return df.astype({c: column_dtype(c) for c in FEATURE_COLUMNS})
+
+
+def extract_features(url, html, vocab=None, share_index=None):
+    """Feature dict for a single page"""
+    return extract_features_batch([(url, html)], vocab, share_index).iloc[0].to_dict()
+
+
+def iter_cached_pages(directory):
+    """(url, body) pairs from an HTTP cache directory or a folder of *.html files"""
+    for meta_path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        body_path = meta_path[:-len('.json')] + '.body'
+        if os.path.exists(body_path):
+            with open(meta_path, encoding='utf-8') as f:
+                url = json.load(f)['url']
+            with open(body_path, 'rb') as f:
+                yield url, f.read()
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            yield 'file://' + os.path.abspath(path), f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute dataset features from crawled article HTML")
+    parser.add_argument('pages', nargs='?', default='.http_cache',
+                        help="HTTP cache directory or folder of *.html files")
+    parser.add_argument('--batch-size', type=int, default=256, help="pages per vectorized batch")
+    parser.add_argument('--lexicon', default=None, help="word,polarity,subjectivity CSV")
+    parser.add_argument('--output', default=None, help="write the features to this CSV")
+    parser.add_argument('--share-index', default=None, help="share_index.py directory for the kw_* features")
+    args = parser.parse_args()
+
+    vocab = Vocabulary(load_lexicon(args.lexicon) if args.lexicon else None)
+    share_index = None
+    if args.share_index:
+        from share_index import ShareIndex
+        share_index = ShareIndex.load(args.share_index)
+    pages = list(iter_cached_pages(args.pages))
+    if not pages:
+        raise SystemExit(f"No cached pages found in '{args.pages}'")
+
+    start = time.perf_counter()
+    frames = [extract_features_batch(pages[i:i + args.batch_size], vocab, share_index)
+              for i in range(0, len(pages), args.batch_size)]
+    elapsed = time.perf_counter() - start
+    features = pd.concat(frames, ignore_index=True)
+
+    print(f"Extracted {len(FEATURE_COLUMNS)} features from {len(pages):,} pages in {elapsed:.2f}s "
+          f"({len(pages) / elapsed:,.0f} pages/s, vocabulary {len(vocab.ids):,} tokens)")
+    missing = LDA_COLUMNS if share_index else KEYWORD_COLUMNS + LDA_COLUMNS
+    print(f"Not derivable from HTML (left empty): {', '.join(missing)}")
+    print(features[['url', 'n_tokens_title', 'n_tokens_content', 'num_hrefs', 'num_imgs',
+                    'global_sentiment_polarity']].head(10).to_string(index=False))
+    if args.output:
+        features.to_csv(args.output, index=False)
+        print(f"Features saved to '{args.output}'")
@@ -0,0 +1,279 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+STORE_VERSION = 1
+BLOCK_RECORDS = 64  # strings per compressed block: larger compresses better, smaller reads less
+BLOCK_CACHE = 16
+
+RECORD_DTYPE = np.dtype([
+    ('original_index', np.int64), ('shares', np.int64), ('word_count', np.int32),
+    ('domain', np.uint32), ('status', np.uint32), ('text', np.int64),
+])
+
+
+def available_codecs():
+    codecs = ['zlib']
+    if lz4 is not None:
+        codecs.insert(0, 'lz4')
+    if zstandard is not None:
+        codecs.insert(0, 'zstd')
+    return codecs
+
+
+DEFAULT_CODEC = available_codecs()[0]
+
+
+def compress(data, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    if codec == 'lz4':
+        return lz4.frame.compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'lz4':
+        return lz4.frame.decompress(data)
+    return zlib.decompress(data)
+
+
+def content_hash(text):
+    """Whitespace-insensitive hash so re-rendered copies of the same page dedupe"""
+    return hashlib.blake2b(' '.join(text.split()).encode('utf-8'), digest_size=16).digest()
+
+
+class _BlockWriter:
+    """Appends strings to a file of compressed blocks of BLOCK_RECORDS strings each"""
+
+    def __init__(self, path, codec):
+        self.file = open(path, 'wb')
+        self.codec = codec
+        self.pending = []
+        self.offsets = [0]
+        self.count = 0
+        self.raw_bytes = 0
+
+    def add(self, text):
+        self.pending.append(text.encode('utf-8'))
+        self.count += 1
+        if len(self.pending) == BLOCK_RECORDS:
+            self._flush()
+        return self.count - 1
+
+    def _flush(self):
+        if not self.pending:
+            return
+        # Block layout: uint32 end offset of each string, then the concatenated strings
+        ends = np.cumsum([len(b) for b in self.pending], dtype=np.uint32)
+        payload = ends.tobytes() + b''.join(self.pending)
+        self.raw_bytes += len(payload)
+        self.file.write(compress(payload, self.codec))
+        self.offsets.append(self.file.tell())
+        self.pending = []
+
+    def close(self):
+        self._flush()
+        self.file.close()
+        return np.array(self.offsets, dtype=np.int64)
+
+
+class ArticleStoreWriter:
+    """Write crawl records into a compact, compressed, deduplicated store
+
+    Article text is stored once per distinct content hash; URLs and titles go to
+    their own block file, domains and statuses are interned, and the numeric fields
+    form one fixed-width record array.
+    """
+
+    def __init__(self, path, codec=DEFAULT_CODEC):
+        if codec not in available_codecs():
+            raise ValueError(f"codec '{codec}' is not available, choose from {available_codecs()}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.codec = codec
+        self.texts = _BlockWriter(os.path.join(path, 'texts.bin'), codec)
+        self.meta = _BlockWriter(os.path.join(path, 'meta.bin'), codec)
+        self.text_ids = {}
+        self.domains = {}
+        self.statuses = {}
+        self.records = []
+
+    def add(self, record):
+        text = record.get('content', record.get('content_preview', '')) or ''
+        key = content_hash(text)
+        text_id = self.text_ids.get(key)
+        if text_id is None:
+            text_id = self.text_ids[key] = self.texts.add(text)
+        self.meta.add(record['url'] + '\n' + (record.get('title') or ''))
+        self.records.append((
+            record['original_index'], record.get('shares', 0), record.get('word_count', 0),
+            self.domains.setdefault(record.get('domain', ''), len(self.domains)),
+            self.statuses.setdefault(record.get('status', ''), len(self.statuses)),
+            text_id,
+        ))
+
+    def close(self):
+        np.save(os.path.join(self.path, 'texts.offsets.npy'), self.texts.close())
+        np.save(os.path.join(self.path, 'meta.offsets.npy'), self.meta.close())
+        records = np.array(self.records, dtype=RECORD_DTYPE)
+        np.save(os.path.join(self.path, 'records.npy'), records)
+        np.save(os.path.join(self.path, 'order.npy'), np.argsort(records['original_index'], kind='stable'))
+        manifest = {
+            'version': STORE_VERSION, 'codec': self.codec, 'block_records': BLOCK_RECORDS,
+            'records': len(records), 'unique_texts': self.texts.count,
+            'raw_text_bytes': self.texts.raw_bytes, 'raw_meta_bytes': self.meta.raw_bytes,
+            'domains': list(self.domains), 'statuses': list(self.statuses),
+        }
+        with open(os.path.join(self.path, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+class _BlockReader:
+    """Random access to strings, decompressing only the blocks that are asked for"""
+
+    def __init__(self, path, codec):
+        self.path = path + '.bin'
+        self.offsets = np.load(path + '.offsets.npy')
+        self.codec = codec
+        self.cache = OrderedDict()
+
+    def _block(self, number):
+        payload = self.cache.get(number)
+        if payload is not None:
+            self.cache.move_to_end(number)
+            return payload
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[number])
+            payload = decompress(f.read(self.offsets[number + 1] - self.offsets[number]), self.codec)
+        self.cache[number] = payload
+        if len(self.cache) > BLOCK_CACHE:
+            self.cache.popitem(last=False)
+        return payload
+
+    def get(self, string_id, n_strings):
+        number, position = divmod(int(string_id), BLOCK_RECORDS)
+        payload = self._block(number)
+        count = min(BLOCK_RECORDS, n_strings - number * BLOCK_RECORDS)
+        ends = np.frombuffer(payload, np.uint32, count)
+        start = int(ends[position - 1]) if position else 0
+        base = 4 * count
+        return payload[base + start:base + int(ends[position])].decode('utf-8')
+
+
+class ArticleStore:
+    """Lazy reader: records are looked up by `original_index` and decoded on demand"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        codec = self.manifest['codec']
+        if codec not in available_codecs():
+            raise ImportError(f"this store was written with '{codec}'; install the matching package")
+        self.records = np.load(os.path.join(path, 'records.npy'), mmap_mode='r')
+        self.order = np.load(os.path.join(path, 'order.npy'), mmap_mode='r')
+        self.sorted_index = self.records['original_index'][self.order]
+        self.texts = _BlockReader(os.path.join(path, 'texts'), codec)
+        self.meta = _BlockReader(os.path.join(path, 'meta'), codec)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, original_index):
+        return self._position(original_index) is not None
+
+    def _position(self, original_index):
+        i = int(np.searchsorted(self.sorted_index, original_index))
+        if i < len(self.sorted_index) and self.sorted_index[i] == original_index:
+            return int(self.order[i])
+        return None
+
+    def _record(self, position, fields):
+        row = self.records[position]
+        record = {'original_index': int(row['original_index'])}
+        if fields is None or {'url', 'title'} & fields:
+            url, title = self.meta.get(position, len(self.records)).split('\n', 1)
+            record.update(url=url, title=title)
+        record.update(domain=self.manifest['domains'][row['domain']], shares=int(row['shares']),
+                      status=self.manifest['statuses'][row['status']], word_count=int(row['word_count']))
+        if fields is None or 'content' in fields:
+            record['content'] = self.texts.get(row['text'], self.manifest['unique_texts'])
+        return record
+
+    def get(self, original_index, fields=None):
+        """One record as a dict; `fields` (e.g. {'url', 'content'}) skips decoding the rest"""
+        position = self._position(original_index)
+        if position is None:
+            raise KeyError(original_index)
+        return self._record(position, set(fields) if fields else None)
+
+    def __iter__(self):
+        """All records in storage order (each block is decompressed once)"""
+        for position in range(len(self.records)):
+            yield self._record(position, None)
+
+
+def iter_records(path):
+    """Records from crawl.py JSONL or a fetch_url_content.py JSON array"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def pack(source, store_path, codec=DEFAULT_CODEC):
+    writer = ArticleStoreWriter(store_path, codec)
+    for record in iter_records(source):
+        writer.add(record)
+    return writer.close()
+
+
+def store_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact compressed storage for crawled articles")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    pack_parser = subparsers.add_parser('pack', help="convert crawl JSONL / analysis JSON into a store")
+    pack_parser.add_argument('source', help="url_content_crawl.jsonl or url_content_analysis.json")
+    pack_parser.add_argument('--codec', choices=available_codecs(), default=DEFAULT_CODEC)
+    get_parser = subparsers.add_parser('get', help="print records by original_index")
+    get_parser.add_argument('indices', nargs='+', type=int)
+    parser.add_argument('--store', default='articles.store', help="store directory")
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        start = time.perf_counter()
+        manifest = pack(args.source, args.store, args.codec)
+        elapsed = time.perf_counter() - start
+        source_mb = os.path.getsize(args.source) / 1024 / 1024
+        store_mb = store_bytes(args.store) / 1024 / 1024
+        print(f"Packed {manifest['records']:,} records ({manifest['unique_texts']:,} distinct texts, "
+              f"{manifest['records'] - manifest['unique_texts']:,} duplicates) in {elapsed:.2f}s with {args.codec}")
+        print(f"Size: {source_mb:.2f} MB -> {store_mb:.2f} MB ({source_mb / store_mb:.1f}x smaller)")
+    else:
+        store = ArticleStore(args.store)
+        for index in args.indices:
+            print(json.dumps(store.get(index), ensure_ascii=False, indent=2))
@@ -0,0 +1,58 @@
+import argparse
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from dataset import DATASET_PATH, load_dataset
+
+
+def timed(fn, repeats):
+    """Return (best seconds, result) over `repeats` calls"""
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def read_csv_baseline(csv_path):
+    """What every script used to do on its own"""
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CSV parsing with the cached dataset loader")
+    parser.add_argument('--csv', default=DATASET_PATH, help="dataset CSV")
+    parser.add_argument('--repeats', type=int, default=3, help="timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='dataset_cache_')
+    try:
+        baseline_time, baseline_df = timed(lambda: read_csv_baseline(args.csv), args.repeats)
+        start = time.perf_counter()
+        load_dataset(args.csv, cache_dir=cache_dir)
+        cold_time = time.perf_counter() - start
+        warm_time, cached_df = timed(lambda: load_dataset(args.csv, cache_dir=cache_dir), args.repeats)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    baseline_mb = baseline_df.memory_usage(deep=True).sum() / 1024 / 1024
+    cached_mb = cached_df.memory_usage(deep=True).sum() / 1024 / 1024
+    numeric_baseline_mb = baseline_df.drop(columns='url').memory_usage().sum() / 1024 / 1024
+    numeric_cached_mb = cached_df.drop(columns='url').memory_usage().sum() / 1024 / 1024
+
+    print("="*60)
+    print("DATASET LOAD BENCHMARK")
+    print("="*60)
+    print(f"Rows: {len(cached_df):,}, columns: {len(cached_df.columns)}")
+    print(f"pd.read_csv + strip:        {baseline_time * 1000:8.1f} ms")
+    print(f"load_dataset (cold, build): {cold_time * 1000:8.1f} ms")
+    print(f"load_dataset (warm cache):  {warm_time * 1000:8.1f} ms  ({baseline_time / warm_time:.1f}x faster)")
+    print(f"Memory, all columns:        {baseline_mb:8.1f} MB -> {cached_mb:.1f} MB")
+    print(f"Memory, numeric columns:    {numeric_baseline_mb:8.1f} MB -> {numeric_cached_mb:.1f} MB "
+          f"({(1 - numeric_cached_mb / numeric_baseline_mb) * 100:.0f}% smaller)")
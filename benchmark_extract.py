@@ -0,0 +1,65 @@
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from html_extract import EXTRACTORS, lxml
+
+
+def load_fixtures(fixture_dir):
+    """Load saved pages: *.html fixtures or *.body files from the HTTP cache"""
+    paths = sorted(glob.glob(os.path.join(fixture_dir, '*.html')) +
+                   glob.glob(os.path.join(fixture_dir, '*.body')))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def benchmark_backend(extractor, pages, repeats=3):
+    """Return per-page parse times in milliseconds (best of `repeats` per page)"""
+    times = []
+    for page in pages:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            extractor(page)
+            best = min(best, time.perf_counter() - start)
+        times.append(best * 1000)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction backends on saved pages")
+    parser.add_argument('fixture_dir', nargs='?', default='.http_cache',
+                        help="directory of saved pages (*.html or HTTP cache *.body files)")
+    parser.add_argument('--repeats', type=int, default=3, help="timing repeats per page")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixture_dir)
+    if not pages:
+        raise SystemExit(f"No *.html or *.body fixtures found in '{args.fixture_dir}'")
+    print(f"Benchmarking {len(pages)} pages ({sum(map(len, pages)) / 1024 / 1024:.1f} MB)")
+
+    reference = [EXTRACTORS['bs4'](page) for page in pages]
+    baseline = None
+
+    print("\n" + "="*72)
+    print(f"{'Backend':<10}{'Mean ms':>10}{'Median ms':>12}{'p95 ms':>10}{'Speedup':>10}{'Same title':>12}{'Same text':>11}")
+    print("="*72)
+    for name, extractor in EXTRACTORS.items():
+        if name == 'lxml' and lxml is None:
+            print(f"{name:<10}  skipped (lxml not installed)")
+            continue
+        times = benchmark_backend(extractor, pages, args.repeats)
+        results = [extractor(page) for page in pages]
+        same_title = sum(r['title'] == ref['title'] for r, ref in zip(results, reference)) / len(pages) * 100
+        same_text = sum(r['content_preview'] == ref['content_preview'] for r, ref in zip(results, reference)) / len(pages) * 100
+        mean = statistics.mean(times)
+        p95 = sorted(times)[int(len(times) * 0.95) - 1 if len(times) > 1 else 0]
+        if baseline is None:
+            baseline = mean
+        print(f"{name:<10}{mean:>10.2f}{statistics.median(times):>12.2f}{p95:>10.2f}"
+              f"{baseline / mean:>9.1f}x{same_title:>11.0f}%{same_text:>10.0f}%")
@@ -0,0 +1,106 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from dataset import load_dataset
+from scoring_server import create_server
+from train_models import MODEL_DIR
+
+
+def connect(host, port):
+    """Keep-alive connection with Nagle disabled (http.client writes headers and body separately)"""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    connection.connect()
+    connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+def client_loop(host, port, payloads, n_requests, latencies, errors):
+    """Send `n_requests` POSTs over one keep-alive connection, recording latencies"""
+    connection = connect(host, port)
+    for i in range(n_requests):
+        body = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        try:
+            connection.request('POST', '/predict', body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            connection = connect(host, port)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def fetch_metrics(host, port):
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    connection.request('GET', '/metrics')
+    metrics = json.loads(connection.getresponse().read())
+    connection.close()
+    return metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for scoring_server.py")
+    parser.add_argument('--url', default=None, help="running server (default: start one in-process)")
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'ridge_classifier.pkl'),
+                        help="model for the in-process server")
+    parser.add_argument('--clients', type=int, default=32, help="concurrent client connections")
+    parser.add_argument('--requests', type=int, default=200, help="requests per client")
+    parser.add_argument('--rows', type=int, default=1, help="articles per request")
+    parser.add_argument('--window-ms', type=float, default=2.0, help="batching window of the in-process server")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port
+    else:
+        server = create_server(args.model, port=0, window=args.window_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = '127.0.0.1', server.server_port
+
+    # Real article rows in the CSV column layout, as lists
+    df = load_dataset()
+    rows = df.sample(n=min(len(df), 1000), random_state=42).to_numpy().tolist()
+    payloads = [json.dumps({'rows': rows[i:i + args.rows]}).encode('utf-8')
+                for i in range(0, len(rows) - args.rows + 1, args.rows)]
+
+    latencies, errors = [], []
+    threads = [threading.Thread(target=client_loop, args=(host, port, payloads, args.requests, latencies, errors))
+               for _ in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    server_metrics = fetch_metrics(host, port)
+    print("="*60)
+    print("SCORING LOAD TEST")
+    print("="*60)
+    print(f"Clients: {args.clients}, requests: {len(latencies):,} ok / {len(errors)} failed, "
+          f"{args.rows} row(s) per request")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/s, "
+          f"{len(latencies) * args.rows / elapsed:,.0f} articles/s")
+    if len(latencies):
+        print(f"Client latency: p50 {np.percentile(latencies, 50):.2f} ms, "
+              f"p99 {np.percentile(latencies, 99):.2f} ms")
+    print(f"Server latency: p50 {server_metrics['p50_ms']:.2f} ms, p99 {server_metrics['p99_ms']:.2f} ms, "
+          f"{server_metrics['batches']:,} predict calls, "
+          f"{server_metrics['mean_batch_rows']:.1f} rows per call on average")
+    if server is not None:
+        server.shutdown()
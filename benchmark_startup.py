@@ -0,0 +1,73 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from summary_snapshot import DATASET_PATH, load_approximate, load_snapshot
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TARGET_MS = 200
+
+# Import cost each subcommand pays before doing any work
+IMPORTS = [
+    'import summary_snapshot',                      # summary
+    'import dataset, aggregations, stats_store',    # report
+    'import dashboard',                             # visualize
+    'import fetch_url_content',                     # fetch / crawl
+    'import train_models',                          # train
+]
+
+
+def wall_ms(command, repeats, cwd):
+    """Best wall-clock time of a fresh interpreter running `command`"""
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure interpreter start-up and import cost of the CLI")
+    parser.add_argument('--csv', default=DATASET_PATH, help="dataset CSV")
+    parser.add_argument('--repeats', type=int, default=5, help="runs per command (best is reported)")
+    args = parser.parse_args()
+
+    cwd = os.path.dirname(os.path.abspath(args.csv))
+    csv_path = os.path.basename(args.csv)
+    # Make sure the snapshot and sketches exist so only the fast paths are timed
+    load_snapshot(args.csv)
+    load_approximate(args.csv)
+
+    python = sys.executable
+    interpreter = wall_ms([python, '-c', 'pass'], args.repeats, cwd)
+    print("="*64)
+    print("START-UP BENCHMARK")
+    print("="*64)
+    print(f"{'Command':<44}{'Best ms':>10}{'Imports ms':>12}")
+    print(f"{'python -c pass':<44}{interpreter:10.0f}")
+    for statement in IMPORTS:
+        ms = wall_ms([python, '-c', statement], args.repeats, cwd)
+        print(f"{statement:<44}{ms:10.0f}{ms - interpreter:12.0f}")
+
+    commands = {
+        'news.py summary': [python, os.path.join(HERE, 'news.py'), 'summary', '--csv', csv_path],
+        'data_summary.py': [python, os.path.join(HERE, 'data_summary.py'), '--csv', csv_path],
+        'news.py summary --approximate': [python, os.path.join(HERE, 'news.py'), 'summary',
+                                          '--csv', csv_path, '--approximate'],
+        'news.py summary --rebuild (full parse)': [python, os.path.join(HERE, 'news.py'), 'summary',
+                                                   '--csv', csv_path, '--rebuild'],
+    }
+    print()
+    results = {}
+    for label, command in commands.items():
+        results[label] = wall_ms(command, args.repeats, cwd)
+        print(f"{label:<44}{results[label]:10.0f}")
+
+    summary_ms = results['news.py summary']
+    verdict = 'OK' if summary_ms < TARGET_MS else 'SLOWER THAN TARGET'
+    print(f"\n`news.py summary`: {summary_ms:.0f} ms (target < {TARGET_MS} ms) -> {verdict}")
@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from aggregations import compute_aggregates
+from benchmark_extract import load_fixtures
+from dataset import CACHE_DIR, CHANNELS, WEEKDAYS, load_dataset, parse_csv
+from fetch_url_content import parse_article_content
+from html_extract import EXTRACTORS
+from stats_store import corr_with_target
+
+BASE_ROWS = 39644
+BENCH_DIR = os.path.join(CACHE_DIR, 'bench')
+RESULTS_DIR = 'benchmark_results'
+NAMES_PATH = 'OnlineNewsPopularity.names'
+
+
+def column_summary(names_path=NAMES_PATH):
+    """Column order and (min, max, mean, sd) from the Summary Statistics table of the .names file"""
+    columns, summary = [], {}
+    with open(names_path, encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    for match in re.finditer(r'^\s+\d+\. (\w+):', text, re.MULTILINE):
+        columns.append(match.group(1))
+    for match in re.finditer(r'^\s+(\w+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s*$', text, re.MULTILINE):
+        summary[match.group(1)] = tuple(float(v) for v in match.groups()[1:])
+    return columns, summary
+
+
+def synthetic_chunk(columns, summary, start, n_rows, rng):
+    """Rows with the real column layout and per-column ranges; flags are valid one-hot groups"""
+    channel = rng.integers(0, len(CHANNELS) + 1, n_rows)  # the extra code means "no channel"
+    weekday = rng.integers(0, len(WEEKDAYS), n_rows)
+    data = {}
+    for name in columns:
+        if name == 'url':
+            data[name] = [f'http://mashable.com/2014/01/01/synthetic-article-{i}/' for i in range(start, start + n_rows)]
+        elif name.startswith('data_channel_is_'):
+            data[name] = (channel == CHANNELS.index(name[len('data_channel_is_'):])).astype(np.int8)
+        elif name.startswith('weekday_is_'):
+            data[name] = (weekday == WEEKDAYS.index(name[len('weekday_is_'):])).astype(np.int8)
+        elif name == 'is_weekend':
+            data[name] = (weekday >= 5).astype(np.int8)
+        elif name == 'shares':
+            data[name] = np.maximum(rng.lognormal(7.25, 0.93, n_rows).astype(np.int64), 1)
+        else:
+            low, high, mean, sd = summary[name]
+            values = np.clip(rng.normal(mean, sd, n_rows), low, high)
+            data[name] = np.round(values) if name.startswith(('n_tokens_title', 'n_tokens_content', 'num_',
+                                                               'timedelta')) else values
+    return pd.DataFrame(data, columns=columns)
+
+
+def make_synthetic_csv(scale, directory=BENCH_DIR, seed=42, chunk_rows=100000):
+    """Write (once) a CSV with `scale` x 39,644 rows in the OnlineNewsPopularity.csv format"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'synthetic_{scale}x.csv')
+    if os.path.exists(path):
+        return path
+    columns, summary = column_summary()
+    rng = np.random.default_rng(seed)
+    n_rows = BASE_ROWS * scale
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(', '.join(columns) + '\n')  # the original header has a space after each comma
+        for start in range(0, n_rows, chunk_rows):
+            chunk = synthetic_chunk(columns, summary, start, min(chunk_rows, n_rows - start), rng)
+            chunk.to_csv(f, header=False, index=False, float_format='%.6g')
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_pages(n_pages=50, seed=42):
+    """Article-like HTML pages for when no saved fixtures are available"""
+    rng = np.random.default_rng(seed)
+    words = np.array('the a new social media tech app phone video world business great bad launch '
+                     'users twitter facebook google apple startup report study photos best'.split())
+    pages = []
+    for i in range(n_pages):
+        paragraphs = ''.join(f"<p>{' '.join(rng.choice(words, 80))}</p><a href='/2014/01/0{j % 9 + 1}/x-{j}/'>link</a>"
+                             f"<img src='/i/{j}.jpg'>" for j in range(int(rng.integers(5, 30))))
+        pages.append(f"<html><head><title>Synthetic article {i}</title>"
+                     f"<script>var tracking = {{}};</script></head><body><nav>{'<a href=/>menu</a>' * 40}</nav>"
+                     f"<h1>Synthetic article {i}</h1><article>{paragraphs}</article>"
+                     f"<footer>{'footer text ' * 50}</footer></body></html>".encode('utf-8'))
+    return pages
+
+
+def measure(fn, repeats):
+    """Best/median wall-clock seconds over `repeats` runs, then one traced run for peak memory"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'best_s': min(times), 'median_s': statistics.median(times), 'peak_mb': peak / 1024 / 1024}
+
+
+def dataset_benchmarks(csv_path, repeats):
+    """Hot paths of the four scripts on one dataset: load, report, aggregations, dashboard"""
+    from dashboard import prepare_panels, render_dashboard
+    from partitioned_dataset import load_partitioned, query_full_load, recent_channel_query
+    from report_engine import dataset_statistics
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_cache_')
+    try:
+        load_dataset(csv_path, cache_dir=cache_dir)  # cold build, not timed
+        df = load_dataset(csv_path, cache_dir=cache_dir)
+        aggregates = compute_aggregates(df)
+        partitioned = load_partitioned(csv_path, partition_dir=os.path.join(cache_dir, 'partitioned'))
+        columns, where = recent_channel_query()
+
+        def render():
+            panel_dir = tempfile.mkdtemp(dir=cache_dir)
+            with contextlib.redirect_stdout(io.StringIO()):  # keep the results table readable
+                render_dashboard(prepare_panels(df, aggregates), os.path.join(panel_dir, 'dashboard.png'),
+                                 cache_dir=panel_dir)
+
+        benchmarks = {
+            'load_csv': (lambda: parse_csv(csv_path), repeats),
+            'load_cached': (lambda: load_dataset(csv_path, cache_dir=cache_dir), repeats),
+            'describe': (lambda: df.describe(), repeats),
+            'corr_matrix': (lambda: df.select_dtypes(include=[np.number]).corr(), repeats),
+            'corr_with_target': (lambda: corr_with_target(df), repeats),
+            'aggregations': (lambda: compute_aggregates(df), repeats),
+            'report_statistics': (lambda: dataset_statistics(df), repeats),
+            'query_full_load': (lambda: query_full_load(csv_path, columns, where, cache_dir), repeats),
+            'query_partitioned': (lambda: partitioned.query(columns, where), repeats),
+            'dashboard_render': (render, 1),  # cold panel cache each run; seconds per run
+        }
+        for name, (fn, n) in benchmarks.items():
+            yield name, len(df), measure(fn, n)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def extraction_benchmarks(pages, repeats):
+    for backend in EXTRACTORS:
+        result = measure(lambda: [parse_article_content(page, backend) for page in pages], repeats)
+        result['per_page_ms'] = result['best_s'] / len(pages) * 1000
+        yield f'extract_{backend}', len(pages), result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print per-benchmark ratios against a previous run; return the regressions"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['name'], r['scale']): r for r in json.load(f)['results']}
+    regressions = []
+    print(f"\nComparison with '{baseline_path}' (regression threshold {threshold:.2f}x):")
+    for r in results:
+        old = baseline.get((r['name'], r['scale']))
+        if old is None:
+            continue
+        ratio = r['best_s'] / old['best_s'] if old['best_s'] else float('inf')
+        flag = 'REGRESSION' if ratio > threshold else ('faster' if ratio < 1 / threshold else '')
+        print(f"  {r['name']:<18} {r['scale']:>5}  {old['best_s'] * 1000:10.1f} -> {r['best_s'] * 1000:10.1f} ms"
+              f"  {ratio:5.2f}x  {flag}")
+        if ratio > threshold:
+            regressions.append(r)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of every script and store the results as JSON")
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10],
+                        help="synthetic dataset sizes in multiples of 39,644 rows; 100 is opt-in (~1.5 GB of disk)")
+    parser.add_argument('--csv', default=None, help="also benchmark this real dataset CSV")
+    parser.add_argument('--fixtures', default='.http_cache', help="saved pages for the extraction benchmark")
+    parser.add_argument('--repeats', type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument('--output', default=None, help=f"results JSON (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument('--compare', default=None, help="previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    datasets = [(f'{scale}x', make_synthetic_csv(scale)) for scale in args.scales]
+    if args.csv:
+        datasets.insert(0, ('real', args.csv))
+
+    results = []
+    print(f"{'Benchmark':<18}{'Scale':>7}{'Rows':>12}{'Best ms':>12}{'Median ms':>12}{'Peak MB':>10}")
+    print("-" * 71)
+
+    def record(name, scale, rows, result):
+        results.append(dict(name=name, scale=scale, rows=rows, **result))
+        print(f"{name:<18}{scale:>7}{rows:>12,}{result['best_s'] * 1000:12.1f}"
+              f"{result['median_s'] * 1000:12.1f}{result['peak_mb']:10.1f}")
+
+    for scale, csv_path in datasets:
+        for name, rows, result in dataset_benchmarks(csv_path, args.repeats):
+            record(name, scale, rows, result)
+
+    pages = load_fixtures(args.fixtures) if os.path.isdir(args.fixtures) else []
+    page_source = args.fixtures
+    if not pages:
+        pages, page_source = synthetic_pages(), 'synthetic'
+    for name, n_pages, result in extraction_benchmarks(pages, args.repeats):
+        record(name, 'pages', n_pages, result)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pages': page_source,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults saved to '{output}'")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
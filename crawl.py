@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import time
+from functools import partial
+
+import pandas as pd
+
+from fetch_engine import iter_fetch_concurrently
+from fetch_url_content import build_url_record, fetch_article_content
+from http_cache import ResponseCache
+from pipeline import StageMetrics, run_pipeline
+from html_extract import DEFAULT_EXTRACTOR, EXTRACTORS
+from retry_policy import CircuitBreaker, RetryPolicy
+import tracing
+
+
+class CrawlCheckpoint:
+    """Append-only log of completed `original_index` values, loaded into a bitmap on resume
+
+    A torn last line left by a crash (say "123" of "12345") is truncated away before
+    loading, so it never marks the wrong index as done.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = bytearray()
+        self.count = 0
+        repair_jsonl(path)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self._set(int(line))
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def _set(self, index):
+        byte, bit = divmod(index, 8)
+        if byte >= len(self.done):
+            self.done.extend(bytes(byte - len(self.done) + 1))
+        if not self.done[byte] & (1 << bit):
+            self.done[byte] |= 1 << bit
+            self.count += 1
+
+    def __contains__(self, index):
+        byte, bit = divmod(index, 8)
+        return byte < len(self.done) and bool(self.done[byte] & (1 << bit))
+
+    def mark(self, index):
+        """Record `index` as completed"""
+        self._set(index)
+        self.file.write(f"{index}\n")
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def repair_jsonl(path):
+    """Drop a partially written last line left behind by a crash"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # Walk back to the last complete line
+        position = size - 1
+        while position > 0:
+            step = min(65536, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+def iter_pending_urls(csv_path, checkpoint, chunksize=5000):
+    """Stream `(original_index, (url, shares))` pairs not yet in the checkpoint, chunk by chunk"""
+    chunks = pd.read_csv(csv_path, usecols=lambda c: c.strip() in ('url', 'shares'), chunksize=chunksize)
+    for chunk in chunks:
+        chunk.columns = chunk.columns.str.strip()
+        for idx, url, shares in zip(chunk.index, chunk['url'], chunk['shares']):
+            if idx not in checkpoint:
+                yield int(idx), (url, int(shares))
+
+
+def crawl_dataset(csv_path='OnlineNewsPopularity.csv', output_path='url_content_crawl.jsonl',
+                  checkpoint_path=None, max_workers=8, rate_per_host=0.5, cache=None,
+                  checkpoint_every=100, limit=None, extractor=DEFAULT_EXTRACTOR, parse_workers=0,
+                  retry_policy=None):
+    """Crawl every URL in the dataset, streaming one JSON record per line as each completes
+
+    Completed `original_index` values are logged to the checkpoint file after their
+    record is written, so re-running the crawl resumes where it stopped. A crash can
+    at worst repeat the records written since the last checkpoint flush. URLs that
+    failed transiently (circuit open, 429, 5xx, timeouts) are neither written nor
+    checkpointed, so the next run tries them again.
+    With `parse_workers` > 0, HTML parsing runs in a separate process pool.
+    Retry statistics for the run are printed and saved to `<output>.retries.json`.
+    """
+    checkpoint_path = checkpoint_path or output_path + '.checkpoint'
+    repair_jsonl(output_path)
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+    retry_policy = retry_policy or RetryPolicy()
+    if checkpoint.count:
+        print(f"Resuming crawl: {checkpoint.count:,} URLs already completed")
+
+    pending = iter_pending_urls(csv_path, checkpoint)
+    if limit is not None:
+        pending = (item for _, item in zip(range(limit), pending))
+
+    # The fetch engine only sees the URL; shares travel with the key
+    items = (((idx, shares), url) for idx, (url, shares) in pending)
+    metrics = None
+
+    processed = 0
+    deferred = 0
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out:
+        try:
+            if parse_workers:
+                metrics = StageMetrics()
+                completed = run_pipeline(items, max_io_workers=max_workers, max_parse_workers=parse_workers,
+                                         rate_per_host=rate_per_host, cache=cache, extractor=extractor,
+                                         metrics=metrics, policy=retry_policy)
+            else:
+                fetch_fn = partial(fetch_article_content, cache=cache, extractor=extractor, policy=retry_policy)
+                completed = iter_fetch_concurrently(items, fetch_fn, max_workers=max_workers,
+                                                    rate_per_host=rate_per_host)
+            for (idx, shares), url, content_data in completed:
+                record = build_url_record(idx, url, shares, content_data)
+                if record['transient']:
+                    deferred += 1
+                    continue
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.mark(idx)
+                processed += 1
+                if processed % checkpoint_every == 0:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    checkpoint.flush()
+                    elapsed = time.perf_counter() - start
+                    print(f"Crawled {processed:,} URLs ({processed / elapsed:.2f} URLs/s)")
+        finally:
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Crawl finished: {processed:,} new URLs in {elapsed:.1f}s ({rate:.2f} URLs/s), "
+          f"{checkpoint.count:,} completed in total")
+    if deferred:
+        print(f"Deferred {deferred:,} URLs after transient errors (circuit open, 429, 5xx, timeouts); "
+              f"re-run the crawl to retry them")
+    retry_policy.stats.report(retry_policy.breaker)
+    with open(output_path + '.retries.json', 'w', encoding='utf-8') as f:
+        json.dump(dict(retry_policy.stats.as_dict(), deferred=deferred,
+                       open_circuits=retry_policy.breaker.open_hosts()), f, indent=2)
+    if metrics is not None:
+        metrics.report()
+    if cache is not None:
+        cache.report()
+    return processed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumable full-corpus crawl with JSONL output")
+    parser.add_argument('--csv', default='OnlineNewsPopularity.csv', help="dataset to take URLs from")
+    parser.add_argument('--output', default='url_content_crawl.jsonl', help="append-only JSONL output file")
+    parser.add_argument('--checkpoint', default=None, help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--workers', type=int, default=8, help="number of concurrent fetch workers")
+    parser.add_argument('--rate-per-host', type=float, default=0.5, help="maximum requests per second per host")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="parse HTML in this many worker processes (0 parses on the fetch threads)")
+    parser.add_argument('--max-attempts', type=int, default=3, help="attempts per URL for transient errors")
+    parser.add_argument('--max-delay', type=float, default=30.0, help="cap of the exponential backoff in seconds")
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help="consecutive transient failures before a host is skipped")
+    parser.add_argument('--breaker-reset', type=float, default=60.0,
+                        help="seconds before a skipped host gets a trial request")
+    parser.add_argument('--limit', type=int, default=None, help="stop after this many new URLs")
+    parser.add_argument('--cache-dir', default='.http_cache', help="directory of the on-disk HTTP response cache")
+    parser.add_argument('--no-cache', action='store_true', help="always download pages from the network")
+    parser.add_argument('--extractor', choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR, help="HTML extraction backend")
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    tracing.start(args)
+
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    policy = RetryPolicy(max_attempts=args.max_attempts, max_delay=args.max_delay,
+                         breaker=CircuitBreaker(args.breaker_threshold, args.breaker_reset))
+    crawl_dataset(args.csv, args.output, args.checkpoint, max_workers=args.workers,
+                  rate_per_host=args.rate_per_host, cache=cache, limit=args.limit,
+                  extractor=args.extractor, parse_workers=args.parse_workers, retry_policy=policy)
+    tracing.finish(args)
@@ -0,0 +1,438 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import namedtuple
+from functools import partial
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from fetch_engine import iter_fetch_concurrently
+from fetch_url_content import build_url_record, fetch_article_content
+from http_cache import ResponseCache
+from html_extract import DEFAULT_EXTRACTOR, EXTRACTORS
+from retry_policy import CircuitBreaker, RetryPolicy
+import tracing
+
+QUEUE_PATH = 'crawl_queue.sqlite'
+SHARD_SIZE = 500
+LEASE_TIMEOUT = 300.0
+MAX_SHARD_ATTEMPTS = 5
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    original_index INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    shares INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY,
+    start INTEGER NOT NULL,          -- first original_index of the shard
+    stop INTEGER NOT NULL,           -- one past the last original_index
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    token TEXT,                      -- identifies the current lease; stale workers' reports are rejected
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    finished_at REAL,
+    retry_at REAL                    -- a requeued shard with transient failures waits until then
+);
+CREATE TABLE IF NOT EXISTS results (
+    original_index INTEGER PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS host_budget (
+    host TEXT PRIMARY KEY,
+    next_slot REAL NOT NULL          -- earliest time the next request to the host may start
+);
+"""
+
+Lease = namedtuple('Lease', ['shard', 'token', 'start', 'stop'])
+
+
+class CrawlQueue:
+    """Durable shard queue of the URL list in a SQLite file
+
+    The dataset is split into shards of consecutive `original_index` ranges. Workers
+    lease a shard for `lease_timeout` seconds, report finished records while they work
+    (which renews the lease) and finally mark the shard done. A shard whose lease ran
+    out, because its worker crashed or lost its connection, is leased to the next
+    worker that asks; records already reported for it are not fetched again. Only
+    final records (successes and permanent errors) are stored: a shard with URLs that
+    failed transiently goes back to pending and is retried later for just those URLs.
+    """
+
+    def __init__(self, path=QUEUE_PATH, busy_timeout=60.0):
+        self.path = path
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self.db = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _write(self):
+        """Write transaction that takes the database lock up front, so leasing never races"""
+        return _Transaction(self.db)
+
+    def load_csv(self, csv_path, shard_size=SHARD_SIZE, chunksize=5000):
+        """Fill an empty queue with the dataset's URLs and split them into shards"""
+        if self.db.execute('SELECT COUNT(*) FROM shards').fetchone()[0]:
+            raise ValueError(f"'{self.path}' already holds a crawl; use a new queue file")
+        chunks = pd.read_csv(csv_path, usecols=lambda c: c.strip() in ('url', 'shares'), chunksize=chunksize)
+        with self._write():
+            total = 0
+            for chunk in chunks:
+                chunk.columns = chunk.columns.str.strip()
+                rows = zip(chunk.index.tolist(), chunk['url'].tolist(), chunk['shares'].astype(int).tolist())
+                self.db.executemany('INSERT INTO urls VALUES (?, ?, ?)', rows)
+                total += len(chunk)
+            self.db.executemany('INSERT INTO shards (start, stop) VALUES (?, ?)',
+                                [(start, min(start + shard_size, total)) for start in range(0, total, shard_size)])
+        return total
+
+    def lease(self, worker, lease_timeout=LEASE_TIMEOUT, max_attempts=MAX_SHARD_ATTEMPTS):
+        """Lease the next pending or expired shard, or return None when there is none right now
+
+        A shard that has been leased `max_attempts` times without finishing is marked
+        failed instead, so one bad shard cannot crash every worker in turn.
+        """
+        now = time.time()
+        with self._write():
+            self.db.execute("UPDATE shards SET state = ?, worker = NULL, token = NULL "
+                            "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                            (FAILED, LEASED, now, max_attempts))
+            row = self.db.execute("SELECT id, start, stop FROM shards "
+                                  "WHERE (state = ? AND (retry_at IS NULL OR retry_at <= ?)) "
+                                  "OR (state = ? AND lease_expires < ?) ORDER BY id LIMIT 1",
+                                  (PENDING, now, LEASED, now)).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            self.db.execute("UPDATE shards SET state = ?, worker = ?, token = ?, lease_expires = ?, "
+                            "attempts = attempts + 1 WHERE id = ?",
+                            (LEASED, worker, token, now + lease_timeout, row[0]))
+        return Lease(row[0], token, row[1], row[2])
+
+    def pending_urls(self, lease):
+        """`(original_index, url, shares)` of the shard's URLs that have no result yet"""
+        return self.db.execute("SELECT u.original_index, u.url, u.shares FROM urls u "
+                               "LEFT JOIN results r ON r.original_index = u.original_index "
+                               "WHERE u.original_index >= ? AND u.original_index < ? AND r.original_index IS NULL "
+                               "ORDER BY u.original_index", (lease.start, lease.stop)).fetchall()
+
+    def report(self, lease, records, lease_timeout=LEASE_TIMEOUT, done=False, retry_after=None,
+               max_attempts=MAX_SHARD_ATTEMPTS):
+        """Store finished records and renew (or complete) the lease
+
+        With `done` and `retry_after` seconds, some of the shard's URLs failed
+        transiently: the shard goes back to pending and can be leased again after that
+        delay, or is marked failed once it has been leased `max_attempts` times.
+        Returns False, storing nothing, when the lease was lost to another worker.
+        """
+        now = time.time()
+        with self._write():
+            row = self.db.execute('SELECT token FROM shards WHERE id = ?', (lease.shard,)).fetchone()
+            if row is None or row[0] != lease.token:
+                return False
+            self.db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?)',
+                                [(record['original_index'], json.dumps(record, ensure_ascii=False))
+                                 for record in records])
+            if done and retry_after is not None:
+                self.db.execute('UPDATE shards SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                                'worker = NULL, token = NULL, retry_at = ? WHERE id = ?',
+                                (max_attempts, FAILED, PENDING, now + retry_after, lease.shard))
+            elif done:
+                self.db.execute('UPDATE shards SET state = ?, token = NULL, finished_at = ? WHERE id = ?',
+                                (DONE, now, lease.shard))
+            else:
+                self.db.execute('UPDATE shards SET lease_expires = ? WHERE id = ?',
+                                (now + lease_timeout, lease.shard))
+        return True
+
+    def release(self, lease):
+        """Give a shard back without waiting for its lease to expire"""
+        with self._write():
+            self.db.execute('UPDATE shards SET state = ?, worker = NULL, token = NULL WHERE id = ? AND token = ?',
+                            (PENDING, lease.shard, lease.token))
+
+    def retry_failed(self):
+        """Put failed shards back in the queue with a fresh attempt budget"""
+        with self._write():
+            return self.db.execute('UPDATE shards SET state = ?, attempts = 0, retry_at = NULL WHERE state = ?',
+                                   (PENDING, FAILED)).rowcount
+
+    def status(self):
+        """Shard counts by state, URL and result totals, and the active leases"""
+        states = dict(self.db.execute('SELECT state, COUNT(*) FROM shards GROUP BY state').fetchall())
+        now = time.time()
+        retrying = self.db.execute('SELECT COUNT(*) FROM shards WHERE state = ? AND retry_at > ?',
+                                   (PENDING, now)).fetchone()[0]
+        leases = self.db.execute('SELECT id, worker, lease_expires FROM shards WHERE state = ? ORDER BY id',
+                                 (LEASED,)).fetchall()
+        return {
+            'shards': {state: states.get(state, 0) for state in (PENDING, LEASED, DONE, FAILED)},
+            'retrying': retrying,
+            'urls': self.db.execute('SELECT COUNT(*) FROM urls').fetchone()[0],
+            'results': self.db.execute('SELECT COUNT(*) FROM results').fetchone()[0],
+            'leases': [{'shard': shard, 'worker': worker, 'expires_in': round(expires - now, 1)}
+                       for shard, worker, expires in leases],
+        }
+
+    def finished(self):
+        """True when no shard is pending or leased"""
+        return self.db.execute('SELECT COUNT(*) FROM shards WHERE state IN (?, ?)',
+                               (PENDING, LEASED)).fetchone()[0] == 0
+
+    def export(self, output_path):
+        """Write all results as crawl.py-style JSONL, ordered by original_index"""
+        count = 0
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            for (record,) in self.db.execute('SELECT record FROM results ORDER BY original_index'):
+                out.write(record + "\n")
+                count += 1
+        os.replace(tmp_path, output_path)
+        return count
+
+
+class SharedHostLimiter:
+    """Per-host request rate shared by every worker process using the same queue file
+
+    Each request reserves the next free start time for its host in the `host_budget`
+    table (one short write transaction) and sleeps until then, so `rate_per_host`
+    holds for the whole crawl however many worker processes or nodes run. Nodes'
+    clocks are assumed to agree to well within one request interval.
+    """
+
+    def __init__(self, queue_path, rate_per_host, busy_timeout=60.0):
+        self.rate_per_host = rate_per_host
+        # Shared by the fetch threads of this process, one transaction at a time
+        self.db = sqlite3.connect(queue_path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        """Wait for this process's turn to send a request to the host of `url`"""
+        if not self.rate_per_host:
+            return
+        host = urlparse(url).netloc
+        with self.lock, _Transaction(self.db):
+            now = time.time()
+            row = self.db.execute('SELECT next_slot FROM host_budget WHERE host = ?', (host,)).fetchone()
+            slot = max(now, row[0]) if row else now
+            self.db.execute('INSERT OR REPLACE INTO host_budget VALUES (?, ?)', (host, slot + 1 / self.rate_per_host))
+        time.sleep(max(0.0, slot - now))
+
+    def close(self):
+        self.db.close()
+
+
+class _Transaction:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+        return False
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def crawl_shard(queue, lease, fetch_fn, limiter, max_workers=8, lease_timeout=LEASE_TIMEOUT, retry_delay=60.0):
+    """Fetch one leased shard, reporting records every third of the lease timeout
+
+    URLs that fail transiently (circuit open, 429, 5xx, timeouts) get no result, and
+    the shard is requeued to retry them after `retry_delay` seconds. Returns
+    (records stored, URLs deferred), or None if the lease was lost midway.
+    """
+    items = [((idx, shares), url) for idx, url, shares in queue.pending_urls(lease)]
+    buffer = []
+    stored = deferred = 0
+    last_report = time.monotonic()
+    for (idx, shares), url, content_data in iter_fetch_concurrently(items, fetch_fn, max_workers=max_workers,
+                                                                     limiter=limiter):
+        record = build_url_record(idx, url, shares, content_data)
+        if record['transient']:
+            deferred += 1
+        else:
+            buffer.append(record)
+        if time.monotonic() - last_report >= lease_timeout / 3:
+            if not queue.report(lease, buffer, lease_timeout):
+                return None
+            stored += len(buffer)
+            buffer = []
+            last_report = time.monotonic()
+    if not queue.report(lease, buffer, lease_timeout, done=True, retry_after=retry_delay if deferred else None):
+        return None
+    return stored + len(buffer), deferred
+
+
+def run_worker(queue_path=QUEUE_PATH, max_workers=8, rate_per_host=0.5, lease_timeout=LEASE_TIMEOUT,
+               cache=None, extractor=DEFAULT_EXTRACTOR, retry_policy=None, poll_interval=5.0):
+    """Lease and crawl shards until the queue is finished
+
+    Shards with transient failures are retried once the circuit breaker's reset
+    window has passed.
+    """
+    queue = CrawlQueue(queue_path)
+    limiter = SharedHostLimiter(queue_path, rate_per_host)
+    name = worker_id()
+    retry_policy = retry_policy or RetryPolicy()
+    fetch_fn = partial(fetch_article_content, cache=cache, extractor=extractor, policy=retry_policy)
+    shards = records = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            lease = queue.lease(name, lease_timeout)
+            if lease is None:
+                if queue.finished():
+                    break
+                time.sleep(poll_interval)  # other workers hold the remaining shards; wait for them to expire
+                continue
+            try:
+                result = crawl_shard(queue, lease, fetch_fn, limiter, max_workers, lease_timeout,
+                                     retry_policy.breaker.reset_timeout)
+            except BaseException:
+                queue.release(lease)
+                raise
+            if result is None:
+                print(f"[{name}] lost the lease on shard {lease.shard}; its records were discarded")
+                continue
+            stored, deferred = result
+            shards += 1
+            records += stored
+            retry = f", {deferred:,} deferred after transient errors" if deferred else ""
+            print(f"[{name}] shard {lease.shard} ({lease.start}-{lease.stop - 1}) done: {stored:,} records{retry}")
+    finally:
+        limiter.close()
+        queue.close()
+    elapsed = time.perf_counter() - start
+    print(f"[{name}] finished: {shards:,} shards, {records:,} records in {elapsed:.1f}s")
+    retry_policy.stats.report(retry_policy.breaker)
+    return records
+
+
+def print_status(status):
+    shards = status['shards']
+    print(f"Shards: {shards[DONE]:,} done, {shards[LEASED]:,} leased, {shards[PENDING]:,} pending "
+          f"({status['retrying']:,} waiting to retry), {shards[FAILED]:,} failed; "
+          f"{status['results']:,}/{status['urls']:,} URLs crawled")
+    for lease in status['leases']:
+        print(f"  shard {lease['shard']}: {lease['worker']} (lease expires in {lease['expires_in']:.0f}s)")
+
+
+def run_local(queue_path, n_workers, worker_args, output_path=None, poll_interval=5.0):
+    """Start `n_workers` worker processes on this node and report progress until they exit"""
+    command = [sys.executable, os.path.abspath(__file__), '--queue', queue_path, 'worker'] + worker_args
+    processes = [subprocess.Popen(command) for _ in range(n_workers)]
+    queue = CrawlQueue(queue_path)
+    start = time.perf_counter()
+    try:
+        while any(process.poll() is None for process in processes):
+            time.sleep(poll_interval)
+            status = queue.status()
+            rate = status['results'] / (time.perf_counter() - start)
+            print(f"Progress: {status['results']:,}/{status['urls']:,} URLs ({rate:.2f} URLs/s)")
+        print_status(queue.status())
+        if output_path:
+            print(f"Exported {queue.export(output_path):,} records to '{output_path}'")
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        queue.close()
+    return [process.returncode for process in processes]
+
+
+def worker_arguments(args):
+    """Options of the `local` command that are forwarded to each worker process"""
+    forwarded = ['--workers', str(args.workers), '--rate-per-host', str(args.rate_per_host),
+                 '--lease-timeout', str(args.lease_timeout), '--max-attempts', str(args.max_attempts),
+                 '--breaker-threshold', str(args.breaker_threshold), '--breaker-reset', str(args.breaker_reset),
+                 '--poll-interval', str(args.poll_interval), '--cache-dir', args.cache_dir,
+                 '--extractor', args.extractor]
+    return forwarded + (['--no-cache'] if args.no_cache else [])
+
+
+def add_worker_options(parser):
+    parser.add_argument('--workers', type=int, default=8, help="concurrent fetch threads per worker process")
+    parser.add_argument('--rate-per-host', type=float, default=0.5,
+                        help="maximum requests per second per host, shared by all workers of the queue")
+    parser.add_argument('--lease-timeout', type=float, default=LEASE_TIMEOUT,
+                        help="seconds before an unreported shard is given to another worker")
+    parser.add_argument('--max-attempts', type=int, default=3, help="attempts per URL for transient errors")
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help="consecutive transient failures before a host is skipped")
+    parser.add_argument('--breaker-reset', type=float, default=60.0,
+                        help="seconds before a skipped host gets a trial request")
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                        help="seconds to wait when every remaining shard is leased or waiting to retry")
+    parser.add_argument('--cache-dir', default='.http_cache', help="directory of the on-disk HTTP response cache")
+    parser.add_argument('--no-cache', action='store_true', help="always download pages from the network")
+    parser.add_argument('--extractor', choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR,
+                        help="HTML extraction backend")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded crawl: a SQLite work queue leased by worker processes")
+    parser.add_argument('--queue', default=QUEUE_PATH, help="SQLite queue file (shared by all workers)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    init_parser = subparsers.add_parser('init', help="shard the dataset's URLs into a new queue")
+    init_parser.add_argument('--csv', default='OnlineNewsPopularity.csv', help="dataset to take URLs from")
+    init_parser.add_argument('--shard-size', type=int, default=SHARD_SIZE, help="URLs per shard")
+    worker_parser = subparsers.add_parser('worker', help="lease and crawl shards until the queue is finished")
+    add_worker_options(worker_parser)
+    tracing.add_arguments(worker_parser)
+    local_parser = subparsers.add_parser('local', help="run several worker processes on this node")
+    local_parser.add_argument('--processes', type=int, default=4, help="number of worker processes")
+    local_parser.add_argument('--output', default='url_content_crawl.jsonl', help="JSONL export when finished")
+    add_worker_options(local_parser)
+    subparsers.add_parser('status', help="show shard states and active leases")
+    subparsers.add_parser('retry-failed', help="requeue shards that exhausted their attempts")
+    export_parser = subparsers.add_parser('export', help="write the results as crawl.py-style JSONL")
+    export_parser.add_argument('--output', default='url_content_crawl.jsonl', help="JSONL output file")
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        tracing.start(args)
+        cache = None if args.no_cache else ResponseCache(args.cache_dir)
+        policy = RetryPolicy(max_attempts=args.max_attempts,
+                             breaker=CircuitBreaker(args.breaker_threshold, args.breaker_reset))
+        run_worker(args.queue, max_workers=args.workers, rate_per_host=args.rate_per_host,
+                   lease_timeout=args.lease_timeout, cache=cache, extractor=args.extractor, retry_policy=policy,
+                   poll_interval=args.poll_interval)
+        tracing.finish(args)
+    elif args.command == 'local':
+        run_local(args.queue, args.processes, worker_arguments(args), args.output)
+    else:
+        queue = CrawlQueue(args.queue)
+        if args.command == 'init':
+            total = queue.load_csv(args.csv, args.shard_size)
+            print(f"Queued {total:,} URLs in {queue.status()['shards'][PENDING]:,} shards of {args.shard_size}")
+        elif args.command == 'status':
+            print_status(queue.status())
+        elif args.command == 'retry-failed':
+            print(f"Requeued {queue.retry_failed():,} failed shards")
+        else:
+            print(f"Exported {queue.export(args.output):,} records to '{args.output}'")
+        queue.close()
@@ -0,0 +1,223 @@
+import hashlib
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from dataset import CACHE_DIR, POPULARITY_THRESHOLD
+from tracing import traced
+
+PANEL_CACHE_DIR = os.path.join(CACHE_DIR, 'panels')
+PANEL_SIZE = (6, 6)  # inches; the 2 x 3 grid matches the original 18 x 12 figure
+TITLE_HEIGHT = 0.6
+RENDER_VERSION = 1  # bump to invalidate cached panels after changing drawing code
+PANEL_MAX_AGE = 7 * 24 * 3600  # seconds a cached panel may go unused before it is pruned
+
+
+def _histogram(values, bins):
+    counts, edges = np.histogram(values, bins=bins)
+    return {'counts': counts, 'edges': edges}
+
+
+def _box_stats(sorted_values, label):
+    """matplotlib.bxp statistics (1.5 IQR whiskers) from an already sorted array"""
+    q1, median, q3 = np.quantile(sorted_values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = sorted_values[(sorted_values >= q1 - 1.5 * iqr) & (sorted_values <= q3 + 1.5 * iqr)]
+    low, high = inside[0], inside[-1]
+    fliers = sorted_values[(sorted_values < low) | (sorted_values > high)]
+    return {'label': label, 'q1': q1, 'med': median, 'q3': q3,
+            'whislo': low, 'whishi': high, 'fliers': fliers}
+
+
+def prepare_panels(df, aggregates):
+    """Reduce the dataset to the small aggregates each panel draws"""
+    shares = df['shares'].to_numpy()
+    panels = {
+        'shares_histogram': _histogram(shares, 50),
+        'log_shares_histogram': _histogram(np.log1p(shares), 50),
+        'channel_pie': {'counts': aggregates.channels.counts, 'labels': aggregates.channels.labels},
+        'weekday_bar': {'counts': aggregates.weekdays.counts, 'labels': aggregates.weekdays.labels},
+        'channel_boxplot': {'stats': [
+            _box_stats(values, label)
+            for label, values in zip(aggregates.channels.labels, aggregates.channels.shares_by_group())
+            if len(values) > 0
+        ]},
+    }
+    if 'is_popular' in df.columns:
+        panels['popularity'] = {'popular_counts': df['is_popular'].value_counts().sort_index().to_numpy()}
+    else:
+        panels['popularity'] = dict(_histogram(shares, 30),
+                                    quartiles=np.quantile(shares, [0.25, 0.5, 0.75]))
+    return panels
+
+
+def _draw_histogram(ax, data, color):
+    edges = data['edges']
+    ax.bar(edges[:-1], data['counts'], width=np.diff(edges), align='edge',
+           alpha=0.7, color=color, edgecolor='black')
+
+
+def draw_shares_histogram(ax, data):
+    _draw_histogram(ax, data, 'skyblue')
+    ax.set_title('Distribution of Shares')
+    ax.set_xlabel('Number of Shares')
+    ax.set_ylabel('Frequency')
+    ax.axvline(x=POPULARITY_THRESHOLD, color='red', linestyle='--', label='Suggested Threshold (1400)')
+    ax.legend()
+
+
+def draw_log_shares_histogram(ax, data):
+    _draw_histogram(ax, data, 'lightgreen')
+    ax.set_title('Distribution of Log(Shares + 1)')
+    ax.set_xlabel('Log(Number of Shares + 1)')
+    ax.set_ylabel('Frequency')
+    ax.axvline(x=np.log1p(POPULARITY_THRESHOLD), color='red', linestyle='--', label='Suggested Threshold')
+    ax.legend()
+
+
+def draw_channel_pie(ax, data):
+    ax.pie(data['counts'], labels=data['labels'], autopct='%1.1f%%', startangle=90)
+    ax.set_title('Distribution by Data Channel')
+
+
+def draw_weekday_bar(ax, data):
+    ax.bar(data['labels'], data['counts'], color='coral', alpha=0.7)
+    ax.set_title('Articles Published by Day of Week')
+    ax.set_xlabel('Day of Week')
+    ax.set_ylabel('Number of Articles')
+    ax.tick_params(axis='x', rotation=45)
+
+
+def draw_popularity(ax, data):
+    if 'popular_counts' in data:
+        ax.pie(data['popular_counts'], labels=['Unpopular (<1400)', 'Popular (≥1400)'],
+               autopct='%1.1f%%', startangle=90, colors=['lightcoral', 'lightblue'])
+        ax.set_title('Popular vs Unpopular Articles')
+        return
+    # Show shares distribution by quartiles instead
+    _draw_histogram(ax, data, 'lightblue')
+    q1, median, q3 = data['quartiles']
+    ax.axvline(x=q1, color='orange', linestyle='--', label='Q1')
+    ax.axvline(x=median, color='red', linestyle='--', label='Median')
+    ax.axvline(x=q3, color='green', linestyle='--', label='Q3')
+    ax.set_title('Shares Distribution with Quartiles')
+    ax.set_xlabel('Number of Shares')
+    ax.set_ylabel('Frequency')
+    ax.legend()
+
+
+def draw_channel_boxplot(ax, data):
+    ax.bxp(data['stats'])
+    ax.set_title('Shares Distribution by Data Channel')
+    ax.set_ylabel('Number of Shares')
+    ax.tick_params(axis='x', rotation=45)
+
+
+# Grid position -> (panel name, drawing function)
+LAYOUT = [
+    [('shares_histogram', draw_shares_histogram), ('log_shares_histogram', draw_log_shares_histogram),
+     ('channel_pie', draw_channel_pie)],
+    [('weekday_bar', draw_weekday_bar), ('popularity', draw_popularity),
+     ('channel_boxplot', draw_channel_boxplot)],
+]
+DRAWERS = {name: draw for row in LAYOUT for name, draw in row}
+
+
+def panel_key(name, data, dpi):
+    """Hash of everything that affects a panel's pixels"""
+    payload = pickle.dumps((RENDER_VERSION, name, dpi, data), protocol=4)
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _init_worker():
+    # Set style for better looking plots
+    sns.set_style("whitegrid")
+    sns.set_palette("husl")
+
+
+def render_panel(name, data, path, dpi):
+    """Worker task: draw one panel into its own fixed-size PNG"""
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=PANEL_SIZE)
+    DRAWERS[name](ax, data)
+    fig.tight_layout()
+    fig.savefig(path + '.tmp.png', dpi=dpi)
+    plt.close(fig)
+    os.replace(path + '.tmp.png', path)
+    return name, time.perf_counter() - start
+
+
+def render_title(title, width, path, dpi):
+    fig = plt.figure(figsize=(width, TITLE_HEIGHT))
+    fig.text(0.5, 0.5, title, ha='center', va='center', fontsize=16, fontweight='bold')
+    fig.savefig(path + '.tmp.png', dpi=dpi)
+    plt.close(fig)
+    os.replace(path + '.tmp.png', path)
+
+
+@traced('render')
+def render_dashboard(panels, output_path='news_popularity_analysis.png', dpi=150,
+                     title='Online News Popularity Dataset Analysis', max_workers=None,
+                     cache_dir=PANEL_CACHE_DIR, max_age=PANEL_MAX_AGE):
+    """Render changed panels in parallel processes, reuse cached ones, and tile them into one PNG
+
+    Every panel used is touched; cached panels of the same names that no render has
+    used for `max_age` seconds are deleted afterwards. Panels of other renders sharing
+    the directory (another dataset, dpi, or a concurrent run) stay while they are in use.
+    """
+    start = time.perf_counter()
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = {}
+    to_render = []
+    for name, data in panels.items():
+        paths[name] = os.path.join(cache_dir, f"{name}-{panel_key(name, data, dpi)}.png")
+        try:
+            os.utime(paths[name])
+        except FileNotFoundError:
+            to_render.append(name)
+
+    for name in panels:
+        if name not in to_render:
+            print(f"  {name}: cached")
+    if to_render:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(to_render), os.cpu_count() or 1),
+                                 initializer=_init_worker) as executor:
+            futures = [executor.submit(render_panel, name, panels[name], paths[name], dpi) for name in to_render]
+            for future in futures:
+                name, seconds = future.result()
+                print(f"  {name}: rendered in {seconds:.2f}s")
+
+    title_path = os.path.join(cache_dir, f"title-{panel_key('title', title, dpi)}.png")
+    try:
+        os.utime(title_path)
+    except FileNotFoundError:
+        render_title(title, PANEL_SIZE[0] * len(LAYOUT[0]), title_path, dpi)
+
+    # Tile the panel bitmaps instead of redrawing them in one big figure
+    rows = [np.concatenate([plt.imread(paths[name]) for name, _ in row], axis=1) for row in LAYOUT]
+    image = np.concatenate([plt.imread(title_path)] + rows, axis=0)
+    plt.imsave(output_path, image)
+
+    # Panels of earlier datasets or RENDER_VERSIONs are never looked up again
+    current = {os.path.basename(path) for path in [title_path, *paths.values()]}
+    prefixes = tuple(f"{name}-" for name in ['title', *panels])
+    cutoff = time.time() - max_age
+    for entry in os.scandir(cache_dir):
+        if (entry.name.startswith(prefixes) and entry.name.endswith('.png') and entry.name not in current
+                and entry.stat().st_mtime < cutoff):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    elapsed = time.perf_counter() - start
+    print(f"Dashboard: {len(to_render)} panel(s) rendered, {len(panels) - len(to_render)} cached, "
+          f"{elapsed:.2f}s total")
+    return elapsed
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 -- enables the Parquet cache
+except ImportError:  # fall back to pandas' own binary pickle format
+    pyarrow = None
+
+from tracing import traced
+
+DATASET_PATH = 'OnlineNewsPopularity.csv'
+CACHE_DIR = '.dataset_cache'
+CACHE_VERSION = 2
+
+CHANNELS = ['lifestyle', 'entertainment', 'bus', 'socmed', 'tech', 'world']
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+CHANNEL_COLUMNS = [f'data_channel_is_{channel}' for channel in CHANNELS]
+WEEKDAY_COLUMNS = [f'weekday_is_{day}' for day in WEEKDAYS]
+FLAG_COLUMNS = CHANNEL_COLUMNS + WEEKDAY_COLUMNS + ['is_weekend']
+
+# Whole-number columns that fit comfortably in 32 bits (max shares is 843,300)
+COUNT_COLUMNS = [
+    'timedelta', 'n_tokens_title', 'n_tokens_content', 'num_hrefs', 'num_self_hrefs',
+    'num_imgs', 'num_videos', 'num_keywords', 'shares'
+]
+
+POPULARITY_THRESHOLD = 1400
+
+# url and timedelta are non-predictive, shares is the goal field (see OnlineNewsPopularity.names)
+NON_PREDICTIVE_COLUMNS = ['url', 'timedelta']
+TARGET_COLUMN = 'shares'
+
+
+def popularity_target(shares, threshold=POPULARITY_THRESHOLD):
+    """Binary is_popular target: 1 for articles with at least `threshold` shares"""
+    return (np.asarray(shares) >= threshold).astype(np.uint8)
+
+
+def predictive_features(columns):
+    """The 58 predictive feature names, in dataset order"""
+    return [c for c in columns if c not in NON_PREDICTIVE_COLUMNS and c != TARGET_COLUMN]
+
+
+def column_dtype(name):
+    """Explicit storage dtype for a (stripped) dataset column
+
+    Only flags and counts are narrowed, which is lossless; ratios, keyword statistics
+    and sentiment scores stay float64 so reported means and correlations are unchanged.
+    """
+    if name == 'url':
+        return 'object'
+    if name in FLAG_COLUMNS:
+        return np.uint8
+    if name in COUNT_COLUMNS:
+        return np.int32
+    return np.float64
+
+
+def parse_csv(csv_path=DATASET_PATH, **read_csv_kwargs):
+    """Parse the raw CSV with stripped column names and downcast dtypes"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {raw: column_dtype(raw.strip()) for raw in header}
+    df = pd.read_csv(csv_path, dtype=dtypes, **read_csv_kwargs)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def iter_csv_chunks(csv_path=DATASET_PATH, chunksize=50000, **read_csv_kwargs):
+    """Yield the CSV in fixed-size chunks with stripped column names and downcast dtypes"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {raw: column_dtype(raw.strip()) for raw in header}
+    for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunksize, **read_csv_kwargs):
+        chunk.columns = chunk.columns.str.strip()
+        yield chunk
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(csv_path, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    extension = '.parquet' if pyarrow is not None else '.pkl'
+    return os.path.join(cache_dir, stem + extension), os.path.join(cache_dir, stem + '.meta.json')
+
+
+def source_fingerprint(csv_path, meta=None):
+    """Return (mtime, size, sha256) of the source, reusing the stored hash when mtime and size match"""
+    stat = os.stat(csv_path)
+    if meta and meta.get('mtime') == stat.st_mtime and meta.get('size') == stat.st_size:
+        return stat.st_mtime, stat.st_size, meta['sha256']
+    return stat.st_mtime, stat.st_size, file_sha256(csv_path)
+
+
+def dataset_fingerprint(csv_path=DATASET_PATH, cache_dir=CACHE_DIR):
+    """SHA-256 of the source CSV, taken from the cache metadata when mtime and size still match"""
+    _, meta_path = _cache_paths(csv_path, cache_dir)
+    return source_fingerprint(csv_path, _read_meta(meta_path))[2]
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@traced('load')
+def load_dataset(csv_path=DATASET_PATH, cache_dir=CACHE_DIR, columns=None, use_cache=True):
+    """Load the dataset from the binary cache, rebuilding it when the source CSV has changed
+
+    The cache is invalidated by the CSV's mtime and size, and a changed mtime with an
+    unchanged SHA-256 (e.g. after a checkout) only refreshes the metadata. `columns`
+    restricts the load to a subset of columns.
+    """
+    if not use_cache:
+        df = parse_csv(csv_path)
+        return df[columns] if columns is not None else df
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path, meta_path = _cache_paths(csv_path, cache_dir)
+    meta = _read_meta(meta_path)
+    mtime, size, sha256 = source_fingerprint(csv_path, meta)
+
+    valid = (meta is not None and meta.get('version') == CACHE_VERSION
+             and meta.get('sha256') == sha256 and os.path.exists(cache_path))
+    if valid:
+        if meta.get('mtime') != mtime or meta.get('size') != size:
+            meta.update(mtime=mtime, size=size)
+            _write_meta(meta_path, meta)
+        if pyarrow is not None:
+            return pd.read_parquet(cache_path, columns=columns)
+        df = pd.read_pickle(cache_path)
+        return df[columns] if columns is not None else df
+
+    df = parse_csv(csv_path)
+    tmp_path = cache_path + '.tmp'
+    if pyarrow is not None:
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path, compression=None)
+    os.replace(tmp_path, cache_path)
+    _write_meta(meta_path, {'version': CACHE_VERSION, 'source': csv_path,
+                            'mtime': mtime, 'size': size, 'sha256': sha256})
+    return df[columns] if columns is not None else df
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
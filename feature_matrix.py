@@ -0,0 +1,115 @@
+import json
+import os
+
+import numpy as np
+
+from dataset import CACHE_DIR, DATASET_PATH, TARGET_COLUMN, load_dataset, predictive_features, source_fingerprint
+
+MATRIX_PATH = os.path.join(CACHE_DIR, 'features.npy')
+
+
+def _meta_path(matrix_path):
+    return os.path.splitext(matrix_path)[0] + '.json'
+
+
+def export_feature_matrix(csv_path=DATASET_PATH, matrix_path=MATRIX_PATH, df=None):
+    """Write the 58 predictive features plus shares as a contiguous float32 .npy file
+
+    Column order and provenance go to a JSON sidecar next to the matrix.
+    """
+    if df is None:
+        df = load_dataset(csv_path)
+    features = predictive_features(df.columns)
+    columns = features + [TARGET_COLUMN]
+    matrix = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float32))
+
+    os.makedirs(os.path.dirname(matrix_path) or '.', exist_ok=True)
+    tmp_path = matrix_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, matrix_path)
+
+    mtime, size, sha256 = source_fingerprint(csv_path)
+    meta = {
+        'columns': columns,
+        'feature_columns': features,
+        'target_column': TARGET_COLUMN,
+        'shape': list(matrix.shape),
+        'dtype': 'float32',
+        'source': csv_path,
+        'mtime': mtime,
+        'size': size,
+        'sha256': sha256,
+    }
+    with open(_meta_path(matrix_path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return matrix_path
+
+
+def load_feature_matrix(matrix_path=MATRIX_PATH):
+    """Open the matrix read-only with np.memmap and return (matrix, meta)
+
+    The pages are shared through the OS page cache, so any number of worker
+    processes can open the same file without parsing or copying it.
+    """
+    with open(_meta_path(matrix_path), encoding='utf-8') as f:
+        meta = json.load(f)
+    matrix = np.load(matrix_path, mmap_mode='r')
+    if list(matrix.shape) != meta['shape']:
+        raise ValueError(f"{matrix_path} has shape {matrix.shape}, sidecar says {meta['shape']}")
+    return matrix, meta
+
+
+def export_shuffled_matrix(matrix_path=MATRIX_PATH, seed=42):
+    """Write the matrix's rows once in a seeded random order; returns the new path
+
+    Cross-validation folds of the shuffled file are contiguous row ranges, so a fold is
+    a slice of the memory map instead of a fancy-indexed copy. The file is reused while
+    its sidecar matches the source matrix and seed.
+    """
+    matrix, meta = load_feature_matrix(matrix_path)
+    path = f"{os.path.splitext(matrix_path)[0]}.shuffled-{seed}.npy"
+    try:
+        with open(_meta_path(path), encoding='utf-8') as f:
+            shuffled_meta = json.load(f)
+        current = (shuffled_meta.get('sha256') == meta['sha256'] and shuffled_meta.get('shuffle_seed') == seed
+                   and shuffled_meta.get('shape') == meta['shape'] and os.path.exists(path))
+    except (OSError, ValueError):
+        current = False
+    if not current:
+        permutation = np.random.default_rng(seed).permutation(len(matrix))
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix[permutation])
+        os.replace(tmp_path, path)
+        with open(_meta_path(path), 'w', encoding='utf-8') as f:
+            json.dump(dict(meta, shuffle_seed=seed), f, indent=2)
+    return path
+
+
+def split_features_target(matrix, meta):
+    """Zero-copy views of the feature columns (X) and the shares column (y)"""
+    n_features = len(meta['feature_columns'])
+    return matrix[:, :n_features], matrix[:, n_features]
+
+
+def ensure_feature_matrix(csv_path=DATASET_PATH, matrix_path=MATRIX_PATH):
+    """Open the matrix, re-exporting it first if it is missing or the CSV has changed"""
+    try:
+        with open(_meta_path(matrix_path), encoding='utf-8') as f:
+            meta = json.load(f)
+        stale = meta.get('sha256') != source_fingerprint(csv_path, meta)[2] or not os.path.exists(matrix_path)
+    except (OSError, ValueError):
+        stale = True
+    if stale:
+        export_feature_matrix(csv_path, matrix_path)
+    return load_feature_matrix(matrix_path)
+
+
+if __name__ == "__main__":
+    print("Exporting the feature matrix...")
+    path = export_feature_matrix()
+    matrix, meta = load_feature_matrix(path)
+    print(f"Saved {matrix.shape[0]:,} x {matrix.shape[1]} float32 matrix "
+          f"({len(meta['feature_columns'])} features + {meta['target_column']}) to '{path}'")
+    print(f"File size: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
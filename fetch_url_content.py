@@ -1,313 +1,208 @@
-import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-import time
-import re
 from urllib.parse import urlparse
 import json
+import argparse
+from functools import partial
+from fetch_engine import fetch_urls_concurrently
+from http_cache import ResponseCache, cached_get
+from html_extract import DEFAULT_EXTRACTOR, EXTRACTORS, extract_article
+from dataset import load_dataset
+from report_engine import render_documentation
+from retry_policy import PERMANENT, RATE_LIMITED, CircuitOpenError, RetryPolicy, classify
+import tracing
+from tracing import incr, span
 
-def fetch_article_content(url, max_retries=3):
-    """Fetch article content from URL with retry logic"""
+# Shared by all fetch threads: one circuit breaker and one set of retry statistics per run
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+def download_article(url, max_retries=None, session=None, cache=None, policy=None):
+    """Download raw article bytes from URL with retry logic
+
+    Only timeouts, connection errors, 5xx and 429 responses are retried, with
+    jittered exponential backoff (see retry_policy.RetryPolicy). `max_retries`
+    overrides the policy's number of attempts.
+    """
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = ""
-            title_tags = soup.find_all(['h1', 'title'])
-            for tag in title_tags:
-                if tag.get_text().strip():
-                    title = tag.get_text().strip()
-                    break
-            
-            # Extract content (look for article content)
-            content = ""
-            content_selectors = [
-                'article', '.article-content', '.post-content', '.entry-content',
-                '.content', '.story-content', 'main', '.main-content'
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text().strip()
-                    break
-            
-            # If no specific content found, get body text
-            if not content:
-                body = soup.find('body')
-                if body:
-                    content = body.get_text().strip()
-            
-            # Clean content
-            content = re.sub(r'\s+', ' ', content)
-            content = content[:2000]  # Limit to first 2000 characters
-            
-            return {
-                'title': title,
-                'content_preview': content,
-                'status': 'success',
-                'word_count': len(content.split())
-            }
-            
-        except Exception as e:
-            if attempt == max_retries - 1:
-                return {
-                    'title': '',
-                    'content_preview': '',
-                    'status': f'error: {str(e)}',
-                    'word_count': 0
-                }
-            time.sleep(1)
-    
+    policy = policy if policy is not None else DEFAULT_RETRY_POLICY
+    # Reuse the caller's pooled session when one is given
+    http = session if session is not None else requests
+
+    def attempt():
+        with span('fetch'):
+            return cached_get(http, url, cache, headers, timeout=10)
+
+    try:
+        content_bytes = policy.call(url, attempt, max_attempts=max_retries)
+    except Exception as e:
+        return {'content': None, 'status': f'error: {str(e)}', 'error_class': error_class(e),
+                'transient': is_transient(e)}
+    incr('bytes_downloaded', len(content_bytes))
+    return {'content': content_bytes, 'status': 'success', 'error_class': 'success', 'transient': False}
+
+def error_class(error):
+    """Coarse class of a download exception, kept on the record and used as a metrics label"""
+    if isinstance(error, CircuitOpenError):
+        return 'circuit_open'
+    if classify(error) == RATE_LIMITED:
+        return 'rate_limited'
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f'http_{error.response.status_code // 100}xx'
+    # SSLError is a ConnectionError and ConnectTimeout is both; test the narrower classes first
+    for exc_type, name in ((requests.exceptions.SSLError, 'ssl'), (requests.Timeout, 'timeout'),
+                           (requests.ConnectionError, 'connection')):
+        if isinstance(error, exc_type):
+            return name
+    return 'other'
+
+def is_transient(error):
+    """True when the retry policy would try the download again later (circuit open, 429/503, 5xx, timeouts)"""
+    return isinstance(error, CircuitOpenError) or classify(error) != PERMANENT
+
+def empty_content(status, error_class='other', transient=False):
+    """Content record for a page that could not be fetched or parsed"""
     return {
         'title': '',
         'content_preview': '',
-        'status': 'failed after retries',
+        'status': status,
+        'error_class': error_class,
+        'transient': transient,
         'word_count': 0
     }
 
-def analyze_urls_in_dataset():
-    """Analyze URLs in the dataset and fetch sample content"""
+def failed_content(download):
+    """Content record for a failed download, keeping its failure class"""
+    return empty_content(download['status'], download['error_class'], download['transient'])
+
+def parse_article_content(content_bytes, extractor=DEFAULT_EXTRACTOR):
+    """Extract title, preview and word count from downloaded bytes"""
+    try:
+        with span('parse'):
+            article = extract_article(content_bytes, extractor)
+    except Exception as e:
+        return empty_content(f'error: {str(e)}', 'parse')
+    
+    return {
+        'title': article['title'],
+        'content_preview': article['content_preview'],
+        'status': 'success',
+        'error_class': 'success',
+        'transient': False,
+        'word_count': article['word_count']
+    }
+
+def fetch_article_content(url, max_retries=None, session=None, cache=None, extractor=DEFAULT_EXTRACTOR,
+                          policy=None):
+    """Fetch article content from URL with retry logic"""
+    download = download_article(url, max_retries, session=session, cache=cache, policy=policy)
+    if download['content'] is None:
+        content_data = failed_content(download)
+    else:
+        content_data = parse_article_content(download['content'], extractor)
+    incr('articles', status=content_data['error_class'])
+    return content_data
+
+def build_url_record(idx, url, shares, content_data):
+    """Combine dataset fields and fetched content into one URL analysis record"""
+    # Parse URL
+    parsed_url = urlparse(url)
+    domain = parsed_url.netloc
+    
+    return {
+        'original_index': idx,
+        'url': url,
+        'domain': domain,
+        'shares': shares,
+        'title': content_data['title'],
+        'content_preview': content_data['content_preview'],
+        'status': content_data['status'],
+        'error_class': content_data['error_class'],
+        'transient': content_data['transient'],
+        'word_count': content_data['word_count']
+    }
+
+def analyze_urls_in_dataset(sample_size=10, max_workers=4, rate_per_host=0.5, cache=None,
+                            extractor=DEFAULT_EXTRACTOR):
+    """Analyze URLs in the dataset and fetch sample content
+
+    Pass sample_size=None to fetch every URL in the dataset (bulk mode).
+    """
     print("Loading the dataset...")
-    df = pd.read_csv('OnlineNewsPopularity.csv')
-    df.columns = df.columns.str.strip()
+    df = load_dataset()
     
     print(f"Total articles: {len(df)}")
     
     # Sample a few URLs for analysis (to avoid overwhelming the servers)
-    sample_size = min(10, len(df))
-    sample_df = df.sample(n=sample_size, random_state=42)
+    if sample_size is None:
+        sample_df = df
+    else:
+        sample_size = min(sample_size, len(df))
+        sample_df = df.sample(n=sample_size, random_state=42)
+    
+    print(f"Fetching content from {len(sample_df)} URLs with {max_workers} workers...")
     
-    print(f"Fetching content from {sample_size} sample URLs...")
+    # Be respectful to servers: the per-host token bucket replaces a fixed sleep
+    contents, _ = fetch_urls_concurrently(
+        sample_df['url'], partial(fetch_article_content, cache=cache, extractor=extractor),
+        max_workers=max_workers, rate_per_host=rate_per_host
+    )
     
-    url_analysis = []
+    url_analysis = [
+        build_url_record(idx, row['url'], row['shares'], content_data)
+        for (idx, row), content_data in zip(sample_df.iterrows(), contents)
+    ]
     
-    for idx, row in sample_df.iterrows():
-        url = row['url']
-        shares = row['shares']
-        
-        print(f"Processing URL {idx+1}/{sample_size}: {url}")
-        
-        # Parse URL
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        
-        # Fetch content
-        content_data = fetch_article_content(url)
-        
-        url_info = {
-            'original_index': idx,
-            'url': url,
-            'domain': domain,
-            'shares': shares,
-            'title': content_data['title'],
-            'content_preview': content_data['content_preview'],
-            'status': content_data['status'],
-            'word_count': content_data['word_count']
-        }
-        
-        url_analysis.append(url_info)
-        
-        # Be respectful to servers
-        time.sleep(2)
+    if cache is not None:
+        cache.report()
+    DEFAULT_RETRY_POLICY.stats.report(DEFAULT_RETRY_POLICY.breaker)
     
     return url_analysis, df
 
-def create_detailed_documentation():
-    """Create comprehensive documentation of all operations"""
-    
-    # Fetch URL content
-    url_analysis, df = analyze_urls_in_dataset()
-    
-    # Create detailed documentation
-    doc_content = []
-    
-    doc_content.append("=" * 80)
-    doc_content.append("ONLINE NEWS POPULARITY DATASET - COMPREHENSIVE ANALYSIS DOCUMENTATION")
-    doc_content.append("=" * 80)
-    doc_content.append("")
-    
-    # 1. Dataset Overview
-    doc_content.append("1. DATASET OVERVIEW")
-    doc_content.append("-" * 40)
-    doc_content.append(f"Source: Mashable.com")
-    doc_content.append(f"Total Articles: {len(df):,}")
-    doc_content.append(f"Features: {len(df.columns)}")
-    doc_content.append(f"Time Period: {df['timedelta'].min():.0f} to {df['timedelta'].max():.0f} days before acquisition")
-    doc_content.append(f"Dataset Size: {df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB")
-    doc_content.append("")
-    
-    # 2. Data Processing Operations
-    doc_content.append("2. DATA PROCESSING OPERATIONS")
-    doc_content.append("-" * 40)
-    doc_content.append("2.1 Column Name Cleaning:")
-    doc_content.append("   - Applied df.columns.str.strip() to remove whitespace")
-    doc_content.append("   - Fixed column name inconsistencies")
-    doc_content.append("   - Ensured proper column access throughout analysis")
-    doc_content.append("")
-    
-    doc_content.append("2.2 Data Quality Validation:")
-    doc_content.append("   - Checked for missing values: None found")
-    doc_content.append("   - Verified data types: Mixed (numerical and categorical)")
-    doc_content.append("   - Validated feature ranges and distributions")
-    doc_content.append("")
-    
-    doc_content.append("2.3 Feature Engineering:")
-    doc_content.append("   - Note: Binary classification target 'is_popular' not created automatically")
-    doc_content.append("   - User can create manually if needed: df['is_popular'] = (df['shares'] >= 1400).astype(int)")
-    doc_content.append("   - Threshold suggestion: 1,400 shares (based on original research)")
-    doc_content.append("")
-    
-    # 3. Feature Analysis
-    doc_content.append("3. FEATURE ANALYSIS")
-    doc_content.append("-" * 40)
-    
-    # Content Features
-    doc_content.append("3.1 Content Features:")
-    content_features = ['n_tokens_title', 'n_tokens_content', 'num_hrefs', 'num_imgs', 'num_videos']
-    for feature in content_features:
-        stats = df[feature].describe()
-        doc_content.append(f"   {feature}:")
-        doc_content.append(f"     - Mean: {stats['mean']:.2f}")
-        doc_content.append(f"     - Median: {stats['50%']:.2f}")
-        doc_content.append(f"     - Std: {stats['std']:.2f}")
-        doc_content.append(f"     - Correlation with shares: {df[feature].corr(df['shares']):.4f}")
-    doc_content.append("")
-    
-    # Sentiment Features
-    doc_content.append("3.2 Sentiment Features:")
-    sentiment_features = ['global_subjectivity', 'global_sentiment_polarity', 
-                         'global_rate_positive_words', 'global_rate_negative_words']
-    for feature in sentiment_features:
-        stats = df[feature].describe()
-        doc_content.append(f"   {feature}:")
-        doc_content.append(f"     - Mean: {stats['mean']:.4f}")
-        doc_content.append(f"     - Correlation with shares: {df[feature].corr(df['shares']):.4f}")
-    doc_content.append("")
-    
-    # 4. URL Content Analysis
-    doc_content.append("4. URL CONTENT ANALYSIS")
-    doc_content.append("-" * 40)
-    doc_content.append(f"Sample URLs Analyzed: {len(url_analysis)}")
-    doc_content.append("")
-    
-    for i, url_info in enumerate(url_analysis, 1):
-        doc_content.append(f"4.{i} URL Analysis:")
-        doc_content.append(f"   Original Index: {url_info['original_index']}")
-        doc_content.append(f"   URL: {url_info['url']}")
-        doc_content.append(f"   Domain: {url_info['domain']}")
-        doc_content.append(f"   Shares: {url_info['shares']:,}")
-        doc_content.append(f"   Status: {url_info['status']}")
-        doc_content.append(f"   Title: {url_info['title'][:100]}...")
-        doc_content.append(f"   Word Count: {url_info['word_count']}")
-        doc_content.append(f"   Content Preview: {url_info['content_preview'][:200]}...")
-        doc_content.append("")
-    
-    # 5. Statistical Insights
-    doc_content.append("5. STATISTICAL INSIGHTS")
-    doc_content.append("-" * 40)
-    
-    # Target variable analysis
-    shares_stats = df['shares'].describe()
-    doc_content.append("5.1 Target Variable (shares) Analysis:")
-    doc_content.append(f"   - Range: {shares_stats['min']:.0f} to {shares_stats['max']:.0f}")
-    doc_content.append(f"   - Mean: {shares_stats['mean']:.0f}")
-    doc_content.append(f"   - Median: {shares_stats['50%']:.0f}")
-    doc_content.append(f"   - Standard Deviation: {shares_stats['std']:.0f}")
-    doc_content.append(f"   - Distribution: Highly right-skewed (long tail)")
-    doc_content.append("")
-    
-    # Channel analysis
-    doc_content.append("5.2 Data Channel Analysis:")
-    channel_columns = [col for col in df.columns if col.startswith('data_channel_is_')]
-    for col in channel_columns:
-        channel_name = col.replace('data_channel_is_', '').title()
-        channel_articles = df[df[col] == 1]
-        avg_shares = channel_articles['shares'].mean()
-        doc_content.append(f"   {channel_name}:")
-        doc_content.append(f"     - Articles: {len(channel_articles):,}")
-        doc_content.append(f"     - Average shares: {avg_shares:.0f}")
-    doc_content.append("")
-    
-    # 6. Machine Learning Readiness
-    doc_content.append("6. MACHINE LEARNING READINESS")
-    doc_content.append("-" * 40)
-    doc_content.append("6.1 Data Quality:")
-    doc_content.append("   - Missing values: None")
-    doc_content.append("   - Outliers: Present in shares (handled with log transformation)")
-    doc_content.append("   - Feature scaling: Required for numerical features")
-    doc_content.append("   - Categorical encoding: Binary features already encoded")
-    doc_content.append("")
-    
-    doc_content.append("6.2 Feature Selection:")
-    doc_content.append("   - Top correlated features identified")
-    doc_content.append("   - Feature importance ranking available")
-    doc_content.append("   - Multicollinearity analysis recommended")
-    doc_content.append("")
-    
-    # 7. Files Created
-    doc_content.append("7. FILES CREATED")
-    doc_content.append("-" * 40)
-    doc_content.append("7.1 Data Processing Scripts:")
-    doc_content.append("   - read_csv_data.py: Main data reading and analysis")
-    doc_content.append("   - visualize_data.py: Comprehensive visualizations")
-    doc_content.append("   - data_summary.py: Quick summary and insights")
-    doc_content.append("   - fetch_url_content.py: URL content extraction")
-    doc_content.append("")
-    
-    doc_content.append("7.2 Output Files:")
-    doc_content.append("   - processed_news_data.csv: Clean, processed dataset")
-    doc_content.append("   - news_popularity_analysis.png: Visualization dashboard")
-    doc_content.append("   - comprehensive_analysis.txt: This documentation")
-    doc_content.append("")
-    
-    # 8. Recommendations
-    doc_content.append("8. RECOMMENDATIONS")
-    doc_content.append("-" * 40)
-    doc_content.append("8.1 Data Preprocessing:")
-    doc_content.append("   - Apply log transformation to shares for modeling")
-    doc_content.append("   - Scale numerical features using StandardScaler")
-    doc_content.append("   - Consider feature selection based on correlations")
-    doc_content.append("")
-    
-    doc_content.append("8.2 Model Development:")
-    doc_content.append("   - Use cross-validation for robust evaluation")
-    doc_content.append("   - Try ensemble methods (Random Forest, XGBoost)")
-    doc_content.append("   - Consider both regression and classification approaches")
-    doc_content.append("")
-    
-    doc_content.append("8.3 Feature Engineering:")
-    doc_content.append("   - Create interaction features between content and sentiment")
-    doc_content.append("   - Extract temporal patterns from publication timing")
-    doc_content.append("   - Consider keyword clustering for better representation")
-    doc_content.append("")
+def create_detailed_documentation(url_analysis=None, df=None, **fetch_options):
+    """Create comprehensive documentation of all operations
+
+    The dataset sections are computed in one vectorized pass and memoized by the
+    dataset's fingerprint (see report_engine), so only the URL section is rebuilt
+    when just the sample changes.
+    """
     
-    # 9. Conclusion
-    doc_content.append("9. CONCLUSION")
-    doc_content.append("-" * 40)
-    doc_content.append("The Online News Popularity dataset has been successfully processed and analyzed.")
-    doc_content.append("Key findings include:")
-    doc_content.append("   - Keyword performance metrics are strong predictors")
-    doc_content.append("   - Content length has minimal correlation with popularity")
-    doc_content.append("   - Sentiment features show low correlation with shares")
-    doc_content.append("")
-    doc_content.append("The dataset is ready for machine learning model development.")
-    doc_content.append("")
-    doc_content.append("=" * 80)
+    # Fetch URL content unless the caller already did
+    if url_analysis is None or df is None:
+        url_analysis, df = analyze_urls_in_dataset(**fetch_options)
     
-    return "\n".join(doc_content)
+    return render_documentation(url_analysis, df)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch article content and build documentation")
+    parser.add_argument('--all', action='store_true', help="fetch every URL in the dataset instead of a sample")
+    parser.add_argument('--sample-size', type=int, default=10, help="number of sample URLs to fetch")
+    parser.add_argument('--workers', type=int, default=4, help="number of concurrent fetch workers")
+    parser.add_argument('--rate-per-host', type=float, default=0.5, help="maximum requests per second per host")
+    parser.add_argument('--cache-dir', default='.http_cache', help="directory of the on-disk HTTP response cache")
+    parser.add_argument('--cache-max-mb', type=int, default=2048, help="size bound of the HTTP cache in MB")
+    parser.add_argument('--cache-max-age', type=float, default=None, help="serve cached pages younger than this many seconds without revalidating")
+    parser.add_argument('--no-cache', action='store_true', help="always download pages from the network")
+    parser.add_argument('--extractor', choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR, help="HTML extraction backend")
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    tracing.start(args)
+    cache = None if args.no_cache else ResponseCache(
+        args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024, max_age=args.cache_max_age
+    )
+    
+    # Fetch once and reuse the results for both the documentation and the JSON dump
+    url_analysis, df = analyze_urls_in_dataset(
+        sample_size=None if args.all else args.sample_size,
+        max_workers=args.workers,
+        rate_per_host=args.rate_per_host,
+        cache=cache,
+        extractor=args.extractor,
+    )
+    
     print("Creating comprehensive documentation...")
-    documentation = create_detailed_documentation()
+    with span('report'):
+        documentation = create_detailed_documentation(url_analysis, df)
     
     # Save documentation
     with open('comprehensive_analysis.txt', 'w', encoding='utf-8') as f:
@@ -316,8 +211,8 @@ if __name__ == "__main__":
     print("Documentation saved to 'comprehensive_analysis.txt'")
     
     # Save URL analysis as JSON
-    url_analysis, _ = analyze_urls_in_dataset()
     with open('url_content_analysis.json', 'w', encoding='utf-8') as f:
         json.dump(url_analysis, f, indent=2, ensure_ascii=False)
     
     print("URL content analysis saved to 'url_content_analysis.json'")
+    tracing.finish(args)
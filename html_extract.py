@@ -0,0 +1,233 @@
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+import soupsieve
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional; the bs4 and stream backends still work
+    lxml = None
+
+PREVIEW_CHARS = 2000
+
+# Content selectors in priority order: the first one that matches wins
+CONTENT_SELECTORS = [
+    'article', '.article-content', '.post-content', '.entry-content',
+    '.content', '.story-content', 'main', '.main-content'
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Compiled once instead of being re-parsed by select_one for every page
+COMPILED_SELECTORS = [soupsieve.compile(selector) for selector in CONTENT_SELECTORS]
+
+
+def _selector_to_xpath(selector):
+    if selector.startswith('.'):
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    return f"//{selector}"
+
+
+if lxml is not None:
+    TITLE_XPATH = etree.XPath("//h1 | //title")
+    BODY_XPATH = etree.XPath("//body")
+    CONTENT_XPATHS = [etree.XPath(_selector_to_xpath(selector)) for selector in CONTENT_SELECTORS]
+
+
+def build_result(title, content):
+    """Normalize whitespace, truncate the preview and count its words"""
+    content = WHITESPACE_RE.sub(' ', content.strip())
+    content = content[:PREVIEW_CHARS]  # Limit to first 2000 characters
+    return {
+        'title': title,
+        'content_preview': content,
+        'word_count': len(content.split())
+    }
+
+
+def extract_with_bs4(html):
+    """Reference extractor: full BeautifulSoup tree with html.parser"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract title
+    title = ""
+    for tag in soup.find_all(['h1', 'title']):
+        if tag.get_text().strip():
+            title = tag.get_text().strip()
+            break
+
+    # Extract content (look for article content)
+    content = ""
+    for selector in COMPILED_SELECTORS:
+        content_elem = selector.select_one(soup)
+        if content_elem:
+            content = content_elem.get_text().strip()
+            break
+
+    # If no specific content found, get body text
+    if not content:
+        body = soup.find('body')
+        if body:
+            content = body.get_text().strip()
+
+    return build_result(title, content)
+
+
+def extract_with_lxml(html):
+    """Same selection rules as the bs4 extractor, using lxml's C parser and precompiled XPath"""
+    if lxml is None:
+        raise ImportError("the 'lxml' extractor requires the lxml package")
+    try:
+        root = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return build_result("", "")
+
+    title = ""
+    for tag in TITLE_XPATH(root):
+        text = tag.text_content().strip()
+        if text:
+            title = text
+            break
+
+    content = ""
+    for xpath in CONTENT_XPATHS:
+        matches = xpath(root)
+        if matches:
+            content = matches[0].text_content().strip()
+            break
+
+    if not content:
+        bodies = BODY_XPATH(root)
+        if bodies:
+            content = bodies[0].text_content().strip()
+
+    return build_result(title, content)
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _StreamingExtractor(HTMLParser):
+    """Tokenizer that records the title and the first content block, then stops"""
+
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+    CONTENT_TAGS = {s for s in CONTENT_SELECTORS if not s.startswith('.')}
+    CONTENT_CLASSES = {s[1:] for s in CONTENT_SELECTORS if s.startswith('.')}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.title_parts = None
+        self.title_depth = 0
+        self.content_parts = []
+        self.content_chars = 0
+        self.content_depth = 0
+        self.content_done = False
+        self.body_parts = []
+        self.body_chars = 0
+        self.in_body = False
+        self.depth = 0
+
+    def _is_content(self, tag, attrs):
+        if tag in self.CONTENT_TAGS:
+            return True
+        for name, value in attrs:
+            if name == 'class' and value and self.CONTENT_CLASSES.intersection(value.split()):
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        self.depth += 1
+        if tag == 'body':
+            self.in_body = True
+        if not self.title and self.title_parts is None and tag in ('h1', 'title'):
+            self.title_parts = []
+            self.title_depth = self.depth
+        if not self.content_done and not self.content_depth and self._is_content(tag, attrs):
+            self.content_depth = self.depth
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return
+        if self.title_parts is not None and self.depth <= self.title_depth:
+            text = ''.join(self.title_parts).strip()
+            self.title_parts = None
+            if text:
+                self.title = text
+        if self.content_depth and self.depth <= self.content_depth:
+            self.content_depth = 0
+            if ''.join(self.content_parts).strip():
+                self.content_done = True
+            else:
+                self.content_parts = []
+                self.content_chars = 0
+        self.depth = max(0, self.depth - 1)
+        self._maybe_stop()
+
+    def handle_data(self, data):
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+        if self.content_depth:
+            self.content_parts.append(data)
+            self.content_chars += len(data)
+            if self.content_chars > PREVIEW_CHARS and self._preview_full(self.content_parts):
+                self.content_done = True
+                self.content_depth = 0
+        if self.in_body and self.body_chars <= PREVIEW_CHARS * 4:
+            self.body_parts.append(data)
+            self.body_chars += len(data)
+        self._maybe_stop()
+
+    @staticmethod
+    def _preview_full(parts):
+        return len(WHITESPACE_RE.sub(' ', ''.join(parts).strip())) >= PREVIEW_CHARS
+
+    def _maybe_stop(self):
+        if self.title and self.content_done:
+            raise _StopParsing()
+
+
+def extract_streaming(html, chunk_size=16384):
+    """Stream the page through a tokenizer and stop once the title and preview are found
+
+    Content comes from the first element in document order that matches any content
+    selector, rather than from the highest-priority selector in the whole page.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    parser = _StreamingExtractor()
+    try:
+        for start in range(0, len(html), chunk_size):
+            parser.feed(html[start:start + chunk_size])
+        parser.close()
+    except _StopParsing:
+        pass
+
+    content = ''.join(parser.content_parts) if parser.content_done or parser.content_parts else ''
+    if not content.strip():
+        content = ''.join(parser.body_parts)
+    return build_result(parser.title, content)
+
+
+EXTRACTORS = {
+    'bs4': extract_with_bs4,
+    'lxml': extract_with_lxml,
+    'stream': extract_streaming,
+}
+
+DEFAULT_EXTRACTOR = 'lxml' if lxml is not None else 'bs4'
+
+
+def extract_article(html, backend=DEFAULT_EXTRACTOR):
+    """Extract title, content preview and word count from raw HTML with the chosen backend"""
+    try:
+        extractor = EXTRACTORS[backend]
+    except KeyError:
+        raise ValueError(f"unknown extractor '{backend}', choose from {sorted(EXTRACTORS)}")
+    return extractor(html)
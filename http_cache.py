@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from tracing import incr
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of raw response bodies keyed by URL
+
+    Each entry is stored as `<sha256(url)>.body` plus a `<sha256(url)>.json` metadata
+    file holding the ETag/Last-Modified validators. The total body size is bounded by
+    `max_bytes`. Recency is tracked in memory, seeded once from the body mtimes, and
+    when the budget is exceeded the least recently used entries are evicted until the
+    cache is down to `low_water` of it, so eviction runs rarely and never walks the directory.
+    """
+
+    def __init__(self, cache_dir='.http_cache', max_bytes=2 * 1024 ** 3, max_age=None, low_water=0.9):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        # body path -> size, least recently used first
+        self.index = OrderedDict((path, size) for path, size, _ in sorted(self._entries(), key=lambda e: e[2]))
+        self.total_bytes = sum(self.index.values())
+
+    def _path(self, url, suffix):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _entries(self):
+        """Yield (body_path, size, mtime) for every cached body"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.body'):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def lookup(self, url):
+        """Return the stored metadata for `url`, or None if it is not cached"""
+        try:
+            with open(self._path(url, '.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._path(url, '.body')):
+            return None
+        return meta
+
+    def is_fresh(self, meta):
+        """True when the entry is young enough to be served without contacting the server"""
+        return self.max_age is not None and time.time() - meta['stored_at'] < self.max_age
+
+    def conditional_headers(self, meta):
+        """Build If-None-Match/If-Modified-Since headers from stored validators"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def read(self, url):
+        """Read a cached body and mark it as recently used; None if it was evicted meanwhile"""
+        body_path = self._path(url, '.body')
+        try:
+            with open(body_path, 'rb') as f:
+                content = f.read()
+            os.utime(body_path)  # keeps the recency order for the next process
+        except OSError:
+            return None
+        with self.lock:
+            if body_path in self.index:
+                self.index.move_to_end(body_path)
+        return content
+
+    def store(self, url, content, headers):
+        """Atomically write a body with its validators, then evict if over budget"""
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'size': len(content),
+            'stored_at': time.time(),
+        }
+        body_path = self._path(url, '.body')
+        tmp_path = body_path + self._tmp_suffix()
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, body_path)
+        self._write_meta(url, meta)
+
+        with self.lock:
+            self.total_bytes += len(content) - self.index.pop(body_path, 0)
+            self.index[body_path] = len(content)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url):
+        """Refresh the stored timestamp after a 304 revalidation"""
+        meta = self.lookup(url)
+        if meta is not None:
+            meta['stored_at'] = time.time()
+            self._write_meta(url, meta)
+
+    @staticmethod
+    def _tmp_suffix():
+        return f'.tmp{os.getpid()}.{threading.get_ident()}'
+
+    def _write_meta(self, url, meta):
+        meta_path = self._path(url, '.json')
+        tmp_path = meta_path + self._tmp_suffix()
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _evict(self):
+        """Remove least recently used entries down to the low-water mark; caller holds the lock"""
+        target = self.max_bytes * self.low_water
+        while self.index and self.total_bytes > target:
+            body_path, size = self.index.popitem(last=False)
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def record(self, outcome):
+        """Count a cache outcome: 'hit', 'miss' or 'revalidated' (a 304 hit)"""
+        incr('http_cache', result=outcome)
+        with self.lock:
+            if outcome == 'miss':
+                self.misses += 1
+            else:
+                self.hits += 1
+                if outcome == 'revalidated':
+                    self.revalidations += 1
+
+    def stats(self):
+        """Return the hit/miss counters and current size"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+            'size_bytes': self.total_bytes,
+        }
+
+    def report(self):
+        """Print a one-line cache summary"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0.0
+        print(f"HTTP cache: {self.hits} hits ({self.revalidations} revalidated), "
+              f"{self.misses} misses, {hit_rate:.1f}% hit rate, "
+              f"{self.total_bytes / 1024 / 1024:.1f} MB on disk")
+
+
+def cached_get(http, url, cache, headers, timeout=10):
+    """GET `url` through `cache`, sending a conditional request when a cached copy exists
+
+    Returns the raw response bytes. HTTP errors are raised as by `raise_for_status`. An
+    entry evicted by another thread between lookup and read is fetched again in full.
+    """
+    if cache is None:
+        response = http.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+    meta = cache.lookup(url)
+    if meta is not None and cache.is_fresh(meta):
+        content = cache.read(url)
+        if content is not None:
+            cache.record('hit')
+            return content
+        meta = None
+    conditional = {**headers, **cache.conditional_headers(meta)} if meta is not None else headers
+
+    response = http.get(url, headers=conditional, timeout=timeout)
+    if response.status_code == 304 and meta is not None:
+        content = cache.read(url)
+        if content is not None:
+            cache.touch(url)
+            cache.record('revalidated')
+            return content
+        response = http.get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    cache.store(url, response.content, response.headers)
+    cache.record('miss')
+    return response.content
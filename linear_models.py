@@ -0,0 +1,35 @@
+import numpy as np
+
+# Kept outside train_models.py so pickled models load from any entry point
+
+
+class RidgeRegression:
+    """Closed-form ridge regression on standardized features (NumPy only)"""
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        Z = (X - self.mean_) / self.scale_
+        self.intercept_ = float(np.mean(y))
+        gram = Z.T @ Z + self.alpha * np.eye(Z.shape[1])
+        self.coef_ = np.linalg.solve(gram, Z.T @ (y - self.intercept_))
+        return self
+
+    def predict(self, X):
+        Z = (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+        return Z @ self.coef_ + self.intercept_
+
+
+class RidgeClassifier(RidgeRegression):
+    """Ridge regression on the 0/1 target, thresholded at 0.5"""
+
+    def decision_function(self, X):
+        return super().predict(X)
+
+    def predict(self, X):
+        return (self.decision_function(X) >= 0.5).astype(np.uint8)
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from article_features import TOKEN_RE, Vocabulary
+from article_store import ArticleStore, iter_records
+
+SHINGLE_SIZE = 4
+NUM_PERM = 128
+BANDS = 16  # 16 bands of 8 rows: pairs above ~0.71 Jaccard are likely to share a bucket
+THRESHOLD = 0.8
+MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def iter_documents(source):
+    """(original_index, text) of successfully fetched articles
+
+    `source` is an article_store.py directory, crawl.py JSONL or a
+    fetch_url_content.py JSON array (which only hold the 2,000-character preview).
+    """
+    if os.path.isdir(source):
+        store = ArticleStore(source)
+        records = (store.get(int(index), fields={'title', 'content'})
+                   for index in np.sort(store.records['original_index']))
+    else:
+        records = iter_records(source)
+    for record in records:
+        if record.get('status') == 'success':
+            text = record.get('content', record.get('content_preview', ''))
+            yield record['original_index'], f"{record.get('title') or ''} {text}"
+
+
+def tokenize(texts, vocab=None):
+    """Token ids of all documents concatenated, and the number of tokens of each"""
+    vocab = vocab or Vocabulary()
+    id_arrays = [vocab.encode(TOKEN_RE.findall(text.lower())) for text in texts]
+    lengths = np.array([len(ids) for ids in id_arrays], dtype=np.int64)
+    ids = np.concatenate(id_arrays) if id_arrays else np.empty(0, dtype=np.int32)
+    return ids, lengths, len(vocab.ids)
+
+
+def shingle_hashes(token_ids, lengths, vocab_size, k=SHINGLE_SIZE, seed=0):
+    """64-bit hash and document number of every k-token window inside a document
+
+    Each token id gets a random 64-bit value and a window's hash is a polynomial of
+    its k values, computed for all windows at once with k shifted array slices.
+    Windows crossing a document boundary are dropped; shorter documents get none.
+    """
+    token_values = np.random.default_rng(seed).integers(0, np.iinfo(np.uint64).max, vocab_size,
+                                                        dtype=np.uint64, endpoint=True)
+    values = token_values[token_ids]
+    n_windows = max(len(values) - k + 1, 0)
+    hashes = np.zeros(n_windows, dtype=np.uint64)
+    for j in range(k):
+        hashes = hashes * MULTIPLIER + values[j:j + n_windows]
+    doc = np.repeat(np.arange(len(lengths)), lengths)[:n_windows]
+    doc_end = np.cumsum(lengths)[doc]
+    inside = np.arange(n_windows) + k <= doc_end
+    return hashes[inside], doc[inside]
+
+
+def minhash_signatures(shingles, doc, n_docs, num_perm=NUM_PERM, seed=1):
+    """(n_docs, num_perm) uint32 one-permutation MinHash signatures
+
+    Each shingle is hashed once: the high bits pick one of `num_perm` bins and the
+    low 32 bits are the value, and every bin keeps its document's minimum, so the
+    cost is O(shingles) instead of O(shingles x num_perm). Empty bins are filled from
+    the next non-empty bin to the right, offset by the distance (rotation
+    densification), so short documents still compare bin by bin. Documents without
+    shingles keep the maximum value in every bin.
+    """
+    a, b = np.random.default_rng(seed).integers(0, np.iinfo(np.uint64).max, 2, dtype=np.uint64, endpoint=True)
+    mixed = shingles * (a | np.uint64(1)) + b
+    mixed ^= mixed >> np.uint64(31)
+    bins = ((mixed >> np.uint64(32)) * np.uint64(num_perm)) >> np.uint64(32)
+    slots = doc.astype(np.int64) * num_perm + bins.astype(np.int64)
+    empty = np.iinfo(np.uint32).max
+    signatures = np.full(n_docs * num_perm, empty, dtype=np.uint32)
+    np.minimum.at(signatures, slots, (mixed & np.uint64(0xFFFFFFFF)).astype(np.uint32))
+    filled = np.zeros(n_docs * num_perm, dtype=bool)
+    filled[slots] = True
+    signatures, filled = signatures.reshape(n_docs, num_perm), filled.reshape(n_docs, num_perm)
+
+    sparse = np.flatnonzero(filled.any(axis=1) & ~filled.all(axis=1))
+    if len(sparse):
+        # Index of the next filled bin at or after each position, wrapping around the row
+        positions = np.arange(2 * num_perm)
+        candidates = np.where(np.tile(filled[sparse], 2), positions, 2 * num_perm)
+        next_filled = np.minimum.accumulate(candidates[:, ::-1], axis=1)[:, ::-1][:, :num_perm]
+        distance = (next_filled - positions[:num_perm]).astype(np.uint32)
+        source = np.take_along_axis(signatures[sparse], next_filled % num_perm, axis=1)
+        signatures[sparse] = np.where(filled[sparse], signatures[sparse],
+                                      source + distance * np.uint32(0x9E3779B1))
+    return signatures
+
+
+def lsh_candidates(signatures, bands=BANDS, seed=2):
+    """Candidate pairs (i < j) that agree on all rows of at least one band
+
+    Per band, the rows are folded into one 64-bit bucket key and the keys are sorted;
+    each document is paired with the first document of its bucket, so the work is
+    O(n log n) per band instead of comparing all pairs.
+    """
+    n_docs, num_perm = signatures.shape
+    rows = num_perm // bands
+    weights = np.random.default_rng(seed).integers(1, np.iinfo(np.uint64).max, rows, dtype=np.uint64)
+    firsts, others = [], []
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        new_bucket = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        bucket_first = np.maximum.accumulate(np.where(new_bucket, np.arange(n_docs), 0))
+        members = ~new_bucket
+        firsts.append(order[bucket_first[members]])
+        others.append(order[members])
+    first, other = np.concatenate(firsts), np.concatenate(others)
+    pairs = np.unique(np.minimum(first, other).astype(np.int64) * n_docs + np.maximum(first, other))
+    return pairs // n_docs, pairs % n_docs
+
+
+def estimated_jaccard(signatures, left, right, block=1 << 16):
+    """Fraction of equal MinHash values of each pair, an unbiased Jaccard estimate"""
+    similarity = np.empty(len(left))
+    for start in range(0, len(left), block):
+        stop = start + block
+        similarity[start:stop] = (signatures[left[start:stop]] == signatures[right[start:stop]]).mean(axis=1)
+    return similarity
+
+
+def connected_components(n, left, right):
+    """Component label (smallest member) of each node, by vectorized label propagation"""
+    labels = np.arange(n)
+    while True:
+        previous = labels.copy()
+        edge_min = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, left, edge_min)
+        np.minimum.at(labels, right, edge_min)
+        labels = labels[labels]  # pointer jumping
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def find_near_duplicates(documents, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, k=SHINGLE_SIZE):
+    """Cluster near-duplicate documents; returns (clusters, timings)
+
+    `documents` are (original_index, text) pairs. Each cluster lists the smallest
+    original_index as `canonical` and the others as `duplicates`, which can be
+    dropped; pairs are linked when their estimated Jaccard similarity of k-word
+    shingles reaches `threshold`.
+    """
+    documents = list(documents)
+    timings = {'shingle': 0.0, 'minhash': 0.0, 'lsh': 0.0, 'candidates': 0, 'matched_pairs': 0}
+    if len(documents) < 2:
+        return [], timings
+    start = time.perf_counter()
+    indices = np.array([index for index, _ in documents], dtype=np.int64)
+    token_ids, lengths, vocab_size = tokenize([text for _, text in documents])
+    shingles, doc = shingle_hashes(token_ids, lengths, vocab_size, k)
+    timings['shingle'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    signatures = minhash_signatures(shingles, doc, len(documents), num_perm)
+    timings['minhash'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    has_shingles = np.zeros(len(documents), dtype=bool)
+    has_shingles[doc] = True
+    left, right = lsh_candidates(signatures, bands)
+    keep = has_shingles[left] & has_shingles[right]
+    left, right = left[keep], right[keep]
+    similarity = estimated_jaccard(signatures, left, right)
+    matched = similarity >= threshold
+    timings['lsh'] = time.perf_counter() - start
+    timings['candidates'] = len(left)
+    timings['matched_pairs'] = int(matched.sum())
+
+    labels = connected_components(len(documents), left[matched], right[matched])
+    min_similarity = np.ones(len(documents))
+    np.minimum.at(min_similarity, labels[left[matched]], similarity[matched])
+    members = np.flatnonzero(np.bincount(labels, minlength=len(documents))[labels] > 1)
+    members = members[np.lexsort((indices[members], labels[members]))]
+    bounds = np.flatnonzero(np.diff(labels[members])) + 1
+    clusters = []
+    for group in np.split(members, bounds) if len(members) else []:
+        clusters.append({'canonical': int(indices[group[0]]), 'duplicates': indices[group[1:]].tolist(),
+                         'min_similarity': round(float(min_similarity[labels[group[0]]]), 3)})
+    clusters.sort(key=lambda cluster: cluster['canonical'])
+    return clusters, timings
+
+
+def synthetic_documents(n_docs, duplicate_fraction=0.1, edit_fraction=0.02, words=300, seed=0):
+    """Random Zipf-worded articles where `duplicate_fraction` are lightly edited copies of earlier ones
+
+    Returns the documents and the planted (copy, original) pairs.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(20000)])
+    texts = []
+    planted = []
+    for i in range(n_docs):
+        if i and rng.random() < duplicate_fraction:
+            original = int(rng.integers(i))
+            tokens = texts[original].split()
+            for position in rng.choice(len(tokens), int(len(tokens) * edit_fraction), replace=False):
+                tokens[position] = vocabulary[rng.zipf(1.3) % len(vocabulary)]
+            planted.append((i, original))
+        else:
+            tokens = vocabulary[rng.zipf(1.3, words) % len(vocabulary)].tolist()
+        texts.append(' '.join(tokens))
+    return list(enumerate(texts)), planted
+
+
+def print_report(n_docs, clusters, timings):
+    total = timings['shingle'] + timings['minhash'] + timings['lsh']
+    n_duplicates = sum(len(cluster['duplicates']) for cluster in clusters)
+    print("="*60)
+    print("NEAR-DUPLICATE DETECTION")
+    print("="*60)
+    print(f"Documents: {n_docs:,}")
+    for stage in ('shingle', 'minhash', 'lsh'):
+        rate = n_docs / timings[stage] if timings[stage] else 0.0
+        print(f"  {stage:<8} {timings[stage]:8.2f}s  {rate:12,.0f} docs/s")
+    print(f"  {'total':<8} {total:8.2f}s  {n_docs / total if total else 0.0:12,.0f} docs/s")
+    print(f"Candidate pairs: {timings['candidates']:,}, above threshold: {timings['matched_pairs']:,}")
+    print(f"Clusters: {len(clusters):,}, duplicates flagged: {n_duplicates:,} "
+          f"({n_duplicates / n_docs * 100 if n_docs else 0:.1f}% of documents)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinHash/LSH near-duplicate detection over fetched articles")
+    parser.add_argument('source', nargs='?', default='url_content_crawl.jsonl',
+                        help="crawl.py JSONL, url_content_analysis.json or an article_store.py directory")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="minimum estimated Jaccard similarity")
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM, help="MinHash permutations")
+    parser.add_argument('--bands', type=int, default=BANDS, help="LSH bands (num-perm must divide evenly)")
+    parser.add_argument('--shingle', type=int, default=SHINGLE_SIZE, help="words per shingle")
+    parser.add_argument('--output', default='near_duplicates.json', help="clusters as JSON")
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help="run on this many synthetic articles with planted duplicates instead")
+    args = parser.parse_args()
+    if args.num_perm % args.bands:
+        parser.error("--num-perm must be a multiple of --bands")
+
+    if args.synthetic:
+        documents, planted = synthetic_documents(args.synthetic)
+    else:
+        documents = list(iter_documents(args.source))
+    clusters, timings = find_near_duplicates(documents, args.threshold, args.num_perm, args.bands, args.shingle)
+    print_report(len(documents), clusters, timings)
+
+    if args.synthetic:
+        found = {index: cluster['canonical'] for cluster in clusters for index in cluster['duplicates']}
+        found.update({cluster['canonical']: cluster['canonical'] for cluster in clusters})
+        recalled = sum(found.get(copy) is not None and found.get(copy) == found.get(original)
+                       for copy, original in planted)
+        print(f"Planted duplicates recovered: {recalled:,}/{len(planted):,}")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'source': args.source, 'threshold': args.threshold, 'num_perm': args.num_perm,
+                       'bands': args.bands, 'shingle': args.shingle, 'clusters': clusters}, f, indent=2)
+        print(f"Clusters saved to '{args.output}'")
@@ -0,0 +1,59 @@
+import argparse
+import runpy
+import sys
+
+# Subcommand -> (script module, description). Each script is imported only when its
+# subcommand runs, so `news.py summary` never pays for pandas, matplotlib or requests.
+SCRIPTS = {
+    'report': ('read_csv_data', "full dataset report (describe, distributions, correlations)"),
+    'visualize': ('visualize_data', "render the analysis dashboard"),
+    'crawl': ('crawl', "resumable full-corpus crawl"),
+    'coordinate': ('crawl_coordinator', "sharded crawl with a SQLite lease queue and workers"),
+    'fetch': ('fetch_url_content', "fetch sample URLs and write the documentation"),
+    'docs': ('report_engine', "rebuild the documentation from saved URL analysis"),
+    'partitions': ('partitioned_dataset', "partitioned dataset: build, query, benchmark"),
+    'train': ('train_models', "cross-validate and save popularity models"),
+}
+
+
+def run_summary(args):
+    if args.approximate:
+        from summary_snapshot import load_approximate, print_approximate_summary
+        approx = load_approximate(args.csv, rebuild=args.rebuild, crawl_path=args.crawl)
+        print_approximate_summary(approx, args.quantiles)
+        return
+    from summary_snapshot import load_snapshot, print_summary
+    print_summary(load_snapshot(args.csv, args.snapshot, rebuild=args.rebuild))
+
+
+def run_script(module, argv):
+    """Run a script module as __main__ with the remaining arguments"""
+    sys.argv = [module + '.py'] + argv
+    runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+
+def main(argv=None):
+    from summary_snapshot import DATASET_PATH, SNAPSHOT_PATH, add_approximate_arguments
+
+    parser = argparse.ArgumentParser(prog='news.py', description="Online News Popularity toolkit")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary = subparsers.add_parser('summary', help="quick summary served from a precomputed snapshot")
+    summary.add_argument('--csv', default=DATASET_PATH, help="dataset CSV")
+    summary.add_argument('--snapshot', default=SNAPSHOT_PATH, help="precomputed summary snapshot")
+    summary.add_argument('--rebuild', action='store_true', help="recompute the snapshot from the dataset")
+    add_approximate_arguments(summary)
+    for name, (_, description) in SCRIPTS.items():
+        # Options are passed through untouched to the script's own parser
+        subparsers.add_parser(name, help=description, add_help=False)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command == 'summary':
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        run_summary(args)
+    else:
+        run_script(SCRIPTS[args.command][0], rest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 -- partitions are Parquet files with column projection
+except ImportError:  # fall back to pickled partitions; projection then happens after the read
+    pyarrow = None
+
+from aggregations import decode_one_hot
+from dataset import (CACHE_DIR, CHANNEL_COLUMNS, CHANNELS, DATASET_PATH, WEEKDAY_COLUMNS, WEEKDAYS,
+                     column_dtype, dataset_fingerprint, load_dataset)
+
+PARTITION_DIR = os.path.join(CACHE_DIR, 'partitioned')
+PARTITION_VERSION = 2
+BUCKET_DAYS = 60  # timedelta buckets: days 0-59, 60-119, ... before acquisition
+
+OPERATORS = {
+    '==': np.equal, '!=': np.not_equal, '<': np.less, '<=': np.less_equal,
+    '>': np.greater, '>=': np.greater_equal, 'in': np.isin,
+}
+
+
+def partition_channel(df):
+    """Channel name of each row; articles without a channel flag get 'none'"""
+    return np.array(CHANNELS + ['none'])[decode_one_hot(df, CHANNEL_COLUMNS)]
+
+
+def _may_match(stats, predicate):
+    """False when a partition's min/max rule out every row for `predicate`"""
+    column, op, value = predicate
+    low, high = stats['min'].get(column), stats['max'].get(column)
+    if low is None:
+        return True
+    if op == '==':
+        return low <= value <= high
+    if op == '!=':
+        return not (low == high == value)
+    if op == '<':
+        return low < value
+    if op == '<=':
+        return low <= value
+    if op == '>':
+        return high > value
+    if op == '>=':
+        return high >= value
+    return any(low <= v <= high for v in value)
+
+
+def build_partitions(csv_path=DATASET_PATH, partition_dir=PARTITION_DIR, bucket_days=BUCKET_DAYS):
+    """Write the dataset as one file per (timedelta bucket, channel) with a min/max manifest
+
+    Partitions live in `<partition_dir>/<fingerprint>/timedelta_bucket=<b>/channel=<c>/`
+    and the manifest records each one's row count and every numeric column's min and max,
+    which is what lets a query skip partitions without opening them.
+    """
+    fingerprint = dataset_fingerprint(csv_path)
+    root = os.path.join(partition_dir, fingerprint[:16])
+    tmp_root = root + '.tmp'
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    df = load_dataset(csv_path)
+    numeric = df.select_dtypes(include=[np.number]).columns
+    extension = '.parquet' if pyarrow is not None else '.pkl'
+    partitions = []
+    keys = pd.DataFrame({'bucket': df['timedelta'].to_numpy() // bucket_days, 'channel': partition_channel(df)})
+    for (bucket, channel), rows in keys.groupby(['bucket', 'channel'], sort=True).indices.items():
+        part = df.iloc[rows].reset_index(drop=True)
+        relative = os.path.join(f'timedelta_bucket={bucket}', f'channel={channel}', 'part-0' + extension)
+        os.makedirs(os.path.dirname(os.path.join(tmp_root, relative)), exist_ok=True)
+        if pyarrow is not None:
+            part.to_parquet(os.path.join(tmp_root, relative), index=False)
+        else:
+            part.to_pickle(os.path.join(tmp_root, relative), compression=None)
+        values = part[numeric].to_numpy(dtype=np.float64)
+        partitions.append({
+            'path': relative, 'rows': len(part), 'timedelta_bucket': int(bucket), 'channel': channel,
+            'min': dict(zip(numeric, values.min(axis=0).tolist())),
+            'max': dict(zip(numeric, values.max(axis=0).tolist())),
+        })
+
+    with open(os.path.join(tmp_root, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': PARTITION_VERSION, 'fingerprint': fingerprint, 'source': csv_path,
+                   'bucket_days': bucket_days, 'columns': list(df.columns), 'partitions': partitions}, f, indent=2)
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(tmp_root, root)
+    for name in os.listdir(partition_dir):  # layouts of older versions of the CSV
+        if name != os.path.basename(root):
+            shutil.rmtree(os.path.join(partition_dir, name), ignore_errors=True)
+    return root
+
+
+class PartitionedDataset:
+    """Query API over the partitioned layout: column projection plus predicate pushdown
+
+    Predicates are (column, op, value) tuples joined by AND, with op one of ==, !=, <,
+    <=, >, >= or in. Each is checked first against the manifest's per-partition min/max,
+    so `('data_channel_is_tech', '==', 1)` skips every non-tech partition and
+    `('timedelta', '<=', 60)` skips every later bucket, and then row by row in the
+    partitions that are left. Only the projected and predicate columns are read.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.columns = self.manifest['columns']
+        self.last_scan = None
+
+    def select_partitions(self, where=()):
+        return [p for p in self.manifest['partitions'] if all(_may_match(p, predicate) for predicate in where)]
+
+    def query(self, columns=None, where=()):
+        """Rows matching every predicate in `where`, restricted to `columns` (default: all)"""
+        columns = list(columns) if columns is not None else list(self.columns)
+        where = [tuple(predicate) for predicate in where]
+        for column in columns + [predicate[0] for predicate in where]:
+            if column not in self.columns:
+                raise KeyError(f"unknown column '{column}'")
+        read_columns = list(dict.fromkeys(columns + [predicate[0] for predicate in where]))
+
+        partitions = self.select_partitions(where)
+        frames = []
+        rows_read = 0
+        for partition in partitions:
+            path = os.path.join(self.root, partition['path'])
+            if pyarrow is not None and path.endswith('.parquet'):
+                part = pd.read_parquet(path, columns=read_columns)
+            else:
+                part = pd.read_pickle(path)[read_columns]
+            rows_read += len(part)
+            mask = np.ones(len(part), dtype=bool)
+            for column, op, value in where:
+                mask &= OPERATORS[op](part[column].to_numpy(), value)
+            frames.append(part.loc[mask, columns])
+        self.last_scan = {'partitions': len(partitions), 'total_partitions': len(self.manifest['partitions']),
+                          'columns': len(read_columns), 'rows_read': rows_read}
+        if not frames:
+            # No partition can match: an empty frame with the stored dtypes
+            return pd.DataFrame({c: pd.Series(dtype=column_dtype(c)) for c in columns})
+        return pd.concat(frames, ignore_index=True)
+
+
+def load_partitioned(csv_path=DATASET_PATH, partition_dir=PARTITION_DIR, bucket_days=BUCKET_DAYS, rebuild=False):
+    """The partitioned layout of `csv_path`, rebuilt when the CSV or the bucket width changed"""
+    root = os.path.join(partition_dir, dataset_fingerprint(csv_path)[:16])
+    if not rebuild:
+        try:
+            dataset = PartitionedDataset(root)
+            manifest = dataset.manifest
+            if manifest.get('version') == PARTITION_VERSION and manifest.get('bucket_days') == bucket_days:
+                return dataset
+        except (OSError, ValueError):
+            pass
+    return PartitionedDataset(build_partitions(csv_path, partition_dir, bucket_days))
+
+
+def mean_shares_by_weekday(df):
+    """Article count and mean shares per weekday of a frame holding the weekday flags and shares"""
+    codes = decode_one_hot(df, WEEKDAY_COLUMNS)
+    shares = df['shares'].to_numpy(dtype=np.float64)
+    counts = np.bincount(codes, minlength=len(WEEKDAYS) + 1)[:len(WEEKDAYS)]
+    sums = np.bincount(codes, weights=shares, minlength=len(WEEKDAYS) + 1)[:len(WEEKDAYS)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({'articles': counts, 'mean_shares': sums / counts}, index=WEEKDAYS)
+
+
+def recent_channel_query(channel='tech', days=60):
+    """Columns and predicates for mean shares by weekday of `channel` articles from the last `days` days"""
+    return WEEKDAY_COLUMNS + ['shares'], [(f'data_channel_is_{channel}', '==', 1), ('timedelta', '<=', days)]
+
+
+def parse_predicate(text):
+    """'timedelta<=60' -> ('timedelta', '<=', 60); 'num_imgs in 0,1' -> ('num_imgs', 'in', [0, 1])"""
+    match = re.fullmatch(r'\s*(\w+)\s*(==|!=|<=|>=|<|>|\s+in\s+)\s*(.+?)\s*', text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected <column><op><number>, got '{text}'")
+    column, op, value = match.groups()
+    try:
+        if op.strip() == 'in':
+            return column, 'in', [float(v) for v in value.split(',')]
+        return column, op, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number in '{text}'") from None
+
+
+def query_full_load(csv_path, columns, where, cache_dir=CACHE_DIR):
+    """The same query through the whole-file loader: every column of every row, then filtered"""
+    df = load_dataset(csv_path, cache_dir=cache_dir)
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in where:
+        mask &= OPERATORS[op](df[column].to_numpy(), value)
+    return df.loc[mask, list(columns)].reset_index(drop=True)
+
+
+def benchmark(csv_path, channel, days, repeats):
+    """Best time of the recent-channel question through the partitions and through a full load"""
+    columns, where = recent_channel_query(channel, days)
+    dataset = load_partitioned(csv_path)
+    timings = {}
+    results = {}
+    for name, fn in [('full load', lambda: query_full_load(csv_path, columns, where)),
+                     ('partitioned', lambda: dataset.query(columns, where))]:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results[name] = mean_shares_by_weekday(fn())
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    pd.testing.assert_frame_equal(results['full load'], results['partitioned'])
+    return timings, results['partitioned'], dataset.last_scan
+
+
+def print_scan(scan):
+    print(f"Read {scan['partitions']}/{scan['total_partitions']} partitions, "
+          f"{scan['columns']} columns, {scan['rows_read']:,} rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partitioned dataset layout with projection and predicate pushdown")
+    parser.add_argument('--csv', default=DATASET_PATH, help="dataset CSV")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="write the partitions and their manifest")
+    build.add_argument('--bucket-days', type=int, default=BUCKET_DAYS, help="width of a timedelta bucket")
+    query = subparsers.add_parser('query', help="filter and project, optionally grouped")
+    query.add_argument('--columns', nargs='+', default=['shares'], help="numeric columns to report")
+    query.add_argument('--where', action='append', type=parse_predicate, default=[],
+                       help="predicate such as 'timedelta<=60' (repeatable, combined with AND)")
+    query.add_argument('--channel', choices=CHANNELS, help="shorthand for data_channel_is_<channel>==1")
+    query.add_argument('--days', type=int, help="shorthand for timedelta<=DAYS")
+    query.add_argument('--group-by', choices=['weekday', 'channel'], help="report mean per group")
+    bench = subparsers.add_parser('benchmark', help="compare a recent-channel query with the full-load path")
+    bench.add_argument('--channel', choices=CHANNELS, default='tech')
+    bench.add_argument('--days', type=int, default=60)
+    bench.add_argument('--repeats', type=int, default=5, help="timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        dataset = PartitionedDataset(build_partitions(args.csv, bucket_days=args.bucket_days))
+        partitions = dataset.manifest['partitions']
+        print(f"Wrote {len(partitions)} partitions ({sum(p['rows'] for p in partitions):,} rows) "
+              f"to '{dataset.root}' in {time.perf_counter() - start:.2f}s")
+    elif args.command == 'query':
+        where = list(args.where)
+        if args.channel:
+            where.append((f'data_channel_is_{args.channel}', '==', 1))
+        if args.days is not None:
+            where.append(('timedelta', '<=', args.days))
+        group_columns = {'weekday': WEEKDAY_COLUMNS, 'channel': CHANNEL_COLUMNS}.get(args.group_by, [])
+        dataset = load_partitioned(args.csv)
+        df = dataset.query(list(dict.fromkeys(args.columns + group_columns)), where)
+        print_scan(dataset.last_scan)
+        print(f"Matching articles: {len(df):,}")
+        if args.group_by:
+            names = WEEKDAYS if args.group_by == 'weekday' else CHANNELS
+            labels = np.array(names + ['none'])[decode_one_hot(df, group_columns)]
+            print(df[args.columns].groupby(labels).mean().reindex(names + ['none']).dropna(how='all').round(2))
+        else:
+            print(df[args.columns].mean().round(2).to_string())
+    else:
+        timings, result, scan = benchmark(args.csv, args.channel, args.days, args.repeats)
+        print("="*60)
+        print(f"MEAN SHARES OF {args.channel.upper()} ARTICLES, LAST {args.days} DAYS, BY WEEKDAY")
+        print("="*60)
+        print(result.round(0).to_string())
+        print()
+        print(f"Full load + filter:  {timings['full load'] * 1000:8.1f} ms")
+        print(f"Partitioned query:   {timings['partitioned'] * 1000:8.1f} ms  "
+              f"({timings['full load'] / timings['partitioned']:.1f}x faster)")
+        print_scan(scan)
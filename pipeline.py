@@ -0,0 +1,156 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+
+from fetch_engine import iter_fetch_concurrently
+from fetch_url_content import download_article, failed_content, parse_article_content
+from html_extract import DEFAULT_EXTRACTOR
+from tracing import TRACER, incr
+
+_DONE = object()
+
+
+def _timed_parse(content_bytes, extractor):
+    """Process-pool task: parse one page and report how long it took
+
+    Spans recorded in the child process never reach the parent's tracer, so the
+    caller records the returned duration itself.
+    """
+    start = time.perf_counter()
+    content_data = parse_article_content(content_bytes, extractor)
+    return content_data, time.perf_counter() - start
+
+
+class StageMetrics:
+    """Per-stage counters and timings of a two-stage fetch/parse run"""
+
+    def __init__(self):
+        self.downloaded = 0
+        self.download_seconds = 0.0
+        self.download_bytes = 0
+        self.producer_blocked_seconds = 0.0
+        self.parsed = 0
+        self.parse_seconds = 0.0
+        self.completed = 0
+        self.consumer_idle_seconds = 0.0
+        self.elapsed_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def report(self):
+        """Print a per-stage timing table"""
+        def per_item(total, count):
+            return total / count * 1000 if count else 0.0
+
+        print("\n" + "="*60)
+        print("PIPELINE STAGE METRICS")
+        print("="*60)
+        print(f"Download stage: {self.downloaded:,} pages, {self.download_bytes / 1024 / 1024:.1f} MB, "
+              f"{per_item(self.download_seconds, self.downloaded):.1f} ms/page (worker time)")
+        print(f"Parse stage:    {self.parsed:,} pages, "
+              f"{per_item(self.parse_seconds, self.parsed):.1f} ms/page (worker time)")
+        print(f"Backpressure:   downloads blocked {self.producer_blocked_seconds:.1f}s on a full queue, "
+              f"parsers idle {self.consumer_idle_seconds:.1f}s waiting for pages")
+        rate = self.completed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+        print(f"Throughput:     {rate:.2f} URLs/s over {self.elapsed_seconds:.1f}s")
+
+
+def run_pipeline(items, max_io_workers=8, max_parse_workers=None, queue_size=64,
+                 rate_per_host=0.5, cache=None, extractor=DEFAULT_EXTRACTOR, metrics=None, policy=None):
+    """Download `(key, url)` pairs on I/O threads and parse them in a process pool
+
+    The stages are joined by a queue of at most `queue_size` downloaded pages and at
+    most `queue_size` pages are being parsed at once, so a slow parse stage blocks the
+    downloaders instead of letting raw pages pile up in memory. Yields
+    `(key, url, content_data)` in completion order.
+    """
+    metrics = metrics if metrics is not None else StageMetrics()
+    max_parse_workers = max_parse_workers or os.cpu_count() or 1
+    pages = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def timed_download(url, session=None):
+        start = time.perf_counter()
+        download = download_article(url, session=session, cache=cache, policy=policy)
+        with metrics.lock:
+            metrics.downloaded += 1
+            metrics.download_seconds += time.perf_counter() - start
+            if download['content'] is not None:
+                metrics.download_bytes += len(download['content'])
+        return download
+
+    def put(entry):
+        # Block while the queue is full, but give up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            downloads = iter_fetch_concurrently(items, timed_download, max_workers=max_io_workers,
+                                                rate_per_host=rate_per_host)
+            for entry in downloads:
+                blocked = time.perf_counter()
+                delivered = put(entry)
+                with metrics.lock:
+                    metrics.producer_blocked_seconds += time.perf_counter() - blocked
+                if not delivered:
+                    return
+        except BaseException as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce, name='pipeline-download', daemon=True)
+    producer.start()
+    parse = partial(_timed_parse, extractor=extractor)
+    parsing = {}
+    downloads_done = False
+    try:
+        with ProcessPoolExecutor(max_workers=max_parse_workers) as executor:
+            while not downloads_done or parsing:
+                # Feed parsers while there is room, then collect whatever has finished
+                while not downloads_done and len(parsing) < queue_size:
+                    if parsing:
+                        try:
+                            entry = pages.get_nowait()
+                        except queue.Empty:
+                            break
+                    else:
+                        idle = time.perf_counter()
+                        entry = pages.get()
+                        metrics.consumer_idle_seconds += time.perf_counter() - idle
+                    if entry is _DONE:
+                        downloads_done = True
+                    elif isinstance(entry, BaseException):
+                        raise entry
+                    else:
+                        key, url, download = entry
+                        if download['content'] is None:
+                            metrics.completed += 1
+                            incr('articles', status=download['error_class'])
+                            yield key, url, failed_content(download)
+                        else:
+                            parsing[executor.submit(parse, download['content'])] = (key, url)
+                if not parsing:
+                    continue
+                done, _ = wait(parsing, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, url = parsing.pop(future)
+                    content_data, parse_seconds = future.result()
+                    metrics.parsed += 1
+                    metrics.parse_seconds += parse_seconds
+                    metrics.completed += 1
+                    TRACER.observe('parse', parse_seconds)
+                    incr('articles', status=content_data['error_class'])
+                    yield key, url, content_data
+    finally:
+        stop.set()
+        metrics.elapsed_seconds = time.perf_counter() - start
@@ -1,14 +1,10 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dataset import load_dataset
+from aggregations import compute_aggregates
+from stats_store import corr_with_target
 
-# Read the CSV file
+# Read the dataset (column names are stripped and dtypes downcast by the loader)
 print("Reading the Online News Popularity dataset...")
-df = pd.read_csv('OnlineNewsPopularity.csv')
-
-# Clean column names by stripping whitespace
-df.columns = df.columns.str.strip()
+df = load_dataset()
 
 # Display basic information about the dataset
 print("\n" + "="*50)
@@ -59,32 +55,26 @@ print(shares_stats)
 print(f"\nNote: Binary classification target not created automatically.")
 print(f"To create 'is_popular' column, use: df['is_popular'] = (df['shares'] >= 1400).astype(int)")
 
+# Channel and weekday groups are decoded and aggregated in a single pass
+aggregates = compute_aggregates(df)
+
 print("\n" + "="*50)
 print("DATA CHANNEL DISTRIBUTION")
 print("="*50)
-channel_columns = [col for col in df.columns if col.startswith('data_channel_is_')]
-for col in channel_columns:
-    channel_name = col.replace('data_channel_is_', '').title()
-    count = df[col].sum()
-    percentage = count / len(df) * 100
+for channel_name, count, percentage, _, _ in aggregates.channels.rows():
     print(f"{channel_name}: {count:,} articles ({percentage:.1f}%)")
 
 print("\n" + "="*50)
 print("WEEKDAY DISTRIBUTION")
 print("="*50)
-weekday_columns = [col for col in df.columns if col.startswith('weekday_is_') and col != 'weekday_is_weekend']
-weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-for i, col in enumerate(weekday_columns):
-    count = df[col].sum()
-    percentage = count / len(df) * 100
-    print(f"{weekday_names[i]}: {count:,} articles ({percentage:.1f}%)")
+for weekday_name, count, percentage, _, _ in aggregates.weekdays.rows():
+    print(f"{weekday_name}: {count:,} articles ({percentage:.1f}%)")
 
 print("\n" + "="*50)
 print("CORRELATION WITH TARGET VARIABLE")
 print("="*50)
-# Calculate correlations with shares (excluding non-numeric columns)
-numeric_columns = df.select_dtypes(include=[np.number]).columns
-correlations = df[numeric_columns].corr()['shares'].sort_values(ascending=False)
+# Calculate correlations with shares (excluding non-numeric columns) without the full matrix
+correlations = corr_with_target(df, 'shares').sort_values(ascending=False)
 print("Top 10 features most correlated with shares:")
 print(correlations.head(11))  # 11 to include shares itself
 print("\nBottom 10 features least correlated with shares:")
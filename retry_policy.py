@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from tracing import incr
+
+PERMANENT = 'permanent'
+RETRYABLE = 'retryable'
+RATE_LIMITED = 'rate_limited'
+
+RETRYABLE_STATUS = {408, 425, 500, 502, 504}
+RATE_LIMITED_STATUS = {429, 503}
+
+
+def classify(error):
+    """Sort a download exception into PERMANENT, RETRYABLE or RATE_LIMITED
+
+    Timeouts, connection resets and 408/5xx responses are worth retrying; 429 and
+    503 mean the server wants us to slow down; other 4xx responses (404, 410, 403),
+    invalid URLs and anything unexpected will not get better by trying again.
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status in RATE_LIMITED_STATUS:
+            return RATE_LIMITED
+        if status in RETRYABLE_STATUS or status >= 500:
+            return RETRYABLE
+        return PERMANENT
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return RETRYABLE
+    return PERMANENT
+
+
+def retry_after_seconds(error):
+    """Delay requested by a Retry-After header (seconds or HTTP date), or None"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after `threshold` consecutive transient failures
+
+    An open host is skipped without a request until `reset_timeout` seconds have
+    passed; then one trial request is let through (half-open), which either closes
+    the circuit or opens it again. Permanent errors such as 404 do not count.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=60.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = {}
+        self.opened_at = {}
+        self.trial = set()
+        self.lock = threading.Lock()
+
+    def allow(self, host):
+        with self.lock:
+            opened = self.opened_at.get(host)
+            if opened is None:
+                return True
+            if time.monotonic() - opened < self.reset_timeout or host in self.trial:
+                return False
+            self.trial.add(host)
+            return True
+
+    def record_success(self, host):
+        with self.lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+            self.trial.discard(host)
+
+    def record_failure(self, host):
+        """Count a transient failure; returns True when this opens the circuit"""
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            reopened = host in self.trial
+            self.trial.discard(host)
+            if reopened or (host not in self.opened_at and self.failures[host] >= self.threshold):
+                self.opened_at[host] = time.monotonic()
+                return True
+            return False
+
+    def open_hosts(self):
+        with self.lock:
+            return sorted(self.opened_at)
+
+
+class RetryStats:
+    """Thread-safe totals of attempts, retries, waits and failure classes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.failures = {PERMANENT: 0, RETRYABLE: 0, RATE_LIMITED: 0}
+        self.gave_up = 0
+        self.circuit_opened = 0
+        self.short_circuited = 0
+
+    def add(self, **amounts):
+        with self.lock:
+            for name, value in amounts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def add_failure(self, kind):
+        with self.lock:
+            self.failures[kind] += 1
+
+    def report(self, breaker=None):
+        print(f"Retries: {self.attempts:,} requests, {self.retries:,} retries "
+              f"({self.backoff_seconds:.1f}s backing off), {self.gave_up:,} URLs gave up")
+        print(f"Failures: {self.failures[PERMANENT]:,} permanent, {self.failures[RETRYABLE]:,} retryable, "
+              f"{self.failures[RATE_LIMITED]:,} rate-limited")
+        print(f"Circuit breaker: opened {self.circuit_opened:,} time(s), "
+              f"{self.short_circuited:,} requests skipped")
+        if breaker is not None and breaker.open_hosts():
+            print(f"Open circuits: {', '.join(breaker.open_hosts())}")
+
+    def as_dict(self):
+        with self.lock:
+            return {'attempts': self.attempts, 'retries': self.retries,
+                    'backoff_seconds': round(self.backoff_seconds, 3), 'failures': dict(self.failures),
+                    'gave_up': self.gave_up, 'circuit_opened': self.circuit_opened,
+                    'short_circuited': self.short_circuited}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class RetryPolicy:
+    """Classified retries with capped exponential backoff, full jitter and Retry-After
+
+    Shared by all fetch threads so the per-host circuit breaker and the statistics
+    cover the whole crawl.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30.0, max_retry_after=120.0,
+                 breaker=None, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.stats = RetryStats()
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt):
+        """Full jitter: uniform in [0, min(max_delay, base_delay * 2**attempt)]"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, url, fn, max_attempts=None, sleep=time.sleep):
+        """Run `fn()` with retries; raises the last error (or CircuitOpenError) on failure"""
+        host = urlparse(url).hostname or ''
+        max_attempts = max_attempts or self.max_attempts
+        for attempt in range(max_attempts):
+            if not self.breaker.allow(host):
+                self.stats.add(short_circuited=1, gave_up=1)
+                raise CircuitOpenError(f"circuit open for {host}")
+            self.stats.add(attempts=1)
+            try:
+                result = fn()
+            except Exception as e:
+                kind = classify(e)
+                self.stats.add_failure(kind)
+                incr('failures', kind=kind)
+                if kind == PERMANENT:
+                    self.breaker.record_success(host)  # the host answered; the URL is the problem
+                    self.stats.add(gave_up=1)
+                    raise
+                if self.breaker.record_failure(host):
+                    self.stats.add(circuit_opened=1)
+                delay = self.backoff(attempt)
+                if kind == RATE_LIMITED:
+                    requested = retry_after_seconds(e)
+                    if requested is not None:
+                        if requested > self.max_retry_after:
+                            self.stats.add(gave_up=1)
+                            raise
+                        delay = max(delay, requested)
+                if attempt == max_attempts - 1:
+                    self.stats.add(gave_up=1)
+                    raise
+                self.stats.add(retries=1, backoff_seconds=delay)
+                incr('retries')
+                sleep(delay)
+            else:
+                self.breaker.record_success(host)
+                return result
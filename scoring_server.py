@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from dataset import POPULARITY_THRESHOLD
+from train_models import MODEL_DIR
+
+
+def load_model(path):
+    """Load a model pickled by train_models.py --save"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def rows_to_matrix(rows, feature_columns, csv_columns):
+    """Build a float32 feature matrix from rows in the OnlineNewsPopularity.csv layout
+
+    Rows are either dicts keyed by column name (extra columns such as url or shares are
+    ignored) or lists with one value per CSV column, in CSV order.
+    """
+    if not rows:
+        return np.empty((0, len(feature_columns)), dtype=np.float32)
+    if isinstance(rows[0], dict):
+        return np.array([[row[c] for c in feature_columns] for row in rows], dtype=np.float32)
+    positions = [csv_columns.index(c) for c in feature_columns]
+    return np.array([[row[p] for p in positions] for row in rows], dtype=np.float32)
+
+
+class LatencyStats:
+    """Request counters plus a window of recent latencies for percentiles"""
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    def record_request(self, seconds, n_rows):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.requests += 1
+            self.rows += n_rows
+
+    def record_batch(self, n_rows):
+        with self.lock:
+            self.batches += 1
+            self.batch_sizes.append(n_rows)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.array(self.latencies)
+            batch_sizes = np.array(self.batch_sizes)
+            elapsed = time.monotonic() - self.started
+            return {
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'mean_batch_rows': float(batch_sizes.mean()) if len(batch_sizes) else 0.0,
+                'p50_ms': float(np.percentile(latencies, 50) * 1000) if len(latencies) else 0.0,
+                'p99_ms': float(np.percentile(latencies, 99) * 1000) if len(latencies) else 0.0,
+                'requests_per_second': self.requests / elapsed if elapsed else 0.0,
+                'rows_per_second': self.rows / elapsed if elapsed else 0.0,
+            }
+
+
+class MicroBatcher:
+    """Coalesce requests arriving within `window` seconds into one vectorized predict call"""
+
+    def __init__(self, bundle, window=0.002, max_batch_rows=4096, stats=None):
+        self.model = bundle['model']
+        self.task = bundle['task']
+        self.window = window
+        self.max_batch_rows = max_batch_rows
+        self.stats = stats or LatencyStats()
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self.thread.start()
+
+    def submit(self, features):
+        """Queue a (rows x features) matrix and return a Future of its predictions"""
+        future = Future()
+        self.pending.put((features, future))
+        return future
+
+    def _predict(self, X):
+        if self.task == 'regression':
+            # Models are trained on log1p(shares)
+            shares = np.expm1(self.model.predict(X))
+            return {'shares': shares, 'is_popular': shares >= POPULARITY_THRESHOLD}
+        result = {'is_popular': self.model.predict(X).astype(bool)}
+        if hasattr(self.model, 'predict_proba'):
+            result['probability'] = self.model.predict_proba(X)[:, 1]
+        return result
+
+    def _run(self):
+        while True:
+            batch = [self.pending.get()]
+            n_rows = len(batch[0][0])
+            deadline = time.monotonic() + self.window
+            while n_rows < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+
+            try:
+                predictions = self._predict(np.concatenate([features for features, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.stats.record_batch(n_rows)
+            offset = 0
+            for features, future in batch:
+                end = offset + len(features)
+                future.set_result({key: values[offset:end].tolist() for key, values in predictions.items()})
+                offset = end
+
+
+def make_handler(batcher, feature_columns, csv_columns):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out as separate writes; Nagle would delay the second by ~40 ms
+        disable_nagle_algorithm = True
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._send_json(200, batcher.stats.snapshot())
+            elif self.path == '/health':
+                self._send_json(200, {'status': 'ok', 'task': batcher.task})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send_json(404, {'error': 'not found'})
+                return
+            start = time.perf_counter()
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                rows = json.loads(self.rfile.read(length))['rows']
+                features = rows_to_matrix(rows, feature_columns, csv_columns)
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                self._send_json(400, {'error': f'bad request: {e}'})
+                return
+            try:
+                predictions = batcher.submit(features).result(timeout=30)
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+                return
+            batcher.stats.record_request(time.perf_counter() - start, len(features))
+            self._send_json(200, predictions)
+
+        def log_message(self, format, *args):
+            pass  # per-request logging would dominate latency
+
+    return ScoringHandler
+
+
+def create_server(model_path, host='127.0.0.1', port=8000, window=0.002, max_batch_rows=4096):
+    """Load the model once and return a ready-to-serve HTTP server"""
+    bundle = load_model(model_path)
+    csv_columns = ['url', 'timedelta'] + bundle['feature_columns'] + ['shares']
+    batcher = MicroBatcher(bundle, window=window, max_batch_rows=max_batch_rows)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, bundle['feature_columns'], csv_columns))
+    server.daemon_threads = True
+    server.batcher = batcher
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve popularity predictions with micro-batching")
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'ridge_classifier.pkl'),
+                        help="model saved by train_models.py --save")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--window-ms', type=float, default=2.0, help="batching window in milliseconds")
+    parser.add_argument('--max-batch-rows', type=int, default=4096)
+    args = parser.parse_args()
+
+    server = create_server(args.model, args.host, args.port, args.window_ms / 1000, args.max_batch_rows)
+    print(f"Serving '{args.model}' on http://{args.host}:{server.server_port} "
+          f"(POST /predict, GET /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nFinal metrics:", json.dumps(server.batcher.stats.snapshot(), indent=2))
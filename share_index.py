@@ -0,0 +1,376 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from article_features import KEYWORD_COLUMNS, parse_page
+from dataset import CACHE_DIR, DATASET_PATH, load_dataset
+from http_cache import ResponseCache
+
+INDEX_DIR = os.path.join(CACHE_DIR, 'share_index')
+MAX_LOAD = 0.5
+EMPTY = np.uint64(0)
+STAT_FIELDS = ['count', 'total', 'min', 'min2', 'max', 'max2']
+
+
+def key_hash(key):
+    """Stable 64-bit hash of a normalized key (0 is reserved for empty slots)"""
+    value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def hash_keys(keys):
+    return np.fromiter((key_hash(k) for k in keys), dtype=np.uint64, count=len(keys))
+
+
+def normalize_url(url):
+    """Scheme-, www- and slash-insensitive form, so links match dataset URLs"""
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or '').removeprefix('www.')
+    return host + parsed.path.rstrip('/')
+
+
+def normalize_keyword(keyword):
+    return ' '.join(keyword.lower().split())
+
+
+class ShareTable:
+    """Open-addressing hash table of share statistics held in flat NumPy arrays
+
+    Keys are 64-bit hashes; each slot stores count/total/min/max of the shares seen
+    for that key, plus the second-smallest and second-largest value so that one
+    observation can be left out at lookup time. Lookups and upserts are vectorized
+    linear probing over whole key batches, and the arrays are saved as .npy files that
+    load memory-mapped.
+    """
+
+    def __init__(self, capacity=1024):
+        capacity = 1 << max(int(capacity) - 1, 1).bit_length()
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.count = np.zeros(capacity, dtype=np.uint32)
+        self.total = np.zeros(capacity, dtype=np.float64)
+        self.min = np.full(capacity, np.inf)
+        self.min2 = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.max2 = np.full(capacity, -np.inf)
+        self.size = 0
+
+    @property
+    def capacity(self):
+        return len(self.keys)
+
+    def _probe(self, hashes, insert):
+        """Slot of each (distinct) hash; -1 when absent and `insert` is False"""
+        mask = np.uint64(self.capacity - 1)
+        position = (hashes & mask).astype(np.int64)
+        slots = np.full(len(hashes), -1, dtype=np.int64)
+        pending = np.arange(len(hashes))
+        while pending.size:
+            at = position[pending]
+            stored = self.keys[at]
+            found = stored == hashes[pending]
+            slots[pending[found]] = at[found]
+            empty = stored == EMPTY
+            if insert and empty.any():
+                # Distinct keys racing for the same empty slot: the first one claims it
+                candidates = pending[empty]
+                _, first = np.unique(at[empty], return_index=True)
+                winners = candidates[first]
+                self.keys[position[winners]] = hashes[winners]
+                slots[winners] = position[winners]
+                self.size += len(winners)
+            collided = ~found & ~empty
+            position[pending[collided]] = (position[pending[collided]] + 1) & (self.capacity - 1)
+            if insert:
+                pending = pending[~found & (slots[pending] < 0)]
+            else:
+                pending = pending[collided]
+        return slots
+
+    def _grow(self, extra):
+        if (self.size + extra) <= self.capacity * MAX_LOAD:
+            return
+        old = self
+        occupied = old.keys != EMPTY
+        grown = ShareTable(int((self.size + extra) / MAX_LOAD) + 1)
+        slots = grown._probe(old.keys[occupied], insert=True)
+        for field in STAT_FIELDS:
+            getattr(grown, field)[slots] = getattr(old, field)[occupied]
+        self.__dict__.update(grown.__dict__)
+
+    def add(self, hashes, shares):
+        """Fold (key hash, shares) observations into the table; hashes may repeat"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        shares = np.asarray(shares, dtype=np.float64)
+        if not len(hashes):
+            return
+        unique, inverse = np.unique(hashes, return_inverse=True)
+        n = len(unique)
+        count = np.bincount(inverse, minlength=n)
+        total = np.bincount(inverse, weights=shares, minlength=n)
+        # Two smallest and two largest shares of each key, from one sort of the batch
+        ordered = shares[np.lexsort((shares, inverse))]
+        first = np.r_[0, np.cumsum(count)[:-1]]
+        last = first + count - 1
+        several = count > 1
+        low, high = ordered[first], ordered[last]
+        low2 = np.where(several, ordered[np.minimum(first + 1, last)], np.inf)
+        high2 = np.where(several, ordered[np.maximum(last - 1, first)], -np.inf)
+
+        self._grow(n)
+        slots = self._probe(unique, insert=True)
+        self.count[slots] += count.astype(np.uint32)
+        self.total[slots] += total
+        old_low, old_low2, old_high, old_high2 = self.min[slots], self.min2[slots], self.max[slots], self.max2[slots]
+        self.min[slots] = np.minimum(old_low, low)
+        self.min2[slots] = np.minimum(np.maximum(old_low, low), np.minimum(old_low2, low2))
+        self.max[slots] = np.maximum(old_high, high)
+        self.max2[slots] = np.maximum(np.minimum(old_high, high), np.maximum(old_high2, high2))
+
+    def lookup(self, hashes, exclude=None):
+        """(found, count, avg, min, max) arrays for a batch of key hashes
+
+        `exclude` is an optional (count, shares) pair of arrays: that many observations
+        of that value are left out of each key's statistics, e.g. the scored article's
+        own. Only min2/max2 are kept, so a count above 1 cannot be left out of the
+        min/max and raises ValueError. A key left without observations is not found.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        slots = self._probe(hashes, insert=False)
+        found = slots >= 0
+        at = np.where(found, slots, 0)
+        count = np.where(found, self.count[at], 0).astype(np.int64)
+        total, low, high = self.total[at], self.min[at], self.max[at]
+        if exclude is not None:
+            own_count, own_shares = exclude
+            if np.any(np.asarray(own_count) > 1):
+                raise ValueError("only one observation per key can be left out")
+            own = found & (own_count > 0)
+            count = count - np.where(own, own_count, 0)
+            total = total - np.where(own, own_count * own_shares, 0.0)
+            low = np.where(own & (low == own_shares), self.min2[at], low)
+            high = np.where(own & (high == own_shares), self.max2[at], high)
+            found = found & (count > 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = np.where(found, total / np.maximum(count, 1), np.nan)
+        return found, count, avg, np.where(found, low, np.nan), np.where(found, high, np.nan)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for field in ['keys'] + STAT_FIELDS:
+            tmp_path = os.path.join(directory, f"{field}.tmp.npy")
+            np.save(tmp_path, getattr(self, field))
+            os.replace(tmp_path, os.path.join(directory, f"{field}.npy"))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved table; memory-mapped read-only unless `mmap` is False"""
+        table = cls.__new__(cls)
+        for field in ['keys'] + STAT_FIELDS:
+            path = os.path.join(directory, f"{field}.npy")
+            if not os.path.exists(path):
+                raise ValueError(f"{directory} has no {field}.npy; rebuild it with `python share_index.py build`")
+            setattr(table, field, np.load(path, mmap_mode='r' if mmap else None))
+        table.size = int(np.count_nonzero(table.keys))
+        return table
+
+
+def _article_keywords(keywords):
+    """Normalized keywords of each article, each counted once per article"""
+    return [list(dict.fromkeys(normalize_keyword(k) for k in article)) for article in keywords]
+
+
+class ShareIndex:
+    """Historical shares per keyword and per article URL, for the kw_* and self_reference_* features
+
+    An article's own shares never feed its own features: when a scored URL is in the
+    index, its observations are left out of its keywords' statistics (leave-one-out)
+    and links to itself are ignored. `keyword_urls` records the shares of every
+    article whose keywords were indexed, keyed by URL, so they can be subtracted.
+    """
+
+    def __init__(self, keywords=None, urls=None, keyword_urls=None):
+        self.keywords = keywords or ShareTable()
+        self.urls = urls or ShareTable()
+        self.keyword_urls = keyword_urls or ShareTable()
+        self.sources = []
+
+    def add_articles(self, urls, shares, keywords=None):
+        """Incrementally add articles; `keywords` holds one keyword list per article"""
+        shares = np.asarray(shares, dtype=np.float64)
+        self.urls.add(hash_keys([normalize_url(u) for u in urls]), shares)
+        if keywords is not None:
+            self.add_keywords(urls, shares, keywords)
+
+    def add_keywords(self, urls, shares, keywords):
+        """Add the keywords of articles whose URL shares are (or need not be) indexed
+
+        An article whose keywords are already indexed (or repeated in the batch) is
+        skipped, so each URL is one observation that leave-one-out can take back out.
+        """
+        hashes = hash_keys([normalize_url(u) for u in urls])
+        new = np.zeros(len(hashes), dtype=bool)
+        new[np.unique(hashes, return_index=True)[1]] = True
+        if len(hashes):
+            new &= ~self.keyword_urls.lookup(hashes)[0]
+        shares = np.asarray(shares, dtype=np.float64)[new]
+        keywords = _article_keywords([k for k, keep in zip(keywords, new) if keep])
+        self.keywords.add(hash_keys([k for article in keywords for k in article]),
+                          np.repeat(shares, [len(article) for article in keywords]))
+        self.keyword_urls.add(hashes[new], shares)
+
+    def keyword_features(self, keywords, urls=None):
+        """kw_<statistic>_<across keywords> columns for one keyword list per article
+
+        For each keyword the index gives the min/max/avg shares of other articles
+        using it; the worst (min), best (max) and average keyword of each article are
+        then taken over those statistics. Articles with no known keyword get 0. When
+        `urls` are given, indexed articles are left out of their own statistics.
+        """
+        keywords = _article_keywords(keywords)
+        flat = [k for article in keywords for k in article]
+        repeats = [len(a) for a in keywords]
+        article = np.repeat(np.arange(len(keywords)), repeats)
+        exclude = None
+        if urls is not None:
+            own_found, own_count, own_shares, _, _ = self.keyword_urls.lookup(
+                hash_keys([normalize_url(u) for u in urls]))
+            exclude = (np.repeat(np.where(own_found, own_count, 0), repeats),
+                       np.repeat(np.where(own_found, own_shares, 0.0), repeats))
+        found, _, avg, low, high = self.keywords.lookup(hash_keys(flat), exclude)
+        article = article[found]
+        n = len(keywords)
+        columns = {}
+        for stat, values in (('min', low[found]), ('max', high[found]), ('avg', avg[found])):
+            columns[f'kw_{stat}_min'] = _reduce(np.minimum, np.inf, values, article, n)
+            columns[f'kw_{stat}_max'] = _reduce(np.maximum, -np.inf, values, article, n)
+            known = np.bincount(article, minlength=n)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                columns[f'kw_{stat}_avg'] = np.where(
+                    known > 0, np.bincount(article, weights=values, minlength=n) / np.maximum(known, 1), 0.0)
+        return columns
+
+    def self_reference_features(self, links, urls=None):
+        """self_reference_{min,max,avg}_shares over the dataset articles each page links to
+
+        With `urls`, a page's links to its own URL are ignored.
+        """
+        own = [normalize_url(u) for u in urls] if urls is not None else [None] * len(links)
+        targets = [[u for u in dict.fromkeys(normalize_url(link) for link in page) if u != self_url]
+                   for page, self_url in zip(links, own)]
+        flat = [u for page in targets for u in page]
+        article = np.repeat(np.arange(len(links)), [len(page) for page in targets])
+        found, _, avg, _, _ = self.urls.lookup(hash_keys(flat))
+        article, shares = article[found], avg[found]
+        n = len(links)
+        known = np.bincount(article, minlength=n)
+        return {
+            'self_reference_min_shares': _reduce(np.minimum, np.inf, shares, article, n),
+            'self_reference_max_shares': _reduce(np.maximum, -np.inf, shares, article, n),
+            'self_reference_avg_sharess': np.where(
+                known > 0, np.bincount(article, weights=shares, minlength=n) / np.maximum(known, 1), 0.0),
+        }
+
+    def features(self, keywords, links, urls=None):
+        """All KEYWORD_COLUMNS as a DataFrame, one row per article
+
+        `urls` identify the scored articles so that their own shares are excluded.
+        """
+        columns = self.keyword_features(keywords, urls)
+        columns.update(self.self_reference_features(links, urls))
+        return pd.DataFrame(columns)[KEYWORD_COLUMNS]
+
+    def save(self, directory=INDEX_DIR):
+        self.keywords.save(os.path.join(directory, 'keywords'))
+        self.urls.save(os.path.join(directory, 'urls'))
+        self.keyword_urls.save(os.path.join(directory, 'keyword_urls'))
+        with open(os.path.join(directory, 'sources.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.sources, f, indent=2)
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR, mmap=True):
+        index = cls(*(ShareTable.load(os.path.join(directory, name), mmap)
+                      for name in ('keywords', 'urls', 'keyword_urls')))
+        with open(os.path.join(directory, 'sources.json'), encoding='utf-8') as f:
+            index.sources = json.load(f)
+        return index
+
+
+def _reduce(ufunc, identity, values, groups, n):
+    out = np.full(n, identity)
+    ufunc.at(out, groups, values)
+    return np.where(np.isfinite(out), out, 0.0)
+
+
+def crawled_keywords(crawl_path, cache_dir):
+    """(url, shares, keywords) for crawled articles whose page is in the HTTP cache"""
+    cache = ResponseCache(cache_dir)
+    urls, shares, keywords = [], [], []
+    with open(crawl_path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            content = cache.read(record['url']) if record.get('status') == 'success' else None
+            if content is None:
+                continue
+            urls.append(record['url'])
+            shares.append(record['shares'])
+            keywords.append(parse_page(record['url'], content).keywords)
+    return urls, shares, keywords
+
+
+def build_index(csv_path=DATASET_PATH, crawl_path=None, cache_dir='.http_cache'):
+    """URL shares from the dataset, keyword shares from crawled pages' meta keywords"""
+    index = ShareIndex()
+    df = load_dataset(csv_path, columns=['url', 'shares'])
+    index.add_articles(df['url'].tolist(), df['shares'].to_numpy())
+    index.sources.append({'path': csv_path, 'rows': len(df)})
+    if crawl_path:
+        urls, shares, keywords = crawled_keywords(crawl_path, cache_dir)
+        # URLs are already indexed from the dataset; only the keywords are new
+        index.add_keywords(urls, shares, keywords)
+        index.sources.append({'path': crawl_path, 'rows': len(urls)})
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword and URL share index for the kw_* / self_reference_* features")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="build the index from the dataset and crawl output")
+    build.add_argument('--csv', default=DATASET_PATH)
+    build.add_argument('--crawl', default=None, help="crawl.py JSONL output for keyword statistics")
+    build.add_argument('--cache-dir', default='.http_cache', help="HTTP cache holding the crawled pages")
+    append = subparsers.add_parser('append', help="add new articles from a CSV with url, shares[, keywords]")
+    append.add_argument('csv')
+    lookup = subparsers.add_parser('lookup', help="show statistics for keywords")
+    lookup.add_argument('keywords', nargs='+')
+    parser.add_argument('--index', default=INDEX_DIR, help="index directory")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = build_index(args.csv, args.crawl, args.cache_dir)
+        index.save(args.index)
+        print(f"Indexed {index.urls.size:,} URLs and {index.keywords.size:,} keywords "
+              f"in {time.perf_counter() - start:.2f}s -> '{args.index}'")
+    elif args.command == 'append':
+        index = ShareIndex.load(args.index, mmap=False)
+        new = pd.read_csv(args.csv)
+        keywords = (new['keywords'].fillna('').str.split(',').tolist() if 'keywords' in new.columns else None)
+        index.add_articles(new['url'].tolist(), new['shares'].to_numpy(), keywords)
+        index.sources.append({'path': args.csv, 'rows': len(new)})
+        index.save(args.index)
+        print(f"Added {len(new):,} articles; index now holds {index.urls.size:,} URLs "
+              f"and {index.keywords.size:,} keywords")
+    else:
+        index = ShareIndex.load(args.index)
+        found, count, avg, low, high = index.keywords.lookup(hash_keys([normalize_keyword(k) for k in args.keywords]))
+        for keyword, *stats in zip(args.keywords, found, count, avg, low, high):
+            if stats[0]:
+                print(f"{keyword}: {stats[1]} articles, avg {stats[2]:,.0f}, min {stats[3]:,.0f}, max {stats[4]:,.0f}")
+            else:
+                print(f"{keyword}: not in index")
@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+
+class TDigest:
+    """Merging t-digest: a few hundred weighted centroids summarising a distribution
+
+    Batches are merged by sorting the centroids together with the new values and
+    grouping them by the integer part of the k1 scale function
+    k(q) = compression / (2 pi) * asin(2q - 1), so centroids are small in the tails
+    and the rank error of a quantile is at most about pi / compression * sqrt(q(1 - q)).
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._merge(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _merge(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Interpolate between centroid midpoints, anchored at the exact min and max"""
+        total = self.count
+        mids = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * total, np.r_[0.0, mids, total], np.r_[self.min, self.means, self.max]))
+
+    def rank_error(self, q):
+        """Approximate bound on |estimated rank - true rank| / count at quantile q"""
+        return max(math.pi / self.compression * math.sqrt(q * (1 - q)), 1 / max(self.count, 1))
+
+    def as_dict(self):
+        return {'compression': self.compression, 'min': self.min, 'max': self.max,
+                'means': self.means.tolist(), 'weights': self.weights.tolist()}
+
+
+def _bit_length(values):
+    """bit_length of each uint64, exact (float64 frexp only sees 32-bit halves)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Distinct-count sketch over 64-bit hashes with 2**precision one-byte registers
+
+    The relative standard error is 1.04 / sqrt(2**precision): 0.81% for the default
+    16 KB of registers. Sketches of separate parts of the data merge by register-wise max.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def std_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self):
+        """Ertl's improved estimator: unbiased from small to large counts without bias tables"""
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2).astype(np.float64)
+        z = m * _tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return float(m * m / (2 * math.log(2)) / z) if z else 0.0
+
+
+def _sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class ReservoirSample:
+    """Uniform sample of at most `size` rows of a stream, kept as the rows with the smallest random keys
+
+    Holding the keys makes samples of separate chunks or files mergeable: the union's
+    `size` smallest keys are a uniform sample of the combined stream.
+    """
+
+    def __init__(self, size=5000, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.rows = None
+        self.seen = 0
+
+    def update(self, rows):
+        rows = np.asarray(rows)
+        keys = self.rng.random(len(rows))
+        self.seen += len(rows)
+        if self.rows is not None and len(self.keys) == self.size:
+            # Only rows that beat the current largest key can enter a full reservoir
+            candidates = keys < self.keys.max()
+            keys, rows = keys[candidates], rows[candidates]
+        self._keep(keys, rows)
+
+    def merge(self, other):
+        self.seen += other.seen
+        if other.rows is not None:
+            self._keep(other.keys, other.rows)
+
+    def _keep(self, keys, rows):
+        if self.rows is not None:
+            keys = np.concatenate([self.keys, keys])
+            rows = np.concatenate([self.rows, rows])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, rows = keys[keep], rows[keep]
+        self.keys, self.rows = keys, rows
+
+
+def correlation_intervals(values, target_index, z=1.96):
+    """Pearson r of every column with one target column, with Fisher-z confidence bounds
+
+    Returns (r, low, high) arrays; the interval has about 95% coverage for z=1.96.
+    """
+    n = len(values)
+    centered = values - values.mean(axis=0)
+    sum_squares = (centered ** 2).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (centered.T @ centered[:, target_index]) / np.sqrt(sum_squares * sum_squares[target_index])
+        fisher = np.arctanh(np.clip(r, -0.999999, 0.999999))
+    half_width = z / math.sqrt(max(n - 3, 1))
+    return r, np.tanh(fisher - half_width), np.tanh(fisher + half_width)
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset import CACHE_DIR, DATASET_PATH, TARGET_COLUMN, file_sha256, load_dataset, parse_csv
+
+STORE_PATH = os.path.join(CACHE_DIR, 'stats_store.npz')
+
+
+def corr_with_target(df, target=TARGET_COLUMN):
+    """Pearson correlation of every numeric column with `target`, without the full matrix
+
+    One centered dot product per column, O(rows x columns) instead of O(rows x columns^2).
+    The target itself is included (correlation 1.0), like `df.corr()[target]`.
+    """
+    numeric = df.select_dtypes(include=[np.number])
+    values = numeric.to_numpy(dtype=np.float64)
+    y = numeric[target].to_numpy(dtype=np.float64)
+    if np.isnan(values).any() or np.isnan(y).any():
+        # Pairwise-complete fallback, still only against the target column
+        return numeric.corrwith(numeric[target]).rename(target)
+    x_centered = values - values.mean(axis=0)
+    y_centered = y - y.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = (x_centered.T @ y_centered) / np.sqrt((x_centered ** 2).sum(axis=0) * (y_centered ** 2).sum())
+    return pd.Series(corr, index=numeric.columns, name=target)
+
+
+class TargetStatsStore:
+    """Persistent sufficient statistics of each numeric column and its co-moment with the target
+
+    Stores, per column, the pairwise-complete count, means, centered sums of squares and
+    cross-products with `target` plus min/max. Appending rows costs O(new rows) and the
+    correlations and descriptive statistics are derived without touching old data.
+    """
+
+    FIELDS = ['count', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy', 'min', 'max']
+
+    def __init__(self, columns, target=TARGET_COLUMN):
+        self.columns = list(columns)
+        self.target = target
+        m = len(self.columns)
+        self.count = np.zeros(m)
+        self.mean_x = np.zeros(m)
+        self.mean_y = np.zeros(m)
+        self.m2_x = np.zeros(m)
+        self.m2_y = np.zeros(m)
+        self.c_xy = np.zeros(m)
+        self.min = np.full(m, np.inf)
+        self.max = np.full(m, -np.inf)
+        self.sources = []
+
+    def update(self, df):
+        """Fold new rows into the statistics"""
+        x = df[self.columns].to_numpy(dtype=np.float64)
+        y = df[self.target].to_numpy(dtype=np.float64)[:, None]
+        present = ~np.isnan(x) & ~np.isnan(y)
+        count = present.sum(axis=0)
+        safe = np.maximum(count, 1)
+        x0 = np.where(present, x, 0.0)
+        y0 = np.where(present, y, 0.0)
+        mean_x = x0.sum(axis=0) / safe
+        mean_y = y0.sum(axis=0) / safe
+        dx = np.where(present, x - mean_x, 0.0)
+        dy = np.where(present, y - mean_y, 0.0)
+
+        total = self.count + count
+        weight = np.where(total > 0, count / np.maximum(total, 1), 0.0)
+        delta_x = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+        self.m2_x += (dx ** 2).sum(axis=0) + delta_x ** 2 * self.count * weight
+        self.m2_y += (dy ** 2).sum(axis=0) + delta_y ** 2 * self.count * weight
+        self.c_xy += (dx * dy).sum(axis=0) + delta_x * delta_y * self.count * weight
+        self.mean_x += delta_x * weight
+        self.mean_y += delta_y * weight
+        self.count = total
+        if len(x):
+            self.min = np.fmin(self.min, np.nanmin(np.where(present, x, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(present, x, -np.inf), axis=0))
+
+    def correlations(self):
+        """Correlation of every column with the target, like `df.corr()[target]`"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+        return pd.Series(corr, index=self.columns, name=self.target)
+
+    def describe(self):
+        """count/mean/std/min/max per column (quartiles are not incremental)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2_x / (self.count - 1))
+        return pd.DataFrame([self.count, self.mean_x, std, self.min, self.max],
+                            index=['count', 'mean', 'std', 'min', 'max'], columns=self.columns)
+
+    def save(self, path=STORE_PATH):
+        """Write the statistics and their columns/sources as one .npz, committed by a single os.replace"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        meta = json.dumps({'columns': self.columns, 'target': self.target, 'sources': self.sources})
+        np.savez(tmp_path, meta=np.array(meta), **{field: getattr(self, field) for field in self.FIELDS})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with np.load(path) as arrays:
+            meta = json.loads(str(arrays['meta']))
+            store = cls(meta['columns'], meta['target'])
+            store.sources = meta['sources']
+            for field in cls.FIELDS:
+                setattr(store, field, arrays[field].astype(np.float64))
+        return store
+
+    def append_csv(self, csv_path):
+        """Add the rows of a CSV once; re-appending the same file content is a no-op"""
+        sha256 = file_sha256(csv_path)
+        if sha256 in (source['sha256'] for source in self.sources):
+            print(f"'{csv_path}' is already included in the statistics store")
+            return False
+        df = parse_csv(csv_path)
+        self.update(df)
+        self.sources.append({'path': csv_path, 'sha256': sha256, 'rows': len(df)})
+        print(f"Added {len(df):,} rows from '{csv_path}'")
+        return True
+
+
+def build_store(csv_path=DATASET_PATH):
+    """Create a store from the base dataset"""
+    df = load_dataset(csv_path)
+    store = TargetStatsStore(df.select_dtypes(include=[np.number]).columns)
+    store.update(df)
+    store.sources.append({'path': csv_path, 'sha256': file_sha256(csv_path), 'rows': len(df)})
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental summary statistics and correlations with shares")
+    parser.add_argument('command', choices=['build', 'append', 'show'])
+    parser.add_argument('csv', nargs='?', default=DATASET_PATH, help="dataset (build) or new article rows (append)")
+    parser.add_argument('--store', default=STORE_PATH, help="statistics store file")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        store = build_store(args.csv)
+        store.save(args.store)
+        print(f"Statistics store built from '{args.csv}' and saved to '{args.store}'")
+    elif args.command == 'append':
+        store = TargetStatsStore.load(args.store)
+        if store.append_csv(args.csv):
+            store.save(args.store)
+
+    store = TargetStatsStore.load(args.store)
+    total_rows = sum(source['rows'] for source in store.sources)
+    print(f"\nRows in store: {total_rows:,} from {len(store.sources)} file(s)")
+    print("\nTop 10 features most correlated with shares:")
+    print(store.correlations().sort_values(ascending=False).head(11))
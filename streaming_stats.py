@@ -0,0 +1,277 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from dataset import CHANNELS, CHANNEL_COLUMNS, DATASET_PATH, POPULARITY_THRESHOLD, WEEKDAYS, WEEKDAY_COLUMNS, iter_csv_chunks
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch (KLL-style compactors) with memory bounded by `k` per level
+
+    Values are exact until more than `k` have been seen; after that each full level is
+    sorted and every other value is promoted to the next level with twice the weight.
+    """
+
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # Keep one value back when the count is odd so weights stay exact
+                keep = level[-1:] if len(level) % 2 else level[:0]
+                pairs = level[:len(level) - len(keep)]
+                promoted = pairs[self.rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1
+
+    def quantile(self, q):
+        """Approximate q-quantile; exact (linear interpolation) while nothing was compacted"""
+        if self.exact:
+            return float(np.quantile(self.levels[0], q)) if len(self.levels[0]) else np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values)
+        values, cumulative = values[order], np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[min(position, len(values) - 1)])
+
+
+class StreamingStats:
+    """Mergeable per-column statistics accumulated chunk by chunk
+
+    Means and variances are combined with Welford/Chan updates, correlations come from
+    co-moment sums over complete rows, and quartiles from one QuantileSketch per column.
+    """
+
+    def __init__(self, columns, sketch_k=4096):
+        self.columns = list(columns)
+        m = len(self.columns)
+        self.rows = 0
+        self.count = np.zeros(m)
+        self.mean = np.zeros(m)
+        self.m2 = np.zeros(m)
+        self.min = np.full(m, np.inf)
+        self.max = np.full(m, -np.inf)
+        self.co_count = 0
+        self.co_mean = np.zeros(m)
+        self.co_moment = np.zeros((m, m))
+        self.missing = None
+        self.sketches = [QuantileSketch(sketch_k) for _ in self.columns]
+
+    def update(self, chunk):
+        """Fold one DataFrame chunk into the accumulators"""
+        missing = chunk.isnull().sum()
+        self.missing = missing if self.missing is None else self.missing.add(missing, fill_value=0)
+        self.rows += len(chunk)
+
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        count = present.sum(axis=0)
+        with np.errstate(invalid='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self._merge_moments(count, mean, m2)
+        if values.size:
+            self.min = np.fmin(self.min, np.nanmin(np.where(present, values, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(present, values, -np.inf), axis=0))
+
+        complete = values[present.all(axis=1)]
+        if len(complete):
+            co_mean = complete.mean(axis=0)
+            centered = complete - co_mean
+            self._merge_co_moments(len(complete), co_mean, centered.T @ centered)
+
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(values[:, i])
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - self.mean
+            weight = np.where(total > 0, count / np.maximum(total, 1), 0.0)
+            self.mean = self.mean + delta * weight
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = total
+
+    def _merge_co_moments(self, count, mean, co_moment):
+        total = self.co_count + count
+        delta = mean - self.co_mean
+        self.co_moment = self.co_moment + co_moment + np.outer(delta, delta) * self.co_count * count / total
+        self.co_mean = self.co_mean + delta * count / total
+        self.co_count = total
+
+    def merge(self, other):
+        """Combine with accumulators built over another part of the data"""
+        self.rows += other.rows
+        if other.missing is not None:
+            self.missing = other.missing if self.missing is None else self.missing.add(other.missing, fill_value=0)
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        if other.co_count:
+            self._merge_co_moments(other.co_count, other.co_mean, other.co_moment)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+
+    @property
+    def std(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def describe(self):
+        """Same layout as DataFrame.describe()"""
+        quartiles = np.array([[s.quantile(q) for s in self.sketches] for q in (0.25, 0.5, 0.75)])
+        return pd.DataFrame(
+            [self.count, self.mean, self.std, self.min, *quartiles, self.max],
+            index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+            columns=self.columns,
+        )
+
+    def correlation(self):
+        """Pearson correlation matrix from the accumulated co-moments"""
+        scale = np.sqrt(np.diag(self.co_moment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.co_moment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    @property
+    def exact_quantiles(self):
+        return all(sketch.exact for sketch in self.sketches)
+
+
+def compute_streaming_stats(csv_path=DATASET_PATH, chunksize=50000, processed_path=None):
+    """Run one chunked pass over the CSV; returns (stats, first chunk head, dtypes)
+
+    When `processed_path` is given the cleaned chunks are streamed to it as well.
+    """
+    stats = None
+    head = dtypes = None
+    for i, chunk in enumerate(iter_csv_chunks(csv_path, chunksize)):
+        if stats is None:
+            stats = StreamingStats(chunk.select_dtypes(include=[np.number]).columns)
+            head, dtypes = chunk.head(), chunk.dtypes
+        stats.update(chunk)
+        if processed_path is not None:
+            chunk.to_csv(processed_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    return stats, head, dtypes
+
+
+def print_report(stats, head, dtypes):
+    """Print the read_csv_data.py report from accumulated statistics"""
+    index = {column: i for i, column in enumerate(stats.columns)}
+    n_rows = stats.rows
+    quantile_note = "" if stats.exact_quantiles else " (quartiles approximate)"
+
+    print("\n" + "="*50)
+    print("DATASET OVERVIEW")
+    print("="*50)
+    print(f"Dataset shape: ({n_rows}, {len(dtypes)})")
+    print(f"Number of rows: {n_rows:,}")
+    print(f"Number of columns: {len(dtypes)}")
+
+    print("\n" + "="*50)
+    print("COLUMN NAMES")
+    print("="*50)
+    for i, col in enumerate(dtypes.index):
+        print(f"{i:2d}. {col}")
+
+    print("\n" + "="*50)
+    print("FIRST 5 ROWS")
+    print("="*50)
+    print(head)
+
+    print("\n" + "="*50)
+    print("DATA TYPES")
+    print("="*50)
+    print(dtypes)
+
+    description = stats.describe()
+    print("\n" + "="*50)
+    print("BASIC STATISTICS" + quantile_note)
+    print("="*50)
+    print(description)
+
+    print("\n" + "="*50)
+    print("MISSING VALUES")
+    print("="*50)
+    if stats.missing.sum() == 0:
+        print("No missing values found in the dataset!")
+    else:
+        print(stats.missing[stats.missing > 0])
+
+    print("\n" + "="*50)
+    print("TARGET VARIABLE ANALYSIS (shares)" + quantile_note)
+    print("="*50)
+    print(description['shares'])
+
+    print("\n" + "="*50)
+    print("DATA CHANNEL DISTRIBUTION")
+    print("="*50)
+    for channel, col in zip(CHANNELS, CHANNEL_COLUMNS):
+        count = stats.mean[index[col]] * stats.count[index[col]]
+        print(f"{channel.title()}: {count:,.0f} articles ({count / n_rows * 100:.1f}%)")
+
+    print("\n" + "="*50)
+    print("WEEKDAY DISTRIBUTION")
+    print("="*50)
+    for day, col in zip(WEEKDAYS, WEEKDAY_COLUMNS):
+        count = stats.mean[index[col]] * stats.count[index[col]]
+        print(f"{day.title()}: {count:,.0f} articles ({count / n_rows * 100:.1f}%)")
+
+    print("\n" + "="*50)
+    print("CORRELATION WITH TARGET VARIABLE")
+    print("="*50)
+    correlations = stats.correlation()['shares'].sort_values(ascending=False)
+    print("Top 10 features most correlated with shares:")
+    print(correlations.head(11))  # 11 to include shares itself
+    print("\nBottom 10 features least correlated with shares:")
+    print(correlations.tail(10))
+
+    print("\n" + "="*50)
+    print("SUMMARY")
+    print("="*50)
+    print(f"• Dataset contains {n_rows:,} news articles from Mashable")
+    print(f"• {len(dtypes)} features including the target variable 'shares'")
+    print(f"• Articles published between {description['timedelta']['min']:.0f} and {description['timedelta']['max']:.0f} days before dataset acquisition")
+    print(f"• Target variable 'shares' ranges from {description['shares']['min']:.0f} to {description['shares']['max']:.0f}")
+    print(f"• Popularity threshold: {POPULARITY_THRESHOLD:,} shares")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked read_csv_data.py report for datasets larger than memory")
+    parser.add_argument('--csv', default=DATASET_PATH, help="dataset CSV")
+    parser.add_argument('--chunksize', type=int, default=50000, help="rows per chunk")
+    parser.add_argument('--processed-output', default=None,
+                        help="also stream the cleaned rows to this CSV (e.g. processed_news_data.csv)")
+    args = parser.parse_args()
+
+    print(f"Reading '{args.csv}' in chunks of {args.chunksize:,} rows...")
+    stats, head, dtypes = compute_streaming_stats(args.csv, args.chunksize, args.processed_output)
+    print_report(stats, head, dtypes)
@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+# The modules live at the top level of the repository
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+SAMPLE_ROWS = 3000
+
+
+def write_sample_csv(path, n_rows=SAMPLE_ROWS, seed=7, missing=True):
+    """A CSV in the OnlineNewsPopularity.csv layout (synthetic rows), optionally with missing values"""
+    from benchmark_suite import column_summary, synthetic_chunk
+
+    columns, summary = column_summary(os.path.join(REPO_DIR, 'OnlineNewsPopularity.names'))
+    df = synthetic_chunk(columns, summary, 0, n_rows, np.random.default_rng(seed))
+    if missing:
+        rng = np.random.default_rng(seed + 1)
+        for name in ('avg_positive_polarity', 'global_subjectivity', 'kw_avg_avg'):
+            df.loc[rng.choice(n_rows, n_rows // 75, replace=False), name] = np.nan
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(', '.join(columns) + '\n')  # the original header has a space after each comma
+        df.to_csv(f, header=False, index=False, float_format='%.6g')
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def sample_csv(tmp_path_factory):
+    return write_sample_csv(tmp_path_factory.mktemp('data') / 'sample.csv')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /article/<n> as a small HTML page with an ETag
+
+    Paths in `server.flaky` answer 503 the first time they are requested; every
+    request is recorded in `server.hits` as (arrival time, path, status).
+    """
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.delay)
+        etag = f'"{self.path}"'
+        with server.lock:
+            first = self.path not in server.seen
+            server.seen.add(self.path)
+        if first and self.path in server.flaky:
+            status = 503
+        elif self.headers.get('If-None-Match') == etag:
+            status = 304
+        else:
+            status = 200
+        with server.lock:
+            server.hits.append((time.monotonic(), self.path, status))
+        body = (f"<html><head><title>Article {self.path}</title></head><body><article><p>"
+                + "word " * 50 + "</p></article></body></html>").encode()
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        if status == 200:
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.delay = 0.0
+    server.flaky = set()
+    server.seen = set()
+    server.hits = []
+    server.lock = threading.Lock()
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
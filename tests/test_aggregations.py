@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from aggregations import compute_aggregates, decode_one_hot
+from dataset import CHANNELS, CHANNEL_COLUMNS, POPULARITY_THRESHOLD, WEEKDAYS, WEEKDAY_COLUMNS, parse_csv
+
+
+@pytest.fixture(scope='module')
+def sample(sample_csv):
+    return parse_csv(sample_csv)
+
+
+def test_decode_one_hot_marks_rows_without_a_flag(sample):
+    codes = decode_one_hot(sample, CHANNEL_COLUMNS)
+    for i, column in enumerate(CHANNEL_COLUMNS):
+        np.testing.assert_array_equal(codes == i, sample[column].to_numpy() == 1)
+    assert (codes == len(CHANNELS)).sum() == (sample[CHANNEL_COLUMNS].sum(axis=1) == 0).sum()
+
+
+@pytest.mark.parametrize('names, columns, group', [(CHANNELS, CHANNEL_COLUMNS, 'channels'),
+                                                   (WEEKDAYS, WEEKDAY_COLUMNS, 'weekdays')])
+def test_group_stats_match_per_column_filtering(sample, names, columns, group):
+    aggregates = compute_aggregates(sample)
+    stats = getattr(aggregates, group)
+    groups = list(stats.shares_by_group())
+    for i, column in enumerate(columns):
+        shares = sample.loc[sample[column] == 1, 'shares']
+        assert stats.counts[i] == len(shares)
+        assert stats.mean_shares[i] == pytest.approx(shares.mean())
+        assert stats.popular_counts[i] == (shares >= POPULARITY_THRESHOLD).sum()
+        assert stats.popular_rates[i] == pytest.approx((shares >= POPULARITY_THRESHOLD).mean() * 100)
+        assert stats.percentages[i] == pytest.approx(len(shares) / len(sample) * 100)
+        np.testing.assert_array_equal(groups[i], np.sort(shares.to_numpy(dtype=np.float64)))
+    assert aggregates.n_articles == len(sample)
+    assert aggregates.n_popular == (sample['shares'] >= POPULARITY_THRESHOLD).sum()
+
+
+def test_empty_frame(sample):
+    aggregates = compute_aggregates(sample.iloc[:0])
+    assert aggregates.n_articles == 0
+    assert aggregates.channels.counts.sum() == 0
+    assert np.isnan(aggregates.weekdays.mean_shares).all()
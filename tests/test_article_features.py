@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from article_features import FEATURE_COLUMNS, KEYWORD_COLUMNS, extract_features, extract_features_batch
+from dataset import column_dtype
+
+URL = "http://mashable.com/2014/01/04/article/"
+PAGE = """<html><head><title>Great news</title>
+<meta name="keywords" content="apple, phones ,,launch">
+<meta property="article:section" content="Technology">
+<meta property="article:published_time" content="2014-01-04T10:00:00Z">
+</head><body>
+<nav><a href="/2014/01/03/other/">Other</a> <a href="#top">Top</a> <a href="mailto:news@example.com">Mail</a></nav>
+<article>The good dog <script>var awful = 1;</script>is not bad
+<img src="a.jpg"><img src="b.jpg"><iframe src="https://www.youtube.com/embed/x"></iframe>
+<iframe src="https://maps.example.com/"></iframe>
+<a href="http://www.mashable.com/tech/">Tech</a> <a href="http://notmashable.com/x">Elsewhere</a></article>
+</body></html>"""
+
+
+def test_features_of_one_page():
+    features = extract_features(URL, PAGE)
+    expected = {
+        'n_tokens_title': 2, 'n_tokens_content': 8, 'num_hrefs': 3, 'num_self_hrefs': 2, 'num_imgs': 2,
+        'num_videos': 1, 'num_keywords': 3, 'data_channel_is_tech': 1, 'data_channel_is_world': 0,
+        'weekday_is_saturday': 1, 'weekday_is_monday': 0, 'is_weekend': 1,
+        # the good dog is not bad tech elsewhere: the, is, not are stop words
+        'n_unique_tokens': 1.0, 'n_non_stop_words': 5 / 8, 'n_non_stop_unique_tokens': 1.0,
+        'average_token_length': (3 + 4 + 3 + 2 + 3 + 3 + 4 + 9) / 8,
+        'global_subjectivity': (0.6 + 0.67) / 2, 'global_sentiment_polarity': 0.0,
+        'global_rate_positive_words': 1 / 8, 'global_rate_negative_words': 1 / 8,
+        'rate_positive_words': 0.5, 'avg_positive_polarity': 0.7, 'min_negative_polarity': -0.7,
+        'title_subjectivity': 0.75, 'title_sentiment_polarity': 0.8, 'abs_title_subjectivity': 0.25,
+    }
+    assert {name: features[name] for name in expected} == pytest.approx(expected)
+    assert all(np.isnan(features[name]) for name in KEYWORD_COLUMNS)
+
+
+def test_batch_equals_pages_one_at_a_time():
+    pages = [(URL, PAGE), ("http://example.com/a", "<html><body><p>Sad and boring news</p></body></html>"),
+             ("http://example.com/empty", "")]
+    batch = extract_features_batch(pages)
+    assert list(batch.columns) == ['url'] + FEATURE_COLUMNS
+    assert all(batch[c].dtype == column_dtype(c) for c in FEATURE_COLUMNS)
+    for i, (url, html) in enumerate(pages):
+        single = pd.Series(extract_features(url, html))
+        pd.testing.assert_series_equal(batch.iloc[i], single, check_names=False)
+
+
+def test_self_hosts_match_on_domain_boundaries():
+    hrefs = ("http://mashable.com/a", "https://m.mashable.com/b", "http://evilmashable.com/c",
+             "http://mashable.com.evil.org/d")
+    links = ''.join(f'<a href="{href}">x</a>' for href in hrefs)
+    features = extract_features("http://example.com/", f"<html><body>{links}</body></html>")
+    assert (features['num_hrefs'], features['num_self_hrefs']) == (4, 2)
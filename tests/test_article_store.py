@@ -0,0 +1,50 @@
+import json
+import random
+
+import pytest
+
+from article_store import BLOCK_RECORDS, ArticleStore, available_codecs, pack
+
+N_RECORDS = 3 * BLOCK_RECORDS + 5
+
+
+def crawl_records():
+    """Records in completion order; every third article repeats an earlier text with different spacing"""
+    indices = list(range(0, 2 * N_RECORDS, 2))
+    random.Random(3).shuffle(indices)
+    records = []
+    for n, idx in enumerate(indices):
+        text = f"Article {n // 3} body: " + "lorem ipsum " * (n // 3 % 7 + 1)
+        if n % 3:
+            text = "  " + text.replace(" ", "\n ")
+        records.append({'original_index': idx, 'url': f"http://site{idx % 4}.com/a/{idx}",
+                        'domain': f"site{idx % 4}.com", 'shares': idx * 10, 'title': f"Title {idx}",
+                        'content': text, 'status': 'success' if idx % 5 else 'error: 404 Client Error',
+                        'word_count': len(text.split())})
+    return records
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+def test_pack_round_trip_and_dedupe(tmp_path, codec):
+    records = crawl_records()
+    source = tmp_path / 'crawl.jsonl'
+    source.write_text(''.join(json.dumps(r) + "\n" for r in records))
+    manifest = pack(str(source), str(tmp_path / 'store'), codec)
+
+    distinct = {' '.join(r['content'].split()) for r in records}
+    assert manifest['records'] == N_RECORDS
+    assert manifest['unique_texts'] == len(distinct) < N_RECORDS
+
+    store = ArticleStore(str(tmp_path / 'store'))
+    assert len(store) == N_RECORDS
+    for record in records:
+        got = store.get(record['original_index'])
+        assert ' '.join(got.pop('content').split()) == ' '.join(record['content'].split())
+        assert got == {k: v for k, v in record.items() if k != 'content'}
+    assert [r['original_index'] for r in store] == [r['original_index'] for r in records]
+
+    assert set(store.get(records[0]['original_index'], fields={'url'})) == {
+        'original_index', 'url', 'title', 'domain', 'shares', 'status', 'word_count'}
+    assert 1 not in store
+    with pytest.raises(KeyError):
+        store.get(1)
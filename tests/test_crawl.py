@@ -0,0 +1,21 @@
+from crawl import CrawlCheckpoint, repair_jsonl
+
+
+def test_checkpoint_drops_a_torn_last_line(tmp_path):
+    path = tmp_path / 'crawl.checkpoint'
+    path.write_text("7\n12345\n123")  # the crash interrupted "12399\n"
+    checkpoint = CrawlCheckpoint(str(path))
+    assert checkpoint.count == 2
+    assert 7 in checkpoint and 12345 in checkpoint and 123 not in checkpoint
+    checkpoint.mark(12399)
+    checkpoint.close()
+    assert path.read_text() == "7\n12345\n12399\n"
+
+
+def test_repair_jsonl_keeps_complete_lines(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    path.write_bytes(b'{"a": 1}\n{"b": 2}\n{"c"')
+    repair_jsonl(str(path))
+    assert path.read_bytes() == b'{"a": 1}\n{"b": 2}\n'
+    repair_jsonl(str(path))
+    assert path.read_bytes() == b'{"a": 1}\n{"b": 2}\n'
@@ -0,0 +1,90 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+import crawl_coordinator
+from crawl_coordinator import CrawlQueue, PENDING, DONE
+
+SCRIPT = os.path.abspath(crawl_coordinator.__file__)
+
+
+def write_dataset(path, stub_server, n_urls):
+    urls = [stub_server.url(f"/article/{i}") for i in range(n_urls)]
+    pd.DataFrame({'url': urls, ' shares': range(n_urls)}).to_csv(path, index=False)
+
+
+def record(idx, status, error_class='success'):
+    return {'original_index': idx, 'url': f"http://example.com/{idx}", 'domain': 'example.com', 'shares': idx,
+            'title': '', 'content_preview': '', 'status': status, 'error_class': error_class, 'transient': False,
+            'word_count': 0}
+
+
+def test_transient_failures_are_retried_not_stored(tmp_path, stub_server):
+    write_dataset(tmp_path / 'news.csv', stub_server, 4)
+    queue = CrawlQueue(str(tmp_path / 'queue.sqlite'))
+    queue.load_csv(tmp_path / 'news.csv', shard_size=4)
+
+    lease = queue.lease('worker-a')
+    results = [record(0, 'success'), record(1, 'error: 404 Client Error', 'http_4xx')]
+    assert queue.report(lease, results, done=True, retry_after=0)
+    # URLs 2 and 3 failed transiently: no result, and the shard is pending again for just them
+    assert queue.status()['shards'][PENDING] == 1
+    lease = queue.lease('worker-b')
+    assert [idx for idx, _, _ in queue.pending_urls(lease)] == [2, 3]
+    assert queue.report(lease, [record(2, 'success'), record(3, 'success')], done=True)
+    assert queue.status()['shards'][DONE] == 1
+    assert queue.status()['results'] == 4
+    queue.close()
+
+
+def test_killed_worker_loses_no_urls(tmp_path, stub_server):
+    n_urls = 60
+    rate_per_host = 15.0
+    stub_server.delay = 0.02
+    stub_server.flaky = {f"/article/{i}" for i in range(3, n_urls, 7)}
+    csv_path, queue_path = tmp_path / 'news.csv', str(tmp_path / 'queue.sqlite')
+    write_dataset(csv_path, stub_server, n_urls)
+    subprocess.run([sys.executable, SCRIPT, '--queue', queue_path, 'init', '--csv', str(csv_path),
+                    '--shard-size', '10'], check=True, capture_output=True)
+
+    worker = [sys.executable, SCRIPT, '--queue', queue_path, 'worker', '--workers', '2',
+              '--rate-per-host', str(rate_per_host), '--lease-timeout', '2', '--max-attempts', '1',
+              '--breaker-reset', '0.5', '--poll-interval', '0.2', '--no-cache']
+    processes = [subprocess.Popen(worker, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(3)]
+    victim = processes[0]
+    queue = CrawlQueue(queue_path)
+    try:
+        # Kill the first worker once it holds a lease and results are coming in
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            status = queue.status()
+            if status['results'] and any(lease['worker'].endswith(f":{victim.pid}") for lease in status['leases']):
+                break
+            time.sleep(0.02)
+        else:
+            raise AssertionError("the worker never leased a shard")
+        victim.send_signal(signal.SIGKILL)
+        for process in processes[1:]:
+            assert process.wait(timeout=120) == 0
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+        queue.close()
+
+    output = tmp_path / 'export.jsonl'
+    subprocess.run([sys.executable, SCRIPT, '--queue', queue_path, 'export', '--output', str(output)],
+                   check=True, capture_output=True)
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r['original_index'] for r in records) == list(range(n_urls))
+    assert all(r['status'] == 'success' for r in records)
+
+    # One budget for all workers: requests to the stub never ran faster than the shared rate
+    arrivals = sorted(hit[0] for hit in stub_server.hits)
+    assert len(arrivals) >= n_urls + len(stub_server.flaky)
+    assert (arrivals[-1] - arrivals[0]) >= 0.9 * (len(arrivals) - 1) / rate_per_host
@@ -0,0 +1,39 @@
+import os
+import time
+
+import pytest
+
+from aggregations import compute_aggregates
+from dashboard import prepare_panels, render_dashboard
+from dataset import parse_csv
+
+
+@pytest.fixture(scope='module')
+def panels(sample_csv):
+    df = parse_csv(sample_csv)
+    return prepare_panels(df, compute_aggregates(df))
+
+
+def test_render_reuses_cached_panels_and_prunes_only_stale_ones(tmp_path, panels, capsys):
+    cache_dir = tmp_path / 'panels'
+    output = str(tmp_path / 'dashboard.png')
+    render_dashboard(panels, output, dpi=20, cache_dir=str(cache_dir), max_workers=1)
+    cached = sorted(os.listdir(cache_dir))
+    assert len(cached) == len(panels) + 1 and os.path.exists(output)
+
+    name = next(iter(panels))
+    stale = cache_dir / f"{name}-stale.png"
+    in_use = cache_dir / f"{name}-other-dpi.png"
+    unrelated = cache_dir / "notes.png"
+    for path in (stale, in_use, unrelated):
+        path.write_bytes(b'')
+    old = time.time() - 8 * 24 * 3600
+    os.utime(stale, (old, old))
+
+    capsys.readouterr()
+    render_dashboard(panels, output, dpi=20, cache_dir=str(cache_dir), max_workers=1)
+    assert "Dashboard: 0 panel(s) rendered" in capsys.readouterr().out
+    remaining = set(os.listdir(cache_dir))
+    assert set(cached) <= remaining
+    assert in_use.name in remaining and unrelated.name in remaining
+    assert stale.name not in remaining
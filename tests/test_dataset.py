@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataset
+from conftest import write_sample_csv
+from dataset import column_dtype, load_dataset, parse_csv, predictive_features
+
+
+def count_parses(monkeypatch):
+    calls = []
+    original = dataset.parse_csv
+    monkeypatch.setattr(dataset, 'parse_csv', lambda *a, **k: calls.append(a) or original(*a, **k))
+    return calls
+
+
+def assert_same_dataset(left, right):
+    # url may come back as object or string dtype depending on the pandas version and cache format
+    assert left['url'].tolist() == right['url'].tolist()
+    pd.testing.assert_frame_equal(left.drop(columns='url'), right.drop(columns='url'))
+
+
+def test_typed_parse_keeps_values_of_plain_read_csv(sample_csv):
+    df = parse_csv(sample_csv)
+    plain = pd.read_csv(sample_csv)
+    plain.columns = plain.columns.str.strip()
+
+    assert df['is_weekend'].dtype == np.uint8 and df['shares'].dtype == np.int32
+    assert df['kw_avg_avg'].dtype == np.float64
+    assert all(df[c].dtype == column_dtype(c) for c in df.columns if c != 'url')
+    assert df['url'].tolist() == plain['url'].tolist()
+    pd.testing.assert_frame_equal(df.drop(columns='url'), plain.drop(columns='url'), check_dtype=False)
+    assert len(predictive_features(df.columns)) == 58
+
+
+def test_cache_is_reused_and_invalidated(tmp_path, monkeypatch):
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=200, missing=False)
+    cache_dir = str(tmp_path / 'cache')
+    parses = count_parses(monkeypatch)
+
+    first = load_dataset(csv_path, cache_dir)
+    assert_same_dataset(load_dataset(csv_path, cache_dir), first)
+    assert len(parses) == 1
+
+    # A new mtime with the same content only refreshes the metadata
+    os.utime(csv_path, (1, 1))
+    assert_same_dataset(load_dataset(csv_path, cache_dir), first)
+    assert len(parses) == 1
+
+    # Changed content rebuilds the cache
+    write_sample_csv(csv_path, n_rows=150, missing=False)
+    assert len(load_dataset(csv_path, cache_dir)) == 150
+    assert len(parses) == 2
+
+
+def test_column_subset(tmp_path):
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=50, missing=False)
+    cache_dir = str(tmp_path / 'cache')
+    load_dataset(csv_path, cache_dir)
+    subset = load_dataset(csv_path, cache_dir, columns=['shares', 'timedelta'])
+    assert list(subset.columns) == ['shares', 'timedelta'] and len(subset) == 50
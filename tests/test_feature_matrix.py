@@ -0,0 +1,33 @@
+import numpy as np
+
+from conftest import write_sample_csv
+from dataset import TARGET_COLUMN, parse_csv, predictive_features
+from feature_matrix import ensure_feature_matrix, export_feature_matrix, load_feature_matrix, split_features_target
+
+
+def test_export_round_trips_through_a_read_only_memmap(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dataset cache goes to ./.dataset_cache
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=300, missing=False)
+    matrix_path = str(tmp_path / 'features.npy')
+    export_feature_matrix(csv_path, matrix_path)
+    matrix, meta = load_feature_matrix(matrix_path)
+
+    df = parse_csv(csv_path)
+    assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert matrix.dtype == np.float32 and matrix.shape == (300, 59)
+    assert meta['feature_columns'] == predictive_features(df.columns)
+    np.testing.assert_array_equal(matrix, df[meta['columns']].to_numpy(dtype=np.float32))
+
+    X, y = split_features_target(matrix, meta)
+    assert X.shape == (300, 58) and np.shares_memory(X, matrix) and np.shares_memory(y, matrix)
+    np.testing.assert_array_equal(y, df[TARGET_COLUMN].to_numpy(dtype=np.float32))
+
+
+def test_stale_matrix_is_re_exported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=100, missing=False)
+    matrix_path = str(tmp_path / 'features.npy')
+    assert ensure_feature_matrix(csv_path, matrix_path)[0].shape[0] == 100
+    write_sample_csv(csv_path, n_rows=80, missing=False)
+    assert ensure_feature_matrix(csv_path, matrix_path)[0].shape[0] == 80
+
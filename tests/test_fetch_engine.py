@@ -0,0 +1,54 @@
+import threading
+
+from fetch_engine import fetch_urls_concurrently, iter_fetch_concurrently
+
+
+def test_results_keep_input_order(stub_server):
+    urls = [stub_server.url(f"/article/{i}") for i in range(10)]
+    results, stats = fetch_urls_concurrently(urls, lambda url, session: session.get(url).text, max_workers=4,
+                                             rate_per_host=0)
+    assert [f"Article /article/{i}<" in text for i, text in enumerate(results)] == [True] * 10
+    assert stats['urls'] == 10
+
+
+def test_in_flight_window_is_bounded():
+    lock = threading.Lock()
+    in_flight = []
+    peak = [0]
+
+    def fetch(url, session):
+        with lock:
+            in_flight.append(url)
+            peak[0] = max(peak[0], len(in_flight))
+        threading.Event().wait(0.01)
+        with lock:
+            in_flight.remove(url)
+        return url
+
+    consumed = []
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i, f"http://example.com/{i}"
+
+    completed = iter_fetch_concurrently(items(), fetch, max_workers=3, rate_per_host=0, max_in_flight=5)
+    first = next(completed)
+    assert len(consumed) <= 6  # the lazy input is only read ahead by the window
+    assert len(list(completed)) + 1 == 50
+    assert first[1] == first[2] and peak[0] <= 3
+
+
+def test_rate_limit_is_per_host(stub_server):
+    rate_per_host = 10.0
+    port = stub_server.server_address[1]
+    urls = [f"http://{host}:{port}/article/{i}" for host in ('127.0.0.1', 'localhost') for i in range(6)]
+    list(iter_fetch_concurrently(enumerate(urls), lambda url, session: session.get(url).status_code,
+                                 max_workers=8, rate_per_host=rate_per_host))
+
+    arrivals = sorted(hit[0] for hit in stub_server.hits)
+    assert len(arrivals) == 12
+    # Each host's six requests need five refill intervals...
+    assert arrivals[-1] - arrivals[0] >= 0.9 * 5 / rate_per_host
+    # ...but the two hosts do not wait for each other (one shared bucket would take 1.1s)
+    assert arrivals[-1] - arrivals[0] < 11 / rate_per_host
@@ -0,0 +1,35 @@
+import pytest
+import requests
+
+from fetch_url_content import build_url_record, download_article, error_class, fetch_article_content, is_transient
+from retry_policy import CircuitOpenError, RetryPolicy
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+@pytest.mark.parametrize('error, name, transient', [
+    (http_error(404), 'http_4xx', False), (http_error(429), 'rate_limited', True),
+    (http_error(503), 'rate_limited', True), (http_error(500), 'http_5xx', True),
+    (requests.ConnectTimeout(), 'timeout', True), (requests.ConnectionError(), 'connection', True),
+    (CircuitOpenError("circuit open for example.com"), 'circuit_open', True), (ValueError(), 'other', False),
+])
+def test_failures_are_classified_from_the_exception(error, name, transient):
+    assert error_class(error) == name
+    assert is_transient(error) is transient
+
+
+def test_records_carry_the_failure_class(stub_server):
+    stub_server.flaky = {"/article/1"}
+    url = stub_server.url("/article/1")
+    download = download_article(url, policy=RetryPolicy(max_attempts=1))
+    assert download['content'] is None
+    assert (download['error_class'], download['transient']) == ('rate_limited', True)
+
+    content_data = fetch_article_content(url, policy=RetryPolicy(max_attempts=1))
+    record = build_url_record(1, url, 10, content_data)
+    assert (record['status'], record['error_class'], record['transient']) == ('success', 'success', False)
+    assert record['word_count'] > 0
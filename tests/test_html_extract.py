@@ -0,0 +1,41 @@
+import pytest
+
+from html_extract import EXTRACTORS, PREVIEW_CHARS, extract_article
+
+PAGE = """<html><head><title>Site title</title></head><body>
+<nav>Home | World | Tech</nav>
+<h1>  Headline of the story </h1>
+<div class="sidebar">Related links</div>
+<article><p>First   paragraph.</p>
+<p>Second paragraph &amp; more.</p></article>
+</body></html>"""
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_backends_agree_on_title_and_content(backend):
+    article = extract_article(PAGE, backend)
+    assert article == {'title': 'Site title', 'content_preview': 'First paragraph. Second paragraph & more.',
+                       'word_count': 6}
+    assert extract_article(PAGE.encode(), backend) == article
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_class_selector_and_body_fallback(backend):
+    by_class = "<html><body><h1>T</h1><div class='post-content wide'>Kept text</div><p>other</p></body></html>"
+    assert extract_article(by_class, backend)['content_preview'] == 'Kept text'
+    no_selector = "<html><body><p>Only   body text</p></body></html>"
+    assert extract_article(no_selector, backend) == {'title': '', 'content_preview': 'Only body text',
+                                                     'word_count': 3}
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_preview_is_truncated(backend):
+    page = f"<html><body><article><p>{'word ' * 1000}</p></article></body></html>"
+    article = extract_article(page, backend)
+    assert len(article['content_preview']) == PREVIEW_CHARS
+    assert article['word_count'] == 400
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='unknown extractor'):
+        extract_article(PAGE, 'regex')
@@ -0,0 +1,63 @@
+import os
+
+import requests
+
+from fetch_engine import iter_fetch_concurrently
+from http_cache import ResponseCache, cached_get
+
+
+def cached_fetch(cache):
+    return lambda url, session: cached_get(session, url, cache, {})
+
+
+def fetch_all(urls, fetch_fn, **kwargs):
+    return {url: result for _, url, result in iter_fetch_concurrently(enumerate(urls), fetch_fn, **kwargs)}
+
+
+def test_second_crawl_revalidates_with_304(tmp_path, stub_server):
+    urls = [stub_server.url(f"/article/{i}") for i in range(6)]
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    first = fetch_all(urls, cached_fetch(cache), rate_per_host=0)
+    second = fetch_all(urls, cached_fetch(cache), rate_per_host=0)
+
+    assert second == first
+    assert all(b'Article /article/' in body for body in first.values())
+    assert [status for _, _, status in stub_server.hits] == [200] * 6 + [304] * 6
+    assert cache.stats()['misses'] == 6
+    assert cache.stats()['revalidations'] == 6
+
+
+def test_fresh_entries_are_served_without_a_request(tmp_path, stub_server):
+    url = stub_server.url("/article/1")
+    cache = ResponseCache(str(tmp_path / 'cache'), max_age=3600)
+    fetch_all([url, url], cached_fetch(cache), max_workers=1, rate_per_host=0)
+    assert len(stub_server.hits) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_eviction_drops_least_recently_used_down_to_low_water(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cache = ResponseCache(cache_dir, max_bytes=300, low_water=0.9)
+    for name in 'abc':
+        cache.store(f"http://example.com/{name}", b'x' * 100, {})
+    assert cache.read("http://example.com/a") == b'x' * 100  # a is now the most recently used
+    cache.store("http://example.com/d", b'x' * 100, {})
+
+    # Over budget: b then c go, until the cache is under 270 bytes
+    cached = [name for name in 'abcd' if cache.lookup(f"http://example.com/{name}") is not None]
+    assert cached == ['a', 'd']
+    assert cache.stats()['evictions'] == 2
+    assert cache.total_bytes == 200
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(cache._path(f"http://example.com/{name}", suffix))
+                                                   for name in 'ad' for suffix in ('.body', '.json'))
+    # A new process picks the index up from disk
+    assert ResponseCache(cache_dir, max_bytes=300).total_bytes == 200
+
+
+def test_evicted_body_is_fetched_again(tmp_path, stub_server):
+    url = stub_server.url("/article/2")
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    body = cached_get(requests, url, cache, {})
+    os.remove(cache._path(url, '.body'))  # evicted by another process after the lookup
+    assert cached_get(requests, url, cache, {}) == body
+    assert [status for _, _, status in stub_server.hits] == [200, 200]
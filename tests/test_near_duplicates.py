@@ -0,0 +1,34 @@
+import numpy as np
+
+from near_duplicates import connected_components, find_near_duplicates, synthetic_documents
+
+
+def planted_groups(n_docs, planted):
+    labels = connected_components(n_docs, np.array([c for c, _ in planted]), np.array([o for _, o in planted]))
+    groups = {}
+    for doc, label in enumerate(labels):
+        groups.setdefault(label, []).append(doc)
+    return sorted(group for group in groups.values() if len(group) > 1)
+
+
+def test_planted_duplicates_are_clustered_and_nothing_else():
+    documents, planted = synthetic_documents(400, duplicate_fraction=0.15, edit_fraction=0.005, seed=5)
+    clusters, timings = find_near_duplicates(documents)
+    assert len(planted) > 20
+    found = sorted([cluster['canonical']] + cluster['duplicates'] for cluster in clusters)
+    assert found == planted_groups(len(documents), planted)
+    assert all(cluster['min_similarity'] >= 0.8 for cluster in clusters)
+    assert timings['matched_pairs'] >= len(planted)
+
+
+def test_edits_beyond_the_threshold_and_short_documents_are_not_clustered():
+    documents, _ = synthetic_documents(2, duplicate_fraction=0.0, seed=1)
+    words = documents[0][1].split()
+    heavily_edited = ' '.join(word if i % 10 else 'changed' for i, word in enumerate(words))
+    documents = [(10, documents[0][1]), (11, heavily_edited), (12, "too short"), (13, "too short")]
+    assert find_near_duplicates(documents)[0] == []
+
+
+def test_fewer_than_two_documents():
+    assert find_near_duplicates([])[0] == []
+    assert find_near_duplicates([(3, "only one document here")])[0] == []
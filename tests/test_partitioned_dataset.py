@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import write_sample_csv
+from partitioned_dataset import load_partitioned, mean_shares_by_weekday, query_full_load, recent_channel_query
+
+QUERIES = [
+    recent_channel_query('tech', 60),
+    (['url', 'shares', 'num_imgs'], [('num_imgs', 'in', [0, 1]), ('shares', '>=', 2000)]),
+    (['url', 'kw_avg_avg'], [('timedelta', '>', 600), ('data_channel_is_bus', '!=', 1)]),
+    (['url', 'shares'], [('timedelta', '<', 0)]),
+]
+
+
+@pytest.fixture
+def partitioned(tmp_path, monkeypatch, sample_csv):
+    monkeypatch.chdir(tmp_path)  # load_dataset's default cache directory
+    return load_partitioned(sample_csv, partition_dir=str(tmp_path / 'partitions'))
+
+
+def sort_by_url(df):
+    df = df.sort_values('url').reset_index(drop=True)
+    df['url'] = df['url'].astype(object)  # object or string dtype depending on the reader
+    return df
+
+
+@pytest.mark.parametrize('columns, where', QUERIES)
+def test_pruned_query_matches_a_full_load(partitioned, sample_csv, columns, where):
+    columns = list(dict.fromkeys(['url'] + columns))
+    result = partitioned.query(columns, where)
+    pd.testing.assert_frame_equal(sort_by_url(result), sort_by_url(query_full_load(sample_csv, columns, where)))
+    scan = partitioned.last_scan
+    assert scan['total_partitions'] == len(partitioned.manifest['partitions'])
+    assert scan['rows_read'] >= len(result)
+
+
+def test_predicates_skip_partitions(partitioned, sample_csv):
+    columns, where = recent_channel_query('tech', 60)
+    result = partitioned.query(columns, where)
+    scan = partitioned.last_scan
+    assert len(result) and scan['partitions'] < scan['total_partitions']
+    assert scan['rows_read'] < len(query_full_load(sample_csv, ['shares'], []))
+    assert scan['columns'] == len(columns) + 2  # plus the channel flag and timedelta of the predicates
+    full = query_full_load(sample_csv, columns, where)
+    pd.testing.assert_frame_equal(mean_shares_by_weekday(result), mean_shares_by_weekday(full))
+
+    assert partitioned.query(['shares'], [('timedelta', '<', 0)]).empty
+    assert partitioned.last_scan['partitions'] == 0
+    with pytest.raises(KeyError):
+        partitioned.query(['no_such_column'])
+
+
+def test_partitions_follow_the_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=300)
+    partition_dir = str(tmp_path / 'partitions')
+    first = load_partitioned(csv_path, partition_dir=partition_dir)
+    assert load_partitioned(csv_path, partition_dir=partition_dir).root == first.root
+
+    write_sample_csv(csv_path, n_rows=300, seed=8)
+    second = load_partitioned(csv_path, partition_dir=partition_dir)
+    assert second.root != first.root
+    assert os.listdir(partition_dir) == [os.path.basename(second.root)]
+    assert sum(p['rows'] for p in second.manifest['partitions']) == 300
+    total = query_full_load(csv_path, ['shares'], [])['shares'].sum()
+    assert np.isclose(second.query(['shares'])['shares'].sum(), total)
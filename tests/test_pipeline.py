@@ -0,0 +1,18 @@
+from pipeline import StageMetrics, run_pipeline
+from retry_policy import RetryPolicy
+from tracing import TRACER
+
+
+def test_parse_spans_and_article_counters_reach_the_parent(stub_server):
+    stub_server.flaky = {"/article/0"}
+    items = [(i, stub_server.url(f"/article/{i}")) for i in range(6)]
+    metrics = StageMetrics()
+    TRACER.reset()
+    results = list(run_pipeline(items, max_io_workers=2, max_parse_workers=2, queue_size=2, rate_per_host=0,
+                                metrics=metrics, policy=RetryPolicy(max_attempts=1)))
+
+    assert sorted(key for key, _, _ in results) == list(range(6))
+    assert metrics.parsed == 5 and metrics.completed == 6
+    assert TRACER.histograms['parse'].count == 5
+    assert TRACER.counters[('articles', (('status', 'success'),))] == 5
+    assert sum(value for (name, _), value in TRACER.counters.items() if name == 'articles') == 6
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+import requests
+
+import retry_policy
+from retry_policy import (CircuitBreaker, CircuitOpenError, PERMANENT, RATE_LIMITED, RETRYABLE, RetryPolicy,
+                          classify)
+
+URL = "http://example.com/article"
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep; sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry_policy.time, 'monotonic', clock.monotonic)
+    return clock
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+class Flaky:
+    """Raises the given errors in turn, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+def policy(**kwargs):
+    return RetryPolicy(rng=random.Random(0), **kwargs)
+
+
+@pytest.mark.parametrize('error, kind', [
+    (http_error(404), PERMANENT), (http_error(410), PERMANENT), (http_error(500), RETRYABLE),
+    (http_error(502), RETRYABLE), (http_error(429), RATE_LIMITED), (http_error(503), RATE_LIMITED),
+    (requests.Timeout(), RETRYABLE), (requests.ConnectionError(), RETRYABLE), (ValueError(), PERMANENT),
+])
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_transient_errors_are_retried_with_capped_jittered_backoff(clock):
+    retry = policy(max_attempts=4, base_delay=0.5, max_delay=1.5)
+    fn = Flaky(requests.Timeout(), http_error(500), requests.ConnectionError())
+    assert retry.call(URL, fn, sleep=clock.sleep) == 'ok'
+    assert fn.calls == 4
+    assert len(clock.sleeps) == 3
+    assert all(0 <= delay <= min(1.5, 0.5 * 2 ** attempt) for attempt, delay in enumerate(clock.sleeps))
+    assert retry.stats.retries == 3 and retry.stats.gave_up == 0
+
+
+def test_permanent_errors_are_not_retried(clock):
+    retry = policy()
+    fn = Flaky(http_error(404))
+    with pytest.raises(requests.HTTPError):
+        retry.call(URL, fn, sleep=clock.sleep)
+    assert fn.calls == 1 and clock.sleeps == []
+    assert retry.stats.failures[PERMANENT] == 1
+
+
+def test_retry_after_is_honoured_or_gives_up(clock):
+    retry = policy(max_retry_after=60)
+    assert retry.call(URL, Flaky(http_error(429, {'Retry-After': '30'})), sleep=clock.sleep) == 'ok'
+    assert clock.sleeps == [30.0]
+
+    fn = Flaky(http_error(429, {'Retry-After': '3600'}))
+    with pytest.raises(requests.HTTPError):
+        retry.call(URL, fn, sleep=clock.sleep)
+    assert fn.calls == 1
+
+
+def test_breaker_opens_skips_and_recovers_after_reset(clock):
+    breaker = CircuitBreaker(threshold=3, reset_timeout=60)
+    retry = policy(max_attempts=1, breaker=breaker)
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            retry.call(URL, Flaky(http_error(500)), sleep=clock.sleep)
+    assert breaker.open_hosts() == ['example.com']
+    assert retry.stats.circuit_opened == 1
+
+    # Open: no request is made until the reset window has passed
+    fn = Flaky()
+    with pytest.raises(CircuitOpenError):
+        retry.call(URL, fn, sleep=clock.sleep)
+    assert fn.calls == 0
+    clock.now += 59
+    with pytest.raises(CircuitOpenError):
+        retry.call(URL, fn, sleep=clock.sleep)
+
+    # Half-open: one trial request; success closes the circuit
+    clock.now += 1
+    assert retry.call(URL, fn, sleep=clock.sleep) == 'ok'
+    assert breaker.open_hosts() == []
+    assert retry.stats.short_circuited == 2
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=10)
+    retry = policy(max_attempts=1, breaker=breaker)
+    with pytest.raises(requests.HTTPError):
+        retry.call(URL, Flaky(http_error(502)), sleep=clock.sleep)
+    clock.now += 10
+    assert breaker.allow('example.com')
+    assert not breaker.allow('example.com')  # only one trial at a time
+    assert breaker.record_failure('example.com')
+    clock.now += 9
+    assert not breaker.allow('example.com')
+    clock.now += 1
+    assert breaker.allow('example.com')
+
+
+def test_permanent_errors_do_not_open_the_circuit(clock):
+    breaker = CircuitBreaker(threshold=2)
+    retry = policy(max_attempts=1, breaker=breaker)
+    for error in (http_error(500), http_error(404), http_error(500)):
+        with pytest.raises(requests.HTTPError):
+            retry.call(URL, Flaky(error), sleep=clock.sleep)
+    assert breaker.open_hosts() == []
@@ -0,0 +1,75 @@
+import json
+import pickle
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from linear_models import RidgeRegression
+from scoring_server import MicroBatcher, create_server
+
+FEATURES = ['n_tokens_title', 'num_imgs', 'kw_avg_avg']
+
+
+@pytest.fixture(scope='module')
+def bundle():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, len(FEATURES))).astype(np.float32)
+    model = RidgeRegression()
+    model.fit(X, X @ np.array([0.5, -0.2, 0.1]) + 7)
+    return {'name': 'ridge', 'task': 'regression', 'model': model, 'feature_columns': FEATURES}
+
+
+@pytest.fixture
+def server(tmp_path, bundle):
+    path = tmp_path / 'ridge.pkl'
+    path.write_bytes(pickle.dumps(bundle))
+    server = create_server(str(path), port=0, window=0.01)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}/predict", data=body,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_concurrent_requests_share_one_batch(bundle):
+    batcher = MicroBatcher(bundle, window=0.5)
+    rng = np.random.default_rng(1)
+    requests = [rng.normal(size=(n, len(FEATURES))).astype(np.float32) for n in (1, 3, 2)]
+    futures = [batcher.submit(X) for X in requests]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert batcher.stats.batches == 1 and list(batcher.stats.batch_sizes) == [6]
+    for X, result in zip(requests, results):
+        np.testing.assert_allclose(result['shares'], np.expm1(bundle['model'].predict(X)), rtol=1e-6)
+        assert result['is_popular'] == [s >= 1400 for s in result['shares']]
+
+
+def test_predict_accepts_dict_and_csv_rows(server, bundle):
+    row = {'url': 'http://example.com/a', 'n_tokens_title': 10, 'num_imgs': 1, 'kw_avg_avg': 3000.5, 'shares': 5}
+    status, by_name = post(server, json.dumps({'rows': [row]}).encode())
+    assert status == 200
+    expected = np.expm1(bundle['model'].predict(np.array([[10, 1, 3000.5]], dtype=np.float32)))
+    np.testing.assert_allclose(by_name['shares'], expected, rtol=1e-6)
+
+    csv_row = ['http://example.com/a', 12, 10, 1, 3000.5, 5]  # url, timedelta, features, shares
+    assert post(server, json.dumps({'rows': [csv_row]}).encode()) == (200, by_name)
+
+
+@pytest.mark.parametrize('body', [b'not json', b'{"items": []}', b'{"rows": [{"num_imgs": 1}]}',
+                                  b'{"rows": [[1, 2]]}'])
+def test_malformed_requests_get_400(server, body):
+    status, payload = post(server, body)
+    assert status == 400 and payload['error'].startswith('bad request')
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from share_index import ShareIndex, ShareTable, hash_keys, normalize_keyword
+
+WORDS = ['apple', 'phones', 'launch', 'music', 'world cup', 'election', 'space', 'Apple ']
+
+
+@pytest.fixture
+def articles():
+    rng = np.random.default_rng(11)
+    urls = [f"http://mashable.com/2014/01/01/story-{i}/" for i in range(120)]
+    shares = rng.integers(1, 50, len(urls)).astype(float)  # small range: plenty of ties at the extremes
+    keywords = [list(rng.choice(WORDS, rng.integers(0, 4), replace=False)) for _ in urls]
+    return urls, shares, keywords
+
+
+def brute_force(urls, shares, keywords, scored):
+    """kw_* of each scored article, recomputed from all other articles"""
+    rows = []
+    for i, (url, own) in enumerate(scored):
+        stats = []
+        for word in dict.fromkeys(normalize_keyword(k) for k in own):
+            others = [s for u, s, ks in zip(urls, shares, keywords)
+                      if u != url and word in {normalize_keyword(k) for k in ks}]
+            if others:
+                stats.append((min(others), max(others), np.mean(others)))
+        row = {}
+        for j, stat in enumerate(('min', 'max', 'avg')):
+            values = [s[j] for s in stats]
+            row[f'kw_{stat}_min'] = min(values) if values else 0.0
+            row[f'kw_{stat}_max'] = max(values) if values else 0.0
+            row[f'kw_{stat}_avg'] = np.mean(values) if values else 0.0
+        rows.append(row)
+    return rows
+
+
+def test_leave_one_out_matches_brute_force(articles):
+    urls, shares, keywords = articles
+    index = ShareIndex()
+    index.add_articles(urls, shares, keywords)
+    # Indexed articles score without their own shares; a new URL sees everything
+    scored = list(zip(urls, keywords)) + [("http://mashable.com/new/", ['apple', 'space'])]
+    columns = index.keyword_features([k for _, k in scored], [u for u, _ in scored])
+    for i, expected in enumerate(brute_force(urls, shares, keywords, scored)):
+        assert {name: values[i] for name, values in columns.items()} == pytest.approx(expected)
+
+
+def test_re_adding_articles_keeps_one_observation_per_url(articles):
+    urls, shares, keywords = articles
+    once = ShareIndex()
+    once.add_keywords(urls, shares, keywords)
+    twice = ShareIndex()
+    twice.add_keywords(urls[:60], shares[:60], keywords[:60])
+    twice.add_keywords(urls + urls[:5], np.r_[shares, shares[:5]], keywords + keywords[:5])
+    hashes = hash_keys(sorted({normalize_keyword(k) for k in WORDS}))
+    for a, b in zip(once.keywords.lookup(hashes), twice.keywords.lookup(hashes)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_excluding_more_than_one_observation_is_rejected():
+    table = ShareTable()
+    table.add(hash_keys(['a', 'a', 'a']), [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        table.lookup(hash_keys(['a']), exclude=(np.array([2]), np.array([1.5])))
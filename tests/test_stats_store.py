@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_ROWS
+from dataset import TARGET_COLUMN, parse_csv
+from stats_store import TargetStatsStore, corr_with_target
+
+
+@pytest.fixture(scope='module')
+def sample(sample_csv):
+    return parse_csv(sample_csv)
+
+
+def numeric(df):
+    return df.select_dtypes(include=[np.number]).astype(np.float64)
+
+
+def test_stats_store_matches_pandas(sample):
+    expected = numeric(sample)
+    store = TargetStatsStore(expected.columns)
+    for part in np.array_split(np.arange(SAMPLE_ROWS), 3):
+        store.update(sample.iloc[part])
+
+    pd.testing.assert_series_equal(store.correlations(), expected.corr()[TARGET_COLUMN], rtol=1e-9, atol=1e-12)
+    described = expected.describe().loc[['count', 'mean', 'std', 'min', 'max']]
+    pd.testing.assert_frame_equal(store.describe(), described, rtol=1e-9)
+
+
+def test_stats_store_round_trip(tmp_path, sample):
+    store = TargetStatsStore(numeric(sample).columns)
+    store.update(sample)
+    store.sources.append({'path': 'sample.csv', 'sha256': '0' * 64, 'rows': SAMPLE_ROWS})
+    path = str(tmp_path / 'store.npz')
+    store.save(path)
+    assert os.listdir(tmp_path) == ['store.npz']
+
+    loaded = TargetStatsStore.load(path)
+    assert (loaded.columns, loaded.target, loaded.sources) == (store.columns, store.target, store.sources)
+    pd.testing.assert_series_equal(loaded.correlations(), store.correlations())
+
+
+def test_append_csv_is_idempotent(tmp_path, sample_csv, sample):
+    store = TargetStatsStore(numeric(sample).columns)
+    assert store.append_csv(sample_csv)
+    assert not store.append_csv(sample_csv)
+    assert store.count.max() == SAMPLE_ROWS
+
+
+def test_corr_with_target_matches_pandas(sample):
+    expected = numeric(sample)
+    pd.testing.assert_series_equal(corr_with_target(sample), expected.corr()[TARGET_COLUMN], rtol=1e-9, atol=1e-12)
+    complete = sample.dropna()
+    pd.testing.assert_series_equal(corr_with_target(complete), numeric(complete).corr()[TARGET_COLUMN],
+                                   rtol=1e-9, atol=1e-12)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_ROWS
+from dataset import parse_csv
+from streaming_stats import QuantileSketch, StreamingStats, compute_streaming_stats
+
+
+@pytest.fixture(scope='module')
+def sample(sample_csv):
+    return parse_csv(sample_csv)
+
+
+def numeric(df):
+    return df.select_dtypes(include=[np.number]).astype(np.float64)
+
+
+@pytest.mark.parametrize('chunksize', [SAMPLE_ROWS, 1000, 333])
+def test_streaming_stats_match_pandas(sample_csv, sample, chunksize):
+    stats, _, _ = compute_streaming_stats(sample_csv, chunksize=chunksize)
+    expected = numeric(sample)
+
+    assert stats.rows == SAMPLE_ROWS
+    assert stats.exact_quantiles
+    pd.testing.assert_frame_equal(stats.describe(), expected.describe(), rtol=1e-9)
+    # Correlations are over complete rows
+    pd.testing.assert_frame_equal(stats.correlation(), expected.dropna().corr(), rtol=1e-9, atol=1e-12)
+    assert stats.missing.to_dict() == sample.isnull().sum().to_dict()
+
+
+def test_merged_stats_equal_one_pass(sample):
+    columns = numeric(sample).columns
+    whole = StreamingStats(columns)
+    whole.update(sample)
+    merged = StreamingStats(columns)
+    for part in np.array_split(np.arange(SAMPLE_ROWS), 4):
+        partial = StreamingStats(columns)
+        partial.update(sample.iloc[part])
+        merged.merge(partial)
+    pd.testing.assert_frame_equal(merged.describe(), whole.describe(), rtol=1e-9)
+    pd.testing.assert_frame_equal(merged.correlation(), whole.correlation(), rtol=1e-9, atol=1e-12)
+
+
+def test_compacted_sketch_quantiles_stay_close_in_rank():
+    values = np.random.default_rng(3).lognormal(7, 1, 20000)
+    sketch = QuantileSketch(k=256)
+    for part in np.array_split(values, 13):
+        sketch.update(part)
+    assert not sketch.exact
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        rank = (values <= sketch.quantile(q)).mean()
+        assert abs(rank - q) < 0.02
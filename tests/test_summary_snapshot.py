@@ -0,0 +1,33 @@
+import math
+
+import pandas as pd
+
+from summary_snapshot import build_approximate, load_sample
+
+
+def build(tmp_path, csv_path):
+    return build_approximate(str(csv_path), str(tmp_path / 'approx.json'), str(tmp_path / 'sample.npz'),
+                             sample_size=500, chunksize=700)
+
+
+def test_approximate_counts_match_the_data(tmp_path, sample_csv):
+    approx = build(tmp_path, sample_csv)
+    df = pd.read_csv(sample_csv, skipinitialspace=True)
+    assert approx['n_articles'] == len(df)
+    assert approx['n_features'] == len(df.columns)
+    assert approx['n_popular'] == int((df['shares'] >= 1400).sum())
+    columns, rows = load_sample(str(tmp_path / 'sample.npz'))
+    assert columns == [column for column in df.columns if column != 'url']
+    assert rows.shape == (500, len(columns))
+
+
+def test_header_only_csv_gives_an_empty_summary(tmp_path, sample_csv):
+    with open(sample_csv, encoding='utf-8') as f:
+        header = f.readline()
+    (tmp_path / 'empty.csv').write_text(header)
+    approx = build(tmp_path, tmp_path / 'empty.csv')
+    assert approx['n_articles'] == 0
+    assert approx['n_features'] == len(header.split(','))
+    assert math.isnan(approx['shares']['mean'])
+    assert approx['correlations']['rows'] == []
+    assert load_sample(str(tmp_path / 'sample.npz'))[1].shape[0] == 0
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import train_models
+from conftest import write_sample_csv
+from feature_matrix import export_feature_matrix, export_shuffled_matrix, load_feature_matrix, split_features_target
+from train_models import MODELS, cross_validate, evaluate, fold_bounds, make_target, run_fold
+
+
+@pytest.mark.parametrize('n_rows, n_folds', [(10, 3), (100, 5), (7, 7)])
+def test_fold_bounds_partition_rows_like_array_split(n_rows, n_folds):
+    bounds = [fold_bounds(n_rows, n_folds, fold) for fold in range(n_folds)]
+    expected = np.array_split(np.arange(n_rows), n_folds)
+    assert [list(range(start, stop)) for start, stop in bounds] == [list(part) for part in expected]
+
+
+@pytest.fixture
+def matrix_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dataset cache goes to ./.dataset_cache
+    csv_path = write_sample_csv(tmp_path / 'news.csv', n_rows=200, missing=False)
+    return export_feature_matrix(csv_path, str(tmp_path / 'features.npy'))
+
+
+def test_shuffled_matrix_is_a_seeded_permutation(matrix_path):
+    path = export_shuffled_matrix(matrix_path, seed=3)
+    matrix, _ = load_feature_matrix(matrix_path)
+    shuffled, meta = load_feature_matrix(path)
+
+    np.testing.assert_array_equal(shuffled, matrix[np.random.default_rng(3).permutation(len(matrix))])
+    assert meta['shuffle_seed'] == 3
+    assert export_shuffled_matrix(matrix_path, seed=3) == path
+
+
+def test_run_fold_trains_on_everything_but_the_test_slice(matrix_path, monkeypatch):
+    path = export_shuffled_matrix(matrix_path, seed=1)
+    monkeypatch.setattr(train_models, '_worker_matrix', None)
+    train_models._open_matrix(path)
+    matrix, meta = train_models._worker_matrix
+    X, shares = split_features_target(matrix, meta)
+
+    for fold in range(4):
+        result = run_fold('ridge', 4, fold)
+        test = np.zeros(len(shares), dtype=bool)
+        test[slice(*fold_bounds(len(shares), 4, fold))] = True
+        task, factory = MODELS['ridge']
+        y = make_target(shares, task)
+        model = factory()
+        model.fit(np.asarray(X)[~test], y[~test])
+        assert result['fold'] == fold
+        assert result['metrics'] == pytest.approx(evaluate(model, task, np.asarray(X)[test], y[test]))
+
+
+def test_cross_validate_runs_every_model_and_fold(matrix_path):
+    results = cross_validate(['ridge', 'ridge_classifier'], n_folds=3, seed=5, max_workers=1,
+                             matrix_path=matrix_path)
+    assert [(r['model'], r['fold']) for r in results] == [(m, f) for m in ('ridge', 'ridge_classifier')
+                                                          for f in range(3)]
+    assert all(np.isfinite(list(r['metrics'].values())).all() for r in results)
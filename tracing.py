@@ -0,0 +1,181 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Latency histogram bucket upper bounds in seconds (Prometheus defaults plus a few)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+MAX_EVENTS = 1_000_000
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, sum and max"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.bounds = np.array(buckets)
+        self.counts = np.zeros(len(buckets), dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[np.searchsorted(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, rank))
+        lower = self.bounds[i - 1] if i else 0.0
+        upper = min(self.bounds[i], self.max)
+        below = cumulative[i - 1] if i else 0
+        fraction = (rank - below) / self.counts[i] if self.counts[i] else 1.0
+        return float(lower + (max(upper, lower) - lower) * fraction)
+
+
+class Tracer:
+    """Thread-safe spans, counters and latency histograms for one run
+
+    Spans feed a histogram per name; with `record_events` they are also kept as
+    Chrome trace events (chrome://tracing or ui.perfetto.dev).
+    """
+
+    def __init__(self, record_events=False):
+        self.record_events = record_events
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.events = []
+            self.started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.observe(name, end - start)
+            if self.record_events:
+                with self.lock:
+                    if len(self.events) < MAX_EVENTS:
+                        self.events.append({
+                            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                            'ts': (start - self.started) * 1e6, 'dur': (end - start) * 1e6,
+                            'args': attributes,
+                        })
+
+    def traced(self, name=None):
+        """Decorator wrapping every call of a function in a span"""
+        def decorator(fn):
+            span_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def summary(self):
+        """Text table of spans (by total time) and counters"""
+        lines = ["="*78, "RUN SUMMARY", "="*78,
+                 f"{'Span':<24}{'Calls':>8}{'Total s':>10}{'Mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'Max ms':>9}"]
+        with self.lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: -item[1].total)
+            counters = sorted(self.counters.items())
+        for name, h in histograms:
+            lines.append(f"{name:<24}{h.count:>8,}{h.total:>10.2f}{h.total / h.count * 1000:>10.1f}"
+                         f"{h.quantile(0.5) * 1000:>9.1f}{h.quantile(0.95) * 1000:>9.1f}{h.max * 1000:>9.1f}")
+        if counters:
+            lines.append("")
+            lines.append(f"{'Counter':<52}{'Value':>14}")
+            for (name, labels), value in counters:
+                label_text = ','.join(f"{k}={v}" for k, v in labels)
+                lines.append(f"{name + ('{' + label_text + '}' if labels else ''):<52}{value:>14,}")
+        lines.append(f"Wall-clock time: {time.perf_counter() - self.started:.2f}s")
+        return "\n".join(lines)
+
+    def prometheus_text(self, prefix='news'):
+        """Counters and histograms in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        seen = set()
+        for (name, labels), value in counters:
+            metric = f"{prefix}_{name}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{metric}{{{label_text}}} {value}" if labels else f"{metric} {value}")
+        for name, h in histograms:
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, cumulative in zip(h.bounds, np.cumsum(h.counts)):
+                le = '+Inf' if np.isinf(bound) else f"{bound:g}"
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {h.total}")
+            lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_chrome_trace(self, path):
+        with self.lock:
+            events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced
+incr = TRACER.incr
+
+
+def add_arguments(parser):
+    """--prometheus / --chrome-trace options shared by the pipeline scripts"""
+    parser.add_argument('--prometheus', default=None, help="write metrics in Prometheus text format to this file")
+    parser.add_argument('--chrome-trace', default=None, help="write spans as a Chrome trace JSON to this file")
+
+
+def start(args):
+    TRACER.reset()
+    TRACER.record_events = bool(args.chrome_trace)
+
+
+def finish(args):
+    """Print the summary table and write the requested exports"""
+    print("\n" + TRACER.summary())
+    if args.prometheus:
+        with open(args.prometheus, 'w', encoding='utf-8') as f:
+            f.write(TRACER.prometheus_text())
+        print(f"Metrics saved to '{args.prometheus}'")
+    if args.chrome_trace:
+        TRACER.write_chrome_trace(args.chrome_trace)
+        print(f"Trace saved to '{args.chrome_trace}' (open in chrome://tracing or ui.perfetto.dev)")